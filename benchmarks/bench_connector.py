@@ -0,0 +1,122 @@
+"""End-to-end benchmark of the connector against the local mock server.
+
+Measures signed order throughput and latency over real sockets, and the
+websocket message rate a client can consume:
+
+    python -m benchmarks.bench_connector --orders 2000 --threads 8 --latency 0.002
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from orderly_evm_connector.lib.mock_server import (
+    MockOrderlyServer,
+    generate_orderly_key_pair,
+)
+from orderly_evm_connector.lib.transport import RequestsTransport
+from orderly_evm_connector.rest import Rest
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def bench_orders(server, orders, threads):
+    orderly_key, orderly_secret = generate_orderly_key_pair()
+    client = Rest(
+        orderly_key=orderly_key,
+        orderly_secret=orderly_secret,
+        orderly_account_id="0xbench",
+        transport=RequestsTransport(pool_maxsize=threads),
+        metrics=True,
+    )
+    client.orderly_endpoint = server.rest_url
+    client.warmup(threads)
+
+    def _send(index):
+        started = time.perf_counter()
+        client.create_order(
+            symbol="PERP_ETH_USDC",
+            order_type="LIMIT",
+            side="BUY" if index % 2 else "SELL",
+            order_price=1500 + index % 100,
+            order_quantity=0.01,
+            client_order_id=f"bench_{index}",
+        )
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(_send, range(orders)))
+    elapsed = time.perf_counter() - started
+    client.transport.close()
+    return {
+        "orders": orders,
+        "orders_per_second": orders / elapsed,
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "stages": {
+            stage: snapshot["mean"] * 1000
+            for stage, snapshot in client.metrics.snapshot()["POST /v1/order"]["latency"].items()
+        },
+    }
+
+
+def bench_stream(server, messages):
+    topic = "PERP_ETH_USDC@bbo"
+    received = [0]
+    done = threading.Event()
+    subscribed = threading.Event()
+
+    def _on_message(_, message):
+        if '"subscribe"' in message:
+            subscribed.set()
+            return
+        received[0] += 1
+        if received[0] >= messages:
+            done.set()
+
+    client = OrderlyWebsocketClient(server.ws_url, on_message=_on_message)
+    client.subscribe({"id": "bench", "event": "subscribe", "topic": topic})
+    subscribed.wait(5)
+    data = {"symbol": "PERP_ETH_USDC", "ask": 1500.1, "askSize": 2.5, "bid": 1500.0, "bidSize": 3.1}
+    started = time.perf_counter()
+    for _ in range(messages):
+        server.publish(topic, data)
+    done.wait(60)
+    elapsed = time.perf_counter() - started
+    client.stop()
+    return {"messages": received[0], "messages_per_second": received[0] / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in seconds")
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    with MockOrderlyServer(latency=args.latency) as server:
+        result = bench_orders(server, args.orders, args.threads)
+        print(
+            f"orders: {result['orders']} in {args.threads} threads, "
+            f"{result['orders_per_second']:.0f} orders/s, "
+            f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms"
+        )
+        print(
+            "  mean per stage: "
+            + ", ".join(f"{stage} {ms:.3f} ms" for stage, ms in sorted(result["stages"].items()))
+        )
+        result = bench_stream(server, args.messages)
+        print(
+            f"stream: {result['messages']} messages, "
+            f"{result['messages_per_second']:.0f} messages/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
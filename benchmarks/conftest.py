@@ -0,0 +1,14 @@
+import pytest
+from pytest_benchmark.utils import parse_compare_fail
+
+# Allowed slowdown of the mean against the saved baseline before a compared
+# run fails, unless --benchmark-compare-fail is given.
+DEFAULT_COMPARE_FAIL = "mean:15%"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    if config.getoption("benchmark_compare", None) and not config.getoption(
+        "benchmark_compare_fail", None
+    ):
+        config.option.benchmark_compare_fail = [parse_compare_fail(DEFAULT_COMPARE_FAIL)]
@@ -0,0 +1,217 @@
+"""Regression benchmarks of the order path and websocket frame handling.
+
+Run with pytest-benchmark, see the Benchmarks section of the README:
+
+    pytest benchmarks --benchmark-save=baseline
+    pytest benchmarks --benchmark-compare
+"""
+import json
+import os
+import time
+
+import pytest
+from websocket import ABNF
+
+from orderly_evm_connector.lib.metrics import StreamMetrics
+from orderly_evm_connector.lib.mock_server import generate_orderly_key_pair
+from orderly_evm_connector.lib.request_builder import build_request
+from orderly_evm_connector.lib.transport import MockResponse, MockTransport
+from orderly_evm_connector.lib.utils import (
+    cleanNoneValue,
+    generate_signature,
+    generate_wallet_signature,
+    load_orderly_private_key,
+    load_wallet_account,
+)
+from orderly_evm_connector.rest import Rest
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from tests.utils import mock_websocket
+
+ORDERLY_KEY, ORDERLY_SECRET = generate_orderly_key_pair()
+
+
+def _order(index):
+    return {
+        "symbol": "PERP_ETH_USDC",
+        "order_type": "LIMIT",
+        "order_price": 1500 + index * 0.01,
+        "order_quantity": 0.01,
+        "order_amount": None,
+        "side": "BUY" if index % 2 else "SELL",
+        "client_order_id": f"bench_{index}",
+        "visible_quantity": None,
+        "reduce_only": False,
+        "slippage": None,
+        "order_tag": None,
+        "level": None,
+        "post_only_adjust": None,
+    }
+
+
+BATCH = [_order(index) for index in range(10)]
+
+
+def _order_row(index):
+    return {
+        "order_id": 100000 + index,
+        "user_id": 12345,
+        "price": 1500 + index * 0.01,
+        "type": "LIMIT",
+        "quantity": 0.01,
+        "amount": None,
+        "executed": 0,
+        "visible": 0.01,
+        "symbol": "PERP_ETH_USDC",
+        "side": "BUY",
+        "status": "NEW",
+        "total_fee": 0,
+        "fee_asset": "USDC",
+        "client_order_id": f"bench_{index}",
+        "average_executed_price": None,
+        "created_time": 1700000000000 + index,
+        "updated_time": 1700000000000 + index,
+        "reduce_only": False,
+    }
+
+
+ORDER_PAGE = MockResponse(
+    200,
+    {
+        "success": True,
+        "data": {
+            "meta": {"total": 500, "records_per_page": 500, "current_page": 1},
+            "rows": [_order_row(index) for index in range(500)],
+        },
+    },
+)
+
+
+def _client(response):
+    return Rest(
+        orderly_key=ORDERLY_KEY,
+        orderly_secret=ORDERLY_SECRET,
+        orderly_account_id="0xbench",
+        transport=MockTransport(lambda *_: response),
+    )
+
+
+def test_generate_signature(benchmark):
+    message = "POST/v1/order" + json.dumps(cleanNoneValue(_order(0)))
+    private_key = load_orderly_private_key(ORDERLY_SECRET)
+    benchmark(generate_signature, ORDERLY_SECRET, message, private_key)
+
+
+def test_generate_wallet_signature(benchmark):
+    message = {
+        "domain": {
+            "name": "Orderly",
+            "version": "1",
+            "chainId": 421614,
+            "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
+        },
+        "message": {
+            "brokerId": "woofi_pro",
+            "chainId": 421614,
+            "timestamp": 1700000000000,
+            "registrationNonce": 194528949540,
+        },
+        "primaryType": "Registration",
+        "types": {
+            "EIP712Domain": [
+                {"name": "name", "type": "string"},
+                {"name": "version", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+                {"name": "verifyingContract", "type": "address"},
+            ],
+            "Registration": [
+                {"name": "brokerId", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+                {"name": "timestamp", "type": "uint64"},
+                {"name": "registrationNonce", "type": "uint256"},
+            ],
+        },
+    }
+    wallet_secret = os.urandom(32).hex()
+    account = load_wallet_account(wallet_secret)
+    benchmark(generate_wallet_signature, wallet_secret, message, account)
+
+
+def test_clean_none_value(benchmark):
+    benchmark(cleanNoneValue, _order(0))
+
+
+def test_build_batch_request(benchmark):
+    payload = {"orders": [cleanNoneValue(order) for order in BATCH]}
+    benchmark(build_request, "POST", "/v1/batch-order", payload)
+
+
+def test_build_query_request(benchmark):
+    payload = {"symbol": "PERP_ETH_USDC", "status": "INCOMPLETE", "page": 1, "size": 500, "start_t": None}
+    benchmark(build_request, "GET", "/v1/orders", payload)
+
+
+def test_decode_order_page(benchmark):
+    client = _client(ORDER_PAGE)
+    rows = benchmark(client._decode, ORDER_PAGE)
+    assert len(rows["data"]["rows"]) == 500
+
+
+@pytest.mark.parametrize("compact", ["records", "table"])
+def test_decode_compact_order_page(benchmark, compact):
+    client = _client(ORDER_PAGE)
+    client.compact_rows = compact
+    rows = benchmark(client._decode_rows, "GET", "/v1/orders", ORDER_PAGE)
+    assert len(rows["data"]["rows"]) == 500
+
+
+def test_create_order(benchmark):
+    client = _client(MockResponse(200, {"success": True, "data": {"order_id": 1}}))
+    benchmark(client.create_order, **cleanNoneValue(_order(0)))
+
+
+def test_batch_create_order(benchmark):
+    client = _client(MockResponse(200, {"success": True, "data": {"rows": []}}))
+    benchmark(client.batch_create_order, [cleanNoneValue(order) for order in BATCH])
+
+
+def test_get_orders_page(benchmark):
+    client = _client(ORDER_PAGE)
+    benchmark(client.get_orders, symbol="PERP_ETH_USDC", size=500)
+
+
+@pytest.mark.parametrize("metrics", [False, True], ids=["plain", "metrics"])
+def test_frame_handling(benchmark, monkeypatch, metrics):
+    mock_websocket(monkeypatch)
+    manager = OrderlySocketManager(
+        "wss://example",
+        on_open=lambda _: None,
+        on_message=lambda _, message: None,
+        metrics=StreamMetrics() if metrics else None,
+    )
+    now = int(time.time() * 1000)
+    frames = [
+        ABNF.create_frame(
+            json.dumps(
+                {
+                    "topic": "PERP_ETH_USDC@bbo",
+                    "ts": now,
+                    "data": {
+                        "symbol": "PERP_ETH_USDC",
+                        "ask": 1500.1 + index * 0.01,
+                        "askSize": 2.5,
+                        "bid": 1500.0 + index * 0.01,
+                        "bidSize": 3.1,
+                    },
+                }
+            ),
+            ABNF.OPCODE_TEXT,
+        )
+        for index in range(1000)
+    ]
+
+    def _handle_frames():
+        for frame in frames:
+            topic = manager._inspect_frame(ABNF.OPCODE_TEXT, frame)
+            manager._handle_data(ABNF.OPCODE_TEXT, frame, "", topic)
+
+    benchmark(_handle_frames)
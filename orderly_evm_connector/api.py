@@ -1,14 +1,40 @@
 import json
+import threading
 from json import JSONDecodeError
-import requests
+from time import perf_counter, sleep
 from .__version__ import __version__
 from orderly_evm_connector.error import ClientError, ServerError
 from orderly_evm_connector.lib.utils import (
     generate_signature,
     generate_wallet_signature,
+    load_orderly_private_key,
+    load_wallet_account,
 )
 from orderly_evm_connector.lib.utils import cleanNoneValue
 from orderly_evm_connector.lib.utils import orderlyLog, get_endpoints
+from orderly_evm_connector.lib.transport import (
+    RequestsTransport,
+    KeepAlivePinger,
+    iter_chunks,
+)
+from orderly_evm_connector.lib.metrics import RestMetrics, endpoint_name
+from orderly_evm_connector.lib.tracing import Tracer
+from orderly_evm_connector.lib.request_builder import build_request, encode_body
+from orderly_evm_connector.lib.single_flight import SingleFlight
+from orderly_evm_connector.lib.retry import RetryPolicy
+from orderly_evm_connector.lib.circuit_breaker import CircuitBreakers
+from orderly_evm_connector.lib.hedging import Hedger
+from orderly_evm_connector.lib.models import ROW_MODELS, compact_rows
+from orderly_evm_connector.lib.json_stream import iter_json_array
+from orderly_evm_connector.lib.constants import (
+    REST_KEEPALIVE_PATH,
+    REST_KEEPALIVE_INTERVAL_IN_SECONDS,
+    REST_PREWARM_TIMEOUT_IN_SECONDS,
+    REST_STREAM_CHUNK_SIZE,
+)
+
+JSON_CONTENT_TYPE = "application/json;charset=utf-8"
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded;charset=utf-8"
 
 class API(object):
     def __init__(
@@ -20,7 +46,20 @@ class API(object):
         orderly_account_id=None,
         proxies=None,
         timeout=None,
-        debug=False
+        debug=False,
+        transport=None,
+        prewarm_connections=0,
+        keepalive_interval=None,
+        metrics=None,
+        json_encoder=None,
+        coalesce_requests=False,
+        retry_policy=None,
+        circuit_breaker=None,
+        hedging=None,
+        rate_limits=None,
+        signed_rate_limits=None,
+        signing_service=None,
+        compact_rows=None,
     ):
         self.orderly_key = orderly_key
         self.orderly_secret = orderly_secret
@@ -31,108 +70,308 @@ class API(object):
         self.show_header = False
         self.proxies = proxies
         self.logger = orderlyLog(debug=debug)
-        self.session = requests.Session()
-        self.session.headers.update(
+        self.tracer = Tracer(self.logger)
+        self.symbol_filters = None
+        # metrics=True creates a private RestMetrics, an instance can be shared
+        self.metrics = RestMetrics() if metrics is True else metrics or None
+        # Turns a payload into str or bytes, e.g. orjson.dumps
+        self.json_encoder = json_encoder or json.dumps
+        # Concurrent identical GETs share one HTTP call, see _coalesce
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        # retry_policy=True retries with the RetryPolicy defaults
+        self.retry_policy = RetryPolicy() if retry_policy is True else retry_policy or None
+        # True for per-endpoint breakers with default settings, or a shared CircuitBreakers
+        self.circuit_breakers = (
+            CircuitBreakers() if circuit_breaker is True else circuit_breaker or None
+        )
+        # True hedges the default HEDGED_ENDPOINTS, or a configured Hedger
+        self.hedger = Hedger() if hedging is True else hedging or None
+        # TokenBuckets taken before every HTTP call, e.g. per IP
+        self.rate_limits = tuple(rate_limits or ())
+        # TokenBuckets taken before signed calls only, e.g. per orderly key
+        self.signed_rate_limits = tuple(signed_rate_limits or ())
+        # Per-endpoint TokenBuckets of the concurrent cancel helpers, shared by their calls
+        self.endpoint_rate_limits = {}
+        self._endpoint_rate_limits_lock = threading.Lock()
+        # (orderly_secret, decoded key), kept here so it goes away with the client
+        self._private_key = None
+        # (wallet_secret, decoded account), likewise
+        self._wallet_account = None
+        # A SigningService signs in worker processes instead of this thread
+        self.signing_service = signing_service
+        # "records" or "table" decodes data.rows into lib.models containers
+        self.compact_rows = compact_rows
+        # Set by stream_rows for the calling thread
+        self._streaming = threading.local()
+        self.transport = transport if transport is not None else RequestsTransport()
+        self.session = getattr(self.transport, "session", None)
+        self.transport.headers.update(
             {
-                "Content-Type": "application/json;charset=utf-8",
+                "Content-Type": JSON_CONTENT_TYPE,
                 "User-Agent": "orderly-connector-python/" + __version__,
             }
         )
+        self._keepalive = None
+        if prewarm_connections:
+            self.warmup(prewarm_connections)
+        if keepalive_interval:
+            self.start_keepalive(max(prewarm_connections, 1), keepalive_interval)
         return
 
+    def warmup(self, connections=1):
+        """Open `connections` pooled connections to the REST endpoint and complete their TLS handshake"""
+        self.transport.prewarm(
+            self.orderly_endpoint + REST_KEEPALIVE_PATH,
+            connections,
+            timeout=self.timeout or REST_PREWARM_TIMEOUT_IN_SECONDS,
+            proxies=self.proxies,
+        )
+
+    def start_keepalive(
+        self, connections=1, interval=REST_KEEPALIVE_INTERVAL_IN_SECONDS
+    ):
+        """Keep `connections` pooled connections hot with a background ping every `interval` seconds"""
+        self.stop_keepalive()
+        self._keepalive = KeepAlivePinger(
+            self.transport,
+            self.orderly_endpoint + REST_KEEPALIVE_PATH,
+            connections=connections,
+            interval=interval,
+            proxies=self.proxies,
+        )
+        self._keepalive.start()
+
+    def stop_keepalive(self):
+        if self._keepalive is not None:
+            self._keepalive.stop()
+            self._keepalive = None
+
+    def _build_request(self, http_method, url_path, payload):
+        """Serialize the request once per call, returns it and the time it took"""
+        started = perf_counter()
+        request = build_request(http_method, url_path, payload, self.json_encoder)
+        serialize = perf_counter() - started
+        if self.metrics is not None:
+            self.metrics.observe(
+                endpoint_name(request.method, request.path), "serialize", serialize
+            )
+        return request, serialize
+
     def _request(self, http_method, url_path, payload=None):
-        if payload:
-            _payload = cleanNoneValue(payload)
-            if _payload:
-                if http_method == "GET" or http_method == "DELETE":
-                    url_path += "?" + "&".join(
-                        [f"{k}={v}" for k, v in _payload.items()]
-                    )
-                    payload = ""
-                else:
-                    payload = _payload
+        request, serialize = self._build_request(http_method, url_path, payload)
+        if getattr(self._streaming, "enabled", False):
+            return self._stream_rows(request)
+        send = self._with_retries(
+            request, url_path, payload, lambda: self._send(request, serialize)
+        )
+        return self._coalesce(request, None, send)
 
-        if payload is None:
-            payload = ""
-        url = self.orderly_endpoint + url_path
-        self.logger.debug("url: " + url)
+    def _send(self, request, serialize):
+        # Timed per attempt: retries and their backoff are not part of a stage
+        started = perf_counter()
+        url = self.orderly_endpoint + request.path
+        self.tracer.trace("request", method=request.method, url=url)
         params = cleanNoneValue(
             {
                 "url": url,
-                "params": payload,
+                "params": request.body,
                 "timeout": self.timeout,
                 "proxies": self.proxies,
             }
         )
-        response = self._dispatch_request(http_method, params)
-        self.logger.debug("raw response from server:" + response.text)
-        self._handle_rest_exception(response)
-
-        try:
-            data = response.json()
-        except ValueError:
-            data = response.text
-
+        _, data = self._execute(request.method, request.path, params)
+        if self.metrics is not None:
+            self.metrics.observe(
+                endpoint_name(request.method, request.path),
+                "total",
+                serialize + perf_counter() - started,
+            )
         return data
 
     def get_wallet_signature(self, message=None):
-        return generate_wallet_signature(self.wallet_secret, message=message)
+        if self.signing_service is not None:
+            return self.signing_service.sign_wallet(self.wallet_secret, message).result()
+        return generate_wallet_signature(
+            self.wallet_secret, message=message, account=self.wallet_account
+        )
+
+    @property
+    def wallet_account(self):
+        """Decoded account of `wallet_secret`, decoded on first use"""
+        cached = self._wallet_account
+        if cached is None or cached[0] != self.wallet_secret:
+            cached = self._wallet_account = (
+                self.wallet_secret,
+                load_wallet_account(self.wallet_secret),
+            )
+        return cached[1]
+
+    @property
+    def orderly_private_key(self):
+        """Decoded key of `orderly_secret`, decoded on first use"""
+        cached = self._private_key
+        if cached is None or cached[0] != self.orderly_secret:
+            cached = self._private_key = (
+                self.orderly_secret,
+                load_orderly_private_key(self.orderly_secret),
+            )
+        return cached[1]
+
+    def _generate_signature(self, message):
+        if self.signing_service is not None:
+            return self.signing_service.sign(self.orderly_secret, message).result()
+        return generate_signature(
+            self.orderly_secret, message=message, private_key=self.orderly_private_key
+        )
 
     def _sign_request(self, http_method, url_path, payload=None):
-        _payload = ""
-        if payload:
-            _payload = cleanNoneValue(payload)
-            if _payload:
-                if http_method == "GET" or http_method == "DELETE":
-                    url_path += "?" + "&".join(
-                        [f"{k}={v}" for k, v in _payload.items()]
-                    )
-                    _payload = ""
-        params = {}
-        payload = _payload if _payload else ""
-        params["url_path"] = url_path
-        params["payload"] = payload
-        params["http_method"] = http_method
-        query_string = self._prepare_params(params)
+        request, serialize = self._build_request(http_method, url_path, payload)
+        if getattr(self._streaming, "enabled", False):
+            return self._stream_rows(request, self._signed_headers(request))
+        # Every attempt is signed again, with a fresh timestamp
+        send = self._with_retries(
+            request, url_path, payload, lambda: self._send_signed(request, serialize)
+        )
+        return self._coalesce(
+            request, (self.orderly_account_id, self.orderly_key), send
+        )
+
+    def _signed_headers(self, request):
         try:
-            _timestamp, _signature = generate_signature(
-                self.orderly_secret, message=query_string
-            )
+            _timestamp, _signature = self._generate_signature(request.signing_string)
         except ValueError:
             _timestamp, _signature = "mock_timestamp", "mock_signature"
+        headers = {
+            "orderly-timestamp": _timestamp,
+            "orderly-account-id": self.orderly_account_id,
+            "orderly-key": self.orderly_key,
+            "orderly-signature": _signature,
+        }
+        self.tracer.trace("signed", headers=headers)
+        return headers
+
+    def _send_signed(self, request, serialize):
+        # Timed per attempt: retries and their backoff are not part of a stage
+        started = perf_counter()
+        headers = self._signed_headers(request)
+        if self.metrics is not None:
+            endpoint = endpoint_name(request.method, request.path)
+            self.metrics.observe(endpoint, "sign", perf_counter() - started)
+        data = self.send_request(
+            request.method, request.path, request.body, headers=headers
+        )
+        if self.metrics is not None:
+            self.metrics.observe(endpoint, "total", serialize + perf_counter() - started)
+        return data
+
+    def stream_rows(self, method, *args, **kwargs):
+        """Call a REST method and yield the `data.rows` of its response one by one.
+
+        `method` is the name of a client method, e.g. "get_orders", or the
+        bound method itself; the other arguments are passed to it. The
+        request is sent and its status checked before this returns; the rows
+        are then parsed from the body as it downloads, so the whole page is
+        never held in memory. Streamed requests are not retried, coalesced or
+        hedged. Consume the generator or `close()` it to release the
+        connection.
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        self._streaming.enabled = True
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._streaming.enabled = False
 
-        self.session.headers.update(
+    def _stream_rows(self, request, headers=None):
+        self._streaming.enabled = False
+        url = self.orderly_endpoint + request.path
+        self.tracer.trace("request", method=request.method, url=url)
+        params = cleanNoneValue(
             {
-                "orderly-timestamp": _timestamp,
-                "orderly-account-id": self.orderly_account_id,
-                "orderly-key": self.orderly_key,
-                "orderly-signature": _signature,
+                "url": url,
+                "params": request.body,
+                "headers": headers,
+                "timeout": self.timeout,
+                "proxies": self.proxies,
+                "stream": True,
             }
         )
-        self.logger.debug(f"Sign Request Headers: {self.session.headers}")
-        return self.send_request(http_method, url_path, payload)
+        response = self._round_trip(request.method, request.path, params)
+        if self.metrics is not None:
+            self.metrics.record_status(
+                endpoint_name(request.method, request.path), response.status_code
+            )
+        try:
+            self._handle_rest_exception(response)
+        except Exception:
+            response.close()
+            raise
+        return self._iter_rows(request, response)
+
+    def _iter_rows(self, request, response):
+        model = None
+        if self.compact_rows == "records":
+            model = ROW_MODELS.get(endpoint_name(request.method, request.path))
+        try:
+            for row in iter_json_array(iter_chunks(response, REST_STREAM_CHUNK_SIZE)):
+                yield row if model is None else model.from_row(row)
+        finally:
+            response.close()
 
-    def send_request(self, http_method, url_path, payload=None):
+    def _with_retries(self, request, url_path, payload, send):
+        """Wrap `send` in the retry policy when the request is idempotent"""
+        if self.retry_policy is None or not self.retry_policy.is_idempotent(
+            request.method, url_path, payload
+        ):
+            return send
+
+        def send_with_retries():
+            attempt = 0
+            while True:
+                try:
+                    return send()
+                except Exception as e:
+                    delay = self.retry_policy.retry_delay(attempt, e)
+                    if delay is None:
+                        raise
+                    error = e
+                attempt += 1
+                if self.metrics is not None:
+                    self.metrics.record_retry(endpoint_name(request.method, request.path))
+                self.tracer.trace(
+                    "retry", path=request.path, attempt=attempt, delay=delay, error=error
+                )
+                sleep(delay)
+
+        return send_with_retries
+
+    def _coalesce(self, request, account, send):
+        """Run `send`, sharing one in-flight call between identical concurrent GETs.
+
+        Requests are identical when method, canonical path with query and
+        account match. Every waiting caller receives the same decoded
+        response object, which must not be mutated.
+        """
+        if self.single_flight is None or request.method != "GET":
+            return send()
+        return self.single_flight.do((request.method, request.path, account), send)
+
+    def send_request(self, http_method, url_path, payload=None, headers=None):
         if payload is None:
             payload = {}
         url = self.orderly_endpoint + url_path
-        self.logger.debug("url: " + url)
+        self.tracer.trace("request", method=http_method, url=url)
         params = cleanNoneValue(
             {
                 "url": url,
                 "params": payload,
+                "headers": headers,
                 "timeout": self.timeout,
                 "proxies": self.proxies,
             }
         )
-        response = self._dispatch_request(http_method, params)
-        self.logger.debug("raw response from server:" + response.text)
-        self._handle_rest_exception(response)
-
-        try:
-            data = response.json()
-        except ValueError:
-            data = response.text
+        response, data = self._execute(http_method, url_path, params)
         result = {}
 
         if self.show_header:
@@ -143,31 +382,113 @@ class API(object):
             return result
         return data
 
-    def _prepare_params(self, params: dict):
-        _http_method = params["http_method"]
-        _url_path = params["url_path"]
-        _payload = (
-            json.dumps(params["payload"]) if params["payload"] else params["payload"]
+    def _execute(self, http_method, url_path, params):
+        if self.metrics is None:
+            response = self._round_trip(http_method, url_path, params)
+            self.tracer.trace(
+                "response", status=response.status_code, body=response.content
+            )
+            self._handle_rest_exception(response)
+            return response, self._decode_rows(http_method, url_path, response)
+
+        endpoint = endpoint_name(http_method, url_path)
+        started = perf_counter()
+        try:
+            response = self._round_trip(http_method, url_path, params)
+        except Exception:
+            self.metrics.record_status(endpoint, "error")
+            raise
+        self.metrics.observe(endpoint, "network", perf_counter() - started)
+        self.metrics.record_status(endpoint, response.status_code)
+        self.tracer.trace("response", status=response.status_code, body=response.content)
+        self._handle_rest_exception(response)
+        started = perf_counter()
+        data = self._decode_rows(http_method, url_path, response)
+        self.metrics.observe(endpoint, "decode", perf_counter() - started)
+        return response, data
+
+    def _round_trip(self, http_method, url_path, params):
+        """Send the request through the hedging and circuit breaker layers when enabled"""
+        # Signed requests carry the orderly key, public ones only count against the IP
+        signed = "orderly-signature" in (params.get("headers") or {})
+
+        def acquire():
+            self._acquire_rate_limits(signed)
+
+        if self.circuit_breakers is None and self.hedger is None:
+            acquire()
+            return self._dispatch_request(http_method, params)
+        endpoint = endpoint_name(http_method, url_path)
+
+        def send():
+            return self._dispatch_request(http_method, params)
+
+        if (
+            self.hedger is not None
+            and http_method == "GET"
+            and not params.get("stream")
+            and self.hedger.applies(endpoint)
+        ):
+            dispatch = send
+
+            def send():
+                # A hedge is a second request, it takes its own tokens
+                return self.hedger.run(endpoint, dispatch, acquire)
+
+        # Tokens are taken once the breaker lets the call through, an open
+        # circuit fails fast without spending them
+        if self.circuit_breakers is None:
+            acquire()
+            return send()
+        return self.circuit_breakers.call(endpoint, send, acquire)
+
+    def _acquire_rate_limits(self, signed):
+        for bucket in self.rate_limits:
+            bucket.acquire()
+        if signed:
+            for bucket in self.signed_rate_limits:
+                bucket.acquire()
+
+    def _decode(self, response):
+        try:
+            return response.json()
+        except ValueError:
+            return response.text
+
+    def _decode_rows(self, http_method, url_path, response):
+        data = self._decode(response)
+        if self.compact_rows is None:
+            return data
+        return compact_rows(
+            data, self.compact_rows, endpoint_name(http_method, url_path)
         )
-        _params = "{0}{1}{2}".format(_http_method, _url_path, _payload)
-        return _params
+
+    def _encode_body(self, payload):
+        body, _ = encode_body(payload, self.json_encoder)
+        return body
 
     def _dispatch_request(self, http_method, params):
-        method_func = {
-            "GET": self.session.get,
-            "DELETE": self.session.delete,
-            "PUT": self.session.put,
-            "POST": self.session.post,
-        }.get(http_method, "GET")
+        # Headers are passed per request so that concurrent calls sharing a
+        # transport never see each other's signature.
+        headers = dict(params.get("headers") or {})
+        body = None
         if http_method == "POST" or http_method == "PUT":
-            return method_func(url=params["url"], json=params["params"])
+            headers["Content-Type"] = JSON_CONTENT_TYPE
+            body = params["params"]
+            if not isinstance(body, (bytes, bytearray)):
+                body = self._encode_body(body)
+            body = body or None
         else:
-            self.session.headers.update(
-                {
-                    "Content-Type": "application/x-www-form-urlencoded;charset=utf-8"
-                }
-            )
-            return method_func(url=params["url"])
+            headers["Content-Type"] = FORM_CONTENT_TYPE
+        send = self.transport.stream if params.get("stream") else self.transport.request
+        return send(
+            http_method,
+            params["url"],
+            headers=headers,
+            data=body,
+            timeout=params.get("timeout"),
+            proxies=params.get("proxies"),
+        )
 
     def _handle_rest_exception(self, response):
         status_code = response.status_code
@@ -177,13 +498,11 @@ class API(object):
             try:
                 err = json.loads(response.text)
             except JSONDecodeError:
-                raise ClientError(
-                    status_code, None, response.text, None, response.headers
-                )
+                raise ClientError(status_code, None, response.text, response.headers)
             error_data = None
             if "data" in err:
                 error_data = err["data"]
             raise ClientError(
                 status_code, err["code"], err["message"], response.headers, error_data
             )
-        raise ServerError(status_code, response.text)
+        raise ServerError(status_code, response.text, response.headers)
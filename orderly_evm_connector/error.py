@@ -17,9 +17,34 @@ class ClientError(Error):
 
 
 class ServerError(Error):
-    def __init__(self, status_code, message):
+    def __init__(self, status_code, message, header=None):
         self.status_code = status_code
         self.message = message
+        # the whole response header returned from server
+        self.header = header
+
+
+class CircuitOpenError(Error):
+    def __init__(self, endpoint, retry_in):
+        self.endpoint = endpoint
+        # seconds until the circuit lets a trial request through
+        self.retry_in = retry_in
+
+    def __str__(self):
+        return f"circuit open for {self.endpoint}, retry in {self.retry_in:.3f}s"
+
+
+class SubscriptionError(Error):
+    def __init__(self, message, reason, rejected=False):
+        # the subscribe or unsubscribe frame
+        self.message = message
+        # errorMsg of the server, or why no answer was received
+        self.reason = reason
+        # True when the server answered with a failure
+        self.rejected = rejected
+
+    def __str__(self):
+        return f"{self.message.get('event')} {self.message.get('topic')} failed: {self.reason}"
 
 
 class ParameterRequiredError(Error):
@@ -46,6 +71,21 @@ class ParameterTypeError(Error):
         return f"{self.params[0]} data type has to be {self.params[1]}"
 
 
+class ParameterValidationError(ParameterRequiredError, ParameterValueError):
+    """Missing and invalid parameters reported together.
+
+    It is both a `ParameterRequiredError` and a `ParameterValueError`, so
+    callers catching either keep working; `params` are the missing ones.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        self.params = errors[0].params
+
+    def __str__(self):
+        return "; ".join(str(error) for error in self.errors)
+
+
 class ParameterArgumentError(Error):
     def __init__(self, error_message):
         self.error_message = error_message
@@ -54,6 +94,15 @@ class ParameterArgumentError(Error):
         return self.error_message
 
 
+class OrderFilterError(Error):
+    def __init__(self, symbol, error_message):
+        self.symbol = symbol
+        self.error_message = error_message
+
+    def __str__(self):
+        return f"{self.symbol}: {self.error_message}"
+
+
 class WebsocketClientError(Error):
     def __init__(self, error_message):
         self.error_message = error_message
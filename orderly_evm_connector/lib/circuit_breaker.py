@@ -0,0 +1,140 @@
+import threading
+from time import monotonic, perf_counter
+
+from orderly_evm_connector.error import CircuitOpenError
+from orderly_evm_connector.lib.retry import is_transient_error
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Statuses counted as failures. 429 is left out: the server is healthy and
+# only asks this client to slow down.
+FAILURE_STATUS_CODES = frozenset((500, 502, 503, 504))
+
+
+class CircuitBreaker(object):
+    """Fails fast on an endpoint after consecutive failures.
+
+    A failure is a timeout, a connection error, a 5xx response, or, when
+    `latency_threshold` is set, a call slower than that many seconds. After
+    `failure_threshold` consecutive failures the circuit opens and `call`
+    raises `CircuitOpenError` at once. After `reset_timeout` seconds one
+    trial call is let through: success closes the circuit, failure opens it
+    again.
+    """
+
+    def __init__(
+        self, name, failure_threshold=5, reset_timeout=5.0, latency_threshold=None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_threshold = latency_threshold
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Raise `CircuitOpenError` unless a call may be sent now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(self.name, max(remaining, 0.0))
+
+    def record_success(self, seconds=None):
+        if (
+            self.latency_threshold is not None
+            and seconds is not None
+            and seconds > self.latency_threshold
+        ):
+            return self.record_failure()
+        with self._lock:
+            self.failures = 0
+            self.state = CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opened += 1
+                self.state = OPEN
+                self._opened_at = monotonic()
+
+    def _release(self):
+        with self._lock:
+            self._trial_in_flight = False
+
+    def call(self, send, acquire=None):
+        """Run `send`, which returns a response, through the breaker.
+
+        `acquire` is called once the call is allowed, before `send` and its
+        timing, e.g. to take rate limit tokens only for calls that go out.
+        """
+        self.allow()
+        if acquire is not None:
+            try:
+                acquire()
+            except BaseException:
+                self._release()
+                raise
+        started = perf_counter()
+        try:
+            response = send()
+        except Exception as e:
+            if is_transient_error(e):
+                self.record_failure()
+            else:
+                self._release()
+            raise
+        if response.status_code in FAILURE_STATUS_CODES:
+            self.record_failure()
+        else:
+            self.record_success(perf_counter() - started)
+        return response
+
+
+class CircuitBreakers(object):
+    """One `CircuitBreaker` per endpoint, created on first use with the given settings.
+
+    An instance can be shared by several clients talking to the same API.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=5.0, latency_threshold=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_threshold = latency_threshold
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint):
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(endpoint)
+                if breaker is None:
+                    breaker = self._breakers[endpoint] = CircuitBreaker(
+                        endpoint,
+                        failure_threshold=self.failure_threshold,
+                        reset_timeout=self.reset_timeout,
+                        latency_threshold=self.latency_threshold,
+                    )
+        return breaker
+
+    def call(self, endpoint, send, acquire=None):
+        return self.get(endpoint).call(send, acquire)
+
+    def states(self):
+        return {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
@@ -1,3 +1,26 @@
 WEBSOCKET_TIMEOUT_IN_SECONDS = 11
 WEBSOCKET_FAILED_MAX_RETRIES = 30
 WEBSOCKET_RETRY_SLEEP_TIME = 5
+WEBSOCKET_DISPATCH_QUEUE_SIZE = 1000
+
+REST_KEEPALIVE_PATH = "/v1/public/system_info"
+REST_KEEPALIVE_INTERVAL_IN_SECONDS = 25
+# Bound of a warm-up request when the client has no timeout
+REST_PREWARM_TIMEOUT_IN_SECONDS = 5
+# Bound of a keep-alive ping, so a stuck connection cannot wedge the pinger
+REST_KEEPALIVE_TIMEOUT_IN_SECONDS = 2
+
+# DELETE /v1/batch-order and /v1/client/batch-order accept at most 10 ids
+BATCH_CANCEL_MAX_IDS = 10
+# Cancel endpoints allow 10 requests per second per user, each
+CANCEL_RATE_LIMIT_PER_SECOND = 10
+
+KILL_SWITCH_DEADLINE_IN_SECONDS = 2
+
+REST_STREAM_CHUNK_SIZE = 65536
+
+# Subscribe and unsubscribe frames: send rate, unacknowledged frames allowed
+# at once, and seconds to wait for an acknowledgement
+WEBSOCKET_SUBSCRIBE_RATE_PER_SECOND = 200
+WEBSOCKET_MAX_PENDING_SUBSCRIPTIONS = 50
+WEBSOCKET_SUBSCRIBE_ACK_TIMEOUT = 5
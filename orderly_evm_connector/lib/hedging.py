@@ -0,0 +1,140 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from time import perf_counter
+
+from orderly_evm_connector.lib.metrics import LatencyHistogram
+
+# Reads that are safe to send twice and where tail latency hurts most.
+HEDGED_ENDPOINTS = (
+    "GET /v1/orderbook/:symbol",
+    "GET /v1/positions",
+    "GET /v1/position/:symbol",
+    "GET /v1/client/holding",
+    "GET /v1/orders",
+    "GET /v1/public/futures",
+)
+
+
+def _lost(result):
+    """A response the caller would turn into an error, worse than a slow success"""
+    status_code = getattr(result, "status_code", None)
+    return status_code is not None and (status_code >= 500 or status_code == 429)
+
+
+class Hedger(object):
+    """Sends a second copy of a slow idempotent request and keeps the first answer.
+
+    The primary request runs on a thread of its own, so it never waits for
+    a pool slot. If it has not answered after the `quantile` (p95 by
+    default) latency observed for its endpoint, an identical hedge request
+    is sent from the worker pool, which the pooled transport places on
+    another connection, and whichever succeeds first is returned. An
+    exception, a 5xx or a 429 response does not count as a success. Until
+    `min_samples` latencies are known the delay is `default_delay`. The
+    losing request runs to completion in the background and is discarded.
+
+    Args:
+        endpoints: endpoint names to hedge (see `metrics.endpoint_name`), None for every GET
+        quantile: latency quantile after which the hedge is sent
+        default_delay: hedge delay in seconds before enough samples are collected
+        min_delay: lower bound of the hedge delay in seconds
+        min_samples: samples needed before the quantile is used
+        max_workers: threads sending hedge requests
+    """
+
+    def __init__(
+        self,
+        endpoints=HEDGED_ENDPOINTS,
+        quantile=0.95,
+        default_delay=0.05,
+        min_delay=0.001,
+        min_samples=20,
+        max_workers=16,
+    ):
+        self.endpoints = frozenset(endpoints) if endpoints is not None else None
+        self.quantile = quantile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latency = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="orderly-hedge"
+        )
+
+    def applies(self, endpoint):
+        return self.endpoints is None or endpoint in self.endpoints
+
+    def delay(self, endpoint):
+        histogram = self._latency.get(endpoint)
+        if histogram is None or histogram.count < self.min_samples:
+            return self.default_delay
+        with self._lock:
+            return max(histogram.quantile(self.quantile), self.min_delay)
+
+    def _observe(self, endpoint, seconds):
+        with self._lock:
+            histogram = self._latency.get(endpoint)
+            if histogram is None:
+                histogram = self._latency[endpoint] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def _timed(self, endpoint, send, future):
+        started = perf_counter()
+        try:
+            result = send()
+        except BaseException as e:
+            future.set_exception(e)
+            return
+        if not _lost(result):
+            self._observe(endpoint, perf_counter() - started)
+        future.set_result(result)
+
+    def run(self, endpoint, send, acquire=None):
+        """Return the first successful result of `send`, hedging it when slow.
+
+        `acquire` is called before the hedge is sent, e.g. to take a rate
+        limit token for the second request.
+        """
+        primary = Future()
+        threading.Thread(
+            target=self._timed,
+            args=(endpoint, send, primary),
+            name="orderly-hedge-primary",
+            daemon=True,
+        ).start()
+        try:
+            primary.result(timeout=self.delay(endpoint))
+        except FutureTimeoutError:
+            pass
+        except Exception:
+            return primary.result()
+        if primary.done():
+            return primary.result()
+
+        def hedged():
+            if acquire is not None:
+                acquire()
+            future = Future()
+            self._timed(endpoint, send, future)
+            return future.result()
+
+        hedge = self._executor.submit(hedged)
+        with self._lock:
+            self.hedged += 1
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and not _lost(future.result()):
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+        return primary.result()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,124 @@
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Reader(object):
+    """JSON text fed chunk by chunk; only the unparsed tail is kept"""
+
+    __slots__ = ("_chunks", "_utf8", "text", "pos", "eof")
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Append the next chunk, returns False at the end of the stream"""
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self.text = self.text[self.pos :] + text
+                self.pos = 0
+                return True
+        self.text = self.text[self.pos :] + self._utf8.decode(b"", final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Next non-whitespace character, None at the end of the stream"""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                "Expected {!r} in JSON stream, found {!r}".format(char, found)
+            )
+        self.pos += 1
+
+    def next_separator(self, closing):
+        """Consume a ',' (returns True) or `closing` (returns False)"""
+        found = self.peek()
+        if found == ",":
+            self.pos += 1
+            return True
+        self.expect(closing)
+        return False
+
+    def value(self):
+        """Parse the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.text) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _walk(reader, path):
+    if not path:
+        if reader.peek() != "[":
+            reader.value()
+            return
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        while True:
+            yield reader.value()
+            if not reader.next_separator("]"):
+                return
+    if reader.peek() != "{":
+        reader.value()
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == path[0]:
+            yield from _walk(reader, path[1:])
+        else:
+            reader.value()
+        if not reader.next_separator("}"):
+            return
+
+
+def iter_json_array(chunks, path=("data", "rows")):
+    """Yield the items of the array at `path` of a JSON document, as it is read.
+
+    `chunks` is an iterable of `bytes` or `str` pieces of the document, e.g.
+    `response.iter_content(65536)`. Each item is parsed as soon as it is
+    complete, so only one item and the current chunk are held at a time.
+    Nothing is yielded when `path` is missing or not an array, and a
+    truncated or malformed document raises `ValueError`.
+    """
+    reader = _Reader(chunks)
+    yield from _walk(reader, tuple(path))
+    if reader.peek() is not None:
+        raise ValueError("Extra data after the JSON document")
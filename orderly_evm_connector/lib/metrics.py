@@ -0,0 +1,354 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+
+# Upper bounds in seconds, spaced for sub-millisecond signing up to slow
+# network round trips.
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    float("inf"),
+)
+
+_ID_SEGMENT = re.compile(r"\d")
+_SYMBOL_SEGMENT = re.compile(r"^[A-Z0-9]+_[A-Z0-9_]+$")
+_VERSION_SEGMENT = re.compile(r"^v\d+$")
+
+# Path segments whose next segment is a free-form parameter, whatever it looks like.
+_PARAMETER_POSITIONS = {
+    "/v1/order": ":id",
+    "/v1/algo/order": ":id",
+    "/v1/trade": ":id",
+    "/v1/client/order": ":client_order_id",
+    "/v1/algo/client/order": ":client_order_id",
+    "/v1/orderbook": ":symbol",
+    "/v1/position": ":symbol",
+    "/v1/public/funding_rate": ":symbol",
+    "/v1/public/futures": ":symbol",
+    "/v1/public/info": ":symbol",
+}
+
+
+@lru_cache(maxsize=1024)
+def endpoint_name(http_method, url_path):
+    """Stable metric label of a request, e.g. `GET /v1/order/:id`.
+
+    The query string is dropped and path segments carrying ids or symbols
+    are replaced, so the number of labels stays bounded.
+    """
+    segments = []
+    for segment in url_path.split("?", 1)[0].split("/"):
+        parameter = _PARAMETER_POSITIONS.get("/".join(segments))
+        if parameter is not None and segment:
+            segment = parameter
+        elif _SYMBOL_SEGMENT.match(segment):
+            segment = ":symbol"
+        elif _ID_SEGMENT.search(segment) and not _VERSION_SEGMENT.match(segment):
+            segment = ":id"
+        segments.append(segment)
+    return f"{http_method} {'/'.join(segments)}"
+
+
+class LatencyHistogram(object):
+    """Cumulative-friendly histogram over fixed latency buckets"""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile, None when empty"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def histogram_to_prometheus(name, histogram, **labels):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(
+            f"{name}_bucket{{{_labels(**labels, le=_format_bound(bound))}}} {cumulative}"
+        )
+    lines.append(f"{name}_sum{{{_labels(**labels)}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{_labels(**labels)}}} {histogram.count}")
+    return lines
+
+
+class RestMetrics(object):
+    """Per-endpoint latency and status metrics of REST calls.
+
+    Latency is split in stages: `sign` (signature), `serialize` (building the
+    signed string and body), `network` (transport round trip), `decode`
+    (JSON parsing) and `total`, serialization plus one attempt: each retry is
+    observed as its own `total`, and the backoff between attempts is not
+    part of any stage. Retries made by a `RetryPolicy` are counted per
+    endpoint. One instance can be shared by several clients. Read it with
+    `snapshot()` or `to_prometheus()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._status = {}
+        self._rate_limited = {}
+        self._retries = {}
+
+    def observe(self, endpoint, stage, seconds):
+        with self._lock:
+            histogram = self._latency.get((endpoint, stage))
+            if histogram is None:
+                histogram = self._latency[(endpoint, stage)] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def record_status(self, endpoint, status_code):
+        with self._lock:
+            key = (endpoint, status_code)
+            self._status[key] = self._status.get(key, 0) + 1
+            if status_code == 429:
+                self._rate_limited[endpoint] = self._rate_limited.get(endpoint, 0) + 1
+
+    def record_retry(self, endpoint):
+        with self._lock:
+            self._retries[endpoint] = self._retries.get(endpoint, 0) + 1
+
+    def latency(self, endpoint, stage="total"):
+        return self._latency.get((endpoint, stage))
+
+    def reset(self):
+        with self._lock:
+            self._latency.clear()
+            self._status.clear()
+            self._rate_limited.clear()
+            self._retries.clear()
+
+    def snapshot(self):
+        """Plain dict view: {endpoint: {"latency": {stage: {...}}, "status": {...}, "rate_limited": n, "retries": n}}"""
+        result = {}
+
+        def entry(endpoint):
+            return result.setdefault(
+                endpoint, {"latency": {}, "status": {}, "rate_limited": 0, "retries": 0}
+            )
+
+        with self._lock:
+            for (endpoint, stage), histogram in self._latency.items():
+                entry(endpoint)["latency"][stage] = histogram.snapshot()
+            for (endpoint, status_code), count in self._status.items():
+                entry(endpoint)["status"][status_code] = count
+            for endpoint, count in self._rate_limited.items():
+                entry(endpoint)["rate_limited"] = count
+            for endpoint, count in self._retries.items():
+                entry(endpoint)["retries"] = count
+        return result
+
+    def to_prometheus(self, prefix="orderly_rest"):
+        lines = [f"# TYPE {prefix}_latency_seconds histogram"]
+        with self._lock:
+            for (endpoint, stage), histogram in sorted(self._latency.items()):
+                lines.extend(
+                    histogram_to_prometheus(
+                        f"{prefix}_latency_seconds", histogram, endpoint=endpoint, stage=stage
+                    )
+                )
+            lines.append(f"# TYPE {prefix}_responses_total counter")
+            for (endpoint, status_code), count in sorted(
+                self._status.items(), key=lambda item: (item[0][0], str(item[0][1]))
+            ):
+                lines.append(
+                    f"{prefix}_responses_total{{{_labels(endpoint=endpoint, status=status_code)}}} {count}"
+                )
+            lines.append(f"# TYPE {prefix}_rate_limited_total counter")
+            for endpoint, count in sorted(self._rate_limited.items()):
+                lines.append(
+                    f"{prefix}_rate_limited_total{{{_labels(endpoint=endpoint)}}} {count}"
+                )
+            lines.append(f"# TYPE {prefix}_retries_total counter")
+            for endpoint, count in sorted(self._retries.items()):
+                lines.append(f"{prefix}_retries_total{{{_labels(endpoint=endpoint)}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class _TopicStats(object):
+    __slots__ = (
+        "messages",
+        "bytes",
+        "dropped",
+        "latency",
+        "callback",
+        "window_start",
+        "window_messages",
+        "window_bytes",
+        "messages_per_second",
+        "bytes_per_second",
+    )
+
+    def __init__(self, now):
+        self.messages = 0
+        self.bytes = 0
+        self.dropped = 0
+        self.latency = LatencyHistogram()
+        self.callback = LatencyHistogram()
+        self.window_start = now
+        self.window_messages = 0
+        self.window_bytes = 0
+        self.messages_per_second = 0.0
+        self.bytes_per_second = 0.0
+
+    def snapshot(self):
+        return {
+            "messages": self.messages,
+            "bytes": self.bytes,
+            "dropped": self.dropped,
+            "messages_per_second": self.messages_per_second,
+            "bytes_per_second": self.bytes_per_second,
+            "latency": self.latency.snapshot(),
+            "callback": self.callback.snapshot(),
+        }
+
+
+class StreamMetrics(object):
+    """Per-topic metrics of a websocket stream.
+
+    For every topic it counts messages and bytes, keeps messages/s and
+    bytes/s over a rolling window, and records two histograms: `latency`,
+    from the exchange `ts` field to local receive time, and `callback`, the
+    time spent in the user callback. `queue_depth` is the number of frames
+    received but not yet delivered, and `dropped` counts frames discarded or
+    conflated away by the dispatcher. Read it with `snapshot()` or
+    `to_prometheus()`.
+    """
+
+    def __init__(self, rate_window=1.0):
+        self.rate_window = rate_window
+        self.queue_depth = 0
+        self._lock = threading.Lock()
+        self._topics = {}
+
+    def _stats(self, topic, now):
+        stats = self._topics.get(topic)
+        if stats is None:
+            stats = self._topics[topic] = _TopicStats(now)
+        return stats
+
+    def record_message(self, topic, size, exchange_ts=None, received=None):
+        """Count one frame; `exchange_ts` and `received` are epoch milliseconds"""
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats(topic, now)
+            stats.messages += 1
+            stats.bytes += size
+            stats.window_messages += 1
+            stats.window_bytes += size
+            elapsed = now - stats.window_start
+            if elapsed >= self.rate_window:
+                stats.messages_per_second = stats.window_messages / elapsed
+                stats.bytes_per_second = stats.window_bytes / elapsed
+                stats.window_start = now
+                stats.window_messages = 0
+                stats.window_bytes = 0
+            if exchange_ts:
+                if received is None:
+                    received = time.time() * 1000
+                stats.latency.observe(max(received - exchange_ts, 0) / 1000)
+
+    def record_callback(self, topic, seconds):
+        with self._lock:
+            self._stats(topic, time.monotonic()).callback.observe(seconds)
+
+    def record_drop(self, topic):
+        with self._lock:
+            self._stats(topic, time.monotonic()).dropped += 1
+
+    def set_queue_depth(self, depth):
+        self.queue_depth = depth
+
+    def topic(self, topic):
+        stats = self._topics.get(topic)
+        return stats.snapshot() if stats is not None else None
+
+    def reset(self):
+        with self._lock:
+            self._topics.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "topics": {topic: stats.snapshot() for topic, stats in self._topics.items()},
+            }
+
+    def to_prometheus(self, prefix="orderly_ws"):
+        lines = [f"# TYPE {prefix}_queue_depth gauge", f"{prefix}_queue_depth {self.queue_depth}"]
+        with self._lock:
+            topics = sorted(self._topics.items())
+            lines.append(f"# TYPE {prefix}_messages_total counter")
+            for topic, stats in topics:
+                lines.append(f"{prefix}_messages_total{{{_labels(topic=topic)}}} {stats.messages}")
+            lines.append(f"# TYPE {prefix}_bytes_total counter")
+            for topic, stats in topics:
+                lines.append(f"{prefix}_bytes_total{{{_labels(topic=topic)}}} {stats.bytes}")
+            lines.append(f"# TYPE {prefix}_dropped_total counter")
+            for topic, stats in topics:
+                lines.append(f"{prefix}_dropped_total{{{_labels(topic=topic)}}} {stats.dropped}")
+            lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+            for topic, stats in topics:
+                lines.extend(
+                    histogram_to_prometheus(f"{prefix}_latency_seconds", stats.latency, topic=topic)
+                )
+            lines.append(f"# TYPE {prefix}_callback_seconds histogram")
+            for topic, stats in topics:
+                lines.extend(
+                    histogram_to_prometheus(f"{prefix}_callback_seconds", stats.callback, topic=topic)
+                )
+        return "\n".join(lines) + "\n"
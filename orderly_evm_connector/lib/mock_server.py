@@ -0,0 +1,631 @@
+import base64
+import itertools
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import base58
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+
+try:
+    from websockets.sync.server import serve as websocket_serve
+except ImportError:  # pragma: no cover - optional dependency
+    websocket_serve = None
+
+from orderly_evm_connector.lib.rate_limit import TokenBucket
+
+DEFAULT_SYMBOLS = (
+    {
+        "symbol": "PERP_ETH_USDC",
+        "quote_min": 0,
+        "quote_max": 100000,
+        "quote_tick": 0.01,
+        "base_min": 0.001,
+        "base_max": 1000,
+        "base_tick": 0.001,
+        "min_notional": 10,
+        "price_range": 0.03,
+    },
+    {
+        "symbol": "PERP_BTC_USDC",
+        "quote_min": 0,
+        "quote_max": 1000000,
+        "quote_tick": 0.1,
+        "base_min": 0.0001,
+        "base_max": 100,
+        "base_tick": 0.0001,
+        "min_notional": 10,
+        "price_range": 0.03,
+    },
+)
+
+# Private websocket topics, subscribing to them requires a successful auth.
+PRIVATE_TOPICS = frozenset(
+    (
+        "account",
+        "balance",
+        "position",
+        "liquidationsaccount",
+        "wallet",
+        "settle",
+        "notifications",
+        "executionreport",
+        "algoexecutionreportv2",
+    )
+)
+
+_RECV_WINDOW_MS = 300000
+
+
+def generate_orderly_key_pair():
+    """New `(orderly_key, orderly_secret)` pair in the format used by the connector"""
+    private_key = Ed25519PrivateKey.generate()
+    secret = private_key.private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption())
+    public = private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+    return (
+        "ed25519:" + base58.b58encode(public).decode("utf-8"),
+        "ed25519:" + base58.b58encode(secret).decode("utf-8"),
+    )
+
+
+def verify_signature(orderly_key, message, signature):
+    """Check an Orderly ed25519 signature of `message` made with `orderly_key`"""
+    try:
+        public_key = Ed25519PublicKey.from_public_bytes(
+            base58.b58decode(orderly_key.split(":")[1])
+        )
+        public_key.verify(base64.b64decode(signature), message.encode("utf-8"))
+    except (InvalidSignature, ValueError, IndexError, AttributeError):
+        return False
+    return True
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def _error(status_code, code, message):
+    return status_code, {"success": False, "code": code, "message": message}
+
+
+def _ok(data):
+    return 200, {"success": True, "data": data, "timestamp": _now_ms()}
+
+
+class _RestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately, without TCP_NODELAY the
+        # body waits for the client's delayed ACK.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        mock = self.server.mock
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        status_code, payload, headers = mock.handle_request(
+            self.command, self.path, self.headers, body, self.client_address[0]
+        )
+        content = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+
+class _WebsocketSession(object):
+    __slots__ = ("connection", "private", "orderly_key", "topics", "lock")
+
+    def __init__(self, connection, private):
+        self.connection = connection
+        self.private = private
+        self.orderly_key = None
+        self.topics = set()
+        self.lock = threading.Lock()
+
+    def send(self, message):
+        with self.lock:
+            self.connection.send(json.dumps(message))
+
+
+class MockOrderlyServer(object):
+    """Local stand-in for the Orderly REST and websocket APIs.
+
+    Meant for load and latency benchmarks and integration tests against a
+    real socket. Orders live in memory: LIMIT orders rest until cancelled,
+    MARKET orders fill at once and move the position. Signed requests are
+    verified against the ed25519 `orderly-key` they carry, use
+    `generate_orderly_key_pair()` to get credentials. Endpoints without a
+    handler answer `{"success": true, "data": {}}`.
+
+    The websocket server handles ping/pong, auth, subscribe, unsubscribe and
+    request events. `publish(topic, data)` pushes a message to subscribers,
+    and order changes are pushed on `executionreport` to the connections
+    authenticated with the same key. It needs the `websockets` package.
+
+    Args:
+        host: interface to bind, ports are picked by the OS
+        latency: seconds added to every REST response, or a callable `(method, path)` returning them
+        rate_limit: REST requests per second allowed per orderly key (or client ip), None for no limit
+        rate_limit_burst: bucket capacity, defaults to `rate_limit`
+        verify_signatures: set False to accept any signature
+        websocket: set False to only serve REST
+        ping_interval: seconds between server pings on websocket connections, None to disable
+        symbols: rows served by `/v1/public/info`
+
+    Point a client at it with `client.orderly_endpoint = server.rest_url`
+    and `OrderlyWebsocketClient(server.ws_url, ...)`.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        latency=0.0,
+        rate_limit=None,
+        rate_limit_burst=None,
+        verify_signatures=True,
+        websocket=True,
+        ping_interval=10,
+        symbols=DEFAULT_SYMBOLS,
+    ):
+        if websocket and websocket_serve is None:
+            raise ImportError(
+                "The mock websocket server requires websockets, run: pip install websockets"
+            )
+        self.host = host
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_burst = rate_limit_burst
+        self.verify_signatures = verify_signatures
+        self.websocket = websocket
+        self.ping_interval = ping_interval
+        self.symbols = {row["symbol"]: dict(row) for row in symbols}
+        self.orders = {}
+        self.positions = {}
+        self.requests = 0
+        self.rate_limited = 0
+        self._order_ids = itertools.count(1)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._sessions = set()
+        self._sessions_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads = []
+        self._http_server = None
+        self._ws_server = None
+        self._routes = {
+            ("GET", "/v1/public/system_info"): self._system_info,
+            ("GET", "/v1/public/info"): self._symbol_info,
+            ("POST", "/v1/order"): self._create_order,
+            ("POST", "/v1/batch-order"): self._batch_create_order,
+            ("PUT", "/v1/order"): self._edit_order,
+            ("DELETE", "/v1/order"): self._cancel_order,
+            ("DELETE", "/v1/client/order"): self._cancel_order_by_client_order_id,
+            ("DELETE", "/v1/orders"): self._cancel_orders,
+            ("DELETE", "/v1/batch-order"): self._batch_cancel_orders,
+            ("DELETE", "/v1/client/batch-order"): self._batch_cancel_orders_by_client_order_id,
+            ("GET", "/v1/orders"): self._get_orders,
+            ("GET", "/v1/positions"): self._get_positions,
+        }
+
+    @property
+    def rest_url(self):
+        return f"http://{self.host}:{self._http_server.server_address[1]}"
+
+    @property
+    def ws_url(self):
+        return f"ws://{self.host}:{self._ws_server.socket.getsockname()[1]}/ws/stream"
+
+    @property
+    def ws_private_url(self):
+        return f"ws://{self.host}:{self._ws_server.socket.getsockname()[1]}/v2/ws/private/stream"
+
+    def start(self):
+        self._http_server = ThreadingHTTPServer((self.host, 0), _RestHandler)
+        self._http_server.daemon_threads = True
+        self._http_server.mock = self
+        self._spawn(self._http_server.serve_forever, "orderly-mock-rest")
+        if self.websocket:
+            # Clients may keep the TCP connection open after the close
+            # handshake, do not wait long for them on shutdown.
+            self._ws_server = websocket_serve(
+                self._ws_handler, self.host, 0, close_timeout=1
+            )
+            self._spawn(self._ws_server.serve_forever, "orderly-mock-ws")
+            if self.ping_interval:
+                self._spawn(self._ping_loop, "orderly-mock-ping")
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+        if self._ws_server is not None:
+            self._ws_server.shutdown()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    # REST
+
+    def handle_request(self, method, path, headers, body, client_ip):
+        """Answer one REST request, returns `(status_code, payload, headers)`"""
+        with self._lock:
+            self.requests += 1
+        latency = self.latency(method, path) if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+        orderly_key = headers.get("orderly-key")
+        if self.rate_limit and not self._bucket(orderly_key or client_ip).try_acquire():
+            with self._lock:
+                self.rate_limited += 1
+            status_code, payload = _error(429, -1003, "Rate limit exceed.")
+            return status_code, payload, {"Retry-After": "1"}
+
+        if orderly_key is not None and not self._authorized(method, path, headers, body):
+            return _error(401, -1002, "Signature verification failed.") + ({},)
+
+        url = urlsplit(path)
+        query = dict(parse_qsl(url.query))
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return _error(400, -1102, "Malformed JSON body.") + ({},)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            return _ok({}) + ({},)
+        return handler(orderly_key, query, payload) + ({},)
+
+    def _bucket(self, key):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(
+                    self.rate_limit, self.rate_limit_burst
+                )
+            return bucket
+
+    def _authorized(self, method, path, headers, body):
+        if not self.verify_signatures:
+            return True
+        timestamp = headers.get("orderly-timestamp") or ""
+        if not timestamp.isdigit() or abs(_now_ms() - int(timestamp)) > _RECV_WINDOW_MS:
+            return False
+        return verify_signature(
+            headers.get("orderly-key"),
+            f"{timestamp}{method}{path}{body}",
+            headers.get("orderly-signature") or "",
+        )
+
+    def _system_info(self, orderly_key, query, payload):
+        return _ok({"status": 0, "msg": "System is functioning properly."})
+
+    def _symbol_info(self, orderly_key, query, payload):
+        return _ok({"rows": list(self.symbols.values())})
+
+    def _new_order(self, orderly_key, order):
+        for name in ("symbol", "order_type", "side"):
+            if not order.get(name):
+                return None, _error(400, -1102, f"{name} is required.")
+        if order["symbol"] not in self.symbols:
+            return None, _error(400, -1102, f"unknown symbol {order['symbol']}.")
+        quantity = float(order.get("order_quantity") or 0)
+        signed_quantity = quantity if order["side"] == "BUY" else -quantity
+        now = _now_ms()
+        with self._lock:
+            position = self.positions.get(order["symbol"], 0.0)
+            if order.get("reduce_only") and (
+                position == 0 or (position > 0) == (signed_quantity > 0)
+            ):
+                return None, _error(400, -1103, "Reduce only order would increase position.")
+            row = {
+                "order_id": next(self._order_ids),
+                "orderly_key": orderly_key,
+                "client_order_id": order.get("client_order_id"),
+                "symbol": order["symbol"],
+                "side": order["side"],
+                "type": order["order_type"],
+                "price": order.get("order_price"),
+                "quantity": quantity,
+                "amount": order.get("order_amount"),
+                "executed": 0.0,
+                "reduce_only": bool(order.get("reduce_only")),
+                "status": "NEW",
+                "created_time": now,
+                "updated_time": now,
+            }
+            if row["type"] == "MARKET":
+                row["executed"] = quantity
+                row["status"] = "FILLED"
+                self.positions[row["symbol"]] = position + signed_quantity
+            self.orders[row["order_id"]] = row
+        self._push_execution_report(row)
+        return row, None
+
+    def _create_order(self, orderly_key, query, payload):
+        row, error = self._new_order(orderly_key, payload)
+        if error is not None:
+            return error
+        return _ok(
+            {
+                "order_id": row["order_id"],
+                "client_order_id": row["client_order_id"],
+                "order_type": row["type"],
+                "order_price": row["price"],
+                "order_quantity": row["quantity"],
+                "order_amount": row["amount"],
+            }
+        )
+
+    def _batch_create_order(self, orderly_key, query, payload):
+        rows = []
+        for order in payload.get("orders") or []:
+            row, error = self._new_order(orderly_key, order)
+            if error is not None:
+                return error
+            rows.append(
+                {
+                    "order_id": row["order_id"],
+                    "client_order_id": row["client_order_id"],
+                    "order_type": row["type"],
+                    "order_price": row["price"],
+                    "order_quantity": row["quantity"],
+                }
+            )
+        return _ok({"rows": rows})
+
+    def _edit_order(self, orderly_key, query, payload):
+        with self._lock:
+            row = self.orders.get(int(payload.get("order_id") or 0))
+            if row is None or row["status"] != "NEW":
+                return _error(400, -1006, "Order not found.")
+            if payload.get("order_price") is not None:
+                row["price"] = payload["order_price"]
+            if payload.get("order_quantity") is not None:
+                row["quantity"] = float(payload["order_quantity"])
+            row["updated_time"] = _now_ms()
+        self._push_execution_report(row)
+        return _ok({"status": "EDIT_SENT"})
+
+    def _cancel(self, match):
+        """Cancel the open orders for which `match(row)` is true, returns them"""
+        cancelled = []
+        with self._lock:
+            for row in self.orders.values():
+                if row["status"] == "NEW" and match(row):
+                    row["status"] = "CANCELLED"
+                    row["updated_time"] = _now_ms()
+                    cancelled.append(row)
+        for row in cancelled:
+            self._push_execution_report(row)
+        return cancelled
+
+    def _cancel_order(self, orderly_key, query, payload):
+        order_id = int(query.get("order_id") or 0)
+        if not self._cancel(lambda row: row["order_id"] == order_id):
+            return _error(400, -1006, "Order not found.")
+        return _ok({"status": "CANCEL_SENT"})
+
+    def _cancel_order_by_client_order_id(self, orderly_key, query, payload):
+        client_order_id = query.get("client_order_id")
+        if not self._cancel(lambda row: row["client_order_id"] == client_order_id):
+            return _error(400, -1006, "Order not found.")
+        return _ok({"status": "CANCEL_SENT"})
+
+    def _cancel_orders(self, orderly_key, query, payload):
+        symbol = query.get("symbol")
+        self._cancel(lambda row: symbol is None or row["symbol"] == symbol)
+        return _ok({"status": "CANCEL_ALL_SENT"})
+
+    def _batch_cancel_orders(self, orderly_key, query, payload):
+        order_ids = {int(i) for i in query.get("order_ids", "").split(",") if i}
+        self._cancel(lambda row: row["order_id"] in order_ids)
+        return _ok({"status": "CANCEL_ALL_SENT"})
+
+    def _batch_cancel_orders_by_client_order_id(self, orderly_key, query, payload):
+        client_order_ids = set(query.get("client_order_ids", "").split(","))
+        self._cancel(lambda row: row["client_order_id"] in client_order_ids)
+        return _ok({"status": "CANCEL_ALL_SENT"})
+
+    def _get_orders(self, orderly_key, query, payload):
+        symbol = query.get("symbol")
+        status = query.get("status")
+        page = int(query.get("page") or 1)
+        size = int(query.get("size") or 25)
+        with self._lock:
+            rows = [
+                {k: v for k, v in row.items() if k != "orderly_key"}
+                for row in self.orders.values()
+                if (symbol is None or row["symbol"] == symbol)
+                and (
+                    status is None
+                    or row["status"] == status
+                    or (status == "INCOMPLETE" and row["status"] == "NEW")
+                )
+            ]
+        return _ok(
+            {
+                "meta": {
+                    "total": len(rows),
+                    "records_per_page": size,
+                    "current_page": page,
+                },
+                "rows": rows[(page - 1) * size : page * size],
+            }
+        )
+
+    def _get_positions(self, orderly_key, query, payload):
+        with self._lock:
+            rows = [
+                {"symbol": symbol, "position_qty": quantity}
+                for symbol, quantity in self.positions.items()
+            ]
+        return _ok({"rows": rows})
+
+    # Websocket
+
+    def publish(self, topic, data, ts=None):
+        """Push `data` on `topic` to every subscribed connection, returns the number of receivers"""
+        message = {"topic": topic, "ts": ts or _now_ms(), "data": data}
+        sent = 0
+        for session in self._subscribers(lambda session: topic in session.topics):
+            sent += self._send(session, message)
+        return sent
+
+    def _subscribers(self, match):
+        with self._sessions_lock:
+            return [session for session in self._sessions if match(session)]
+
+    def _send(self, session, message):
+        try:
+            session.send(message)
+        except Exception:
+            return 0
+        return 1
+
+    def _push_execution_report(self, row):
+        if not self.websocket or row["orderly_key"] is None:
+            return
+        message = {
+            "topic": "executionreport",
+            "ts": _now_ms(),
+            "data": {
+                "symbol": row["symbol"],
+                "clientOrderId": row["client_order_id"],
+                "orderId": row["order_id"],
+                "type": row["type"],
+                "side": row["side"],
+                "quantity": row["quantity"],
+                "price": row["price"],
+                "executedQuantity": row["executed"],
+                "status": row["status"],
+                "reduceOnly": row["reduce_only"],
+                "timestamp": row["updated_time"],
+            },
+        }
+        for session in self._subscribers(
+            lambda session: session.orderly_key == row["orderly_key"]
+            and "executionreport" in session.topics
+        ):
+            self._send(session, message)
+
+    def _ping_loop(self):
+        while not self._stopped.wait(self.ping_interval):
+            for session in self._subscribers(lambda session: True):
+                self._send(session, {"event": "ping", "ts": _now_ms()})
+
+    def _ws_handler(self, connection):
+        session = _WebsocketSession(connection, "private" in connection.request.path)
+        with self._sessions_lock:
+            self._sessions.add(session)
+        try:
+            for frame in connection:
+                self._on_ws_message(session, frame)
+        except Exception:
+            pass
+        finally:
+            with self._sessions_lock:
+                self._sessions.discard(session)
+
+    def _on_ws_message(self, session, frame):
+        try:
+            message = json.loads(frame)
+        except ValueError:
+            return
+        event = message.get("event")
+        if event == "ping":
+            session.send({"event": "pong", "ts": _now_ms()})
+        elif event == "pong":
+            pass
+        elif event == "auth":
+            self._ws_auth(session, message)
+        elif event in ("subscribe", "unsubscribe"):
+            self._ws_subscribe(session, message)
+        elif event == "request":
+            session.send(
+                {
+                    "id": message.get("id"),
+                    "event": "request",
+                    "success": True,
+                    "ts": _now_ms(),
+                    "data": {},
+                }
+            )
+        else:
+            session.send(
+                {
+                    "id": message.get("id"),
+                    "event": event,
+                    "success": False,
+                    "ts": _now_ms(),
+                    "errorMsg": f"unknown event {event}",
+                }
+            )
+
+    def _ws_auth(self, session, message):
+        params = message.get("params") or {}
+        orderly_key = params.get("orderly_key")
+        success = bool(orderly_key) and (
+            not self.verify_signatures
+            or verify_signature(orderly_key, str(params.get("timestamp")), params.get("sign") or "")
+        )
+        reply = {"id": message.get("id"), "event": "auth", "success": success, "ts": _now_ms()}
+        if success:
+            session.orderly_key = orderly_key
+        else:
+            reply["errorMsg"] = "Signature verification failed."
+        session.send(reply)
+
+    def _ws_subscribe(self, session, message):
+        event = message["event"]
+        topic = message.get("topic")
+        reply = {"id": message.get("id"), "event": event, "ts": _now_ms()}
+        if not topic:
+            reply.update(success=False, errorMsg="topic is required")
+        elif (session.private or topic.split("@")[0] in PRIVATE_TOPICS) and (
+            session.orderly_key is None
+        ):
+            reply.update(success=False, errorMsg="auth required")
+        else:
+            if event == "subscribe":
+                session.topics.add(topic)
+            else:
+                session.topics.discard(topic)
+            reply.update(success=True, data=topic)
+        session.send(reply)
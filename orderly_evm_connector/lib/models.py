@@ -0,0 +1,310 @@
+from array import array
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+class Record(object):
+    """Base of the `__slots__` records decoded from response rows.
+
+    Fields are read as attributes, `record.symbol`, or by key,
+    `record["symbol"]`, so code written for the dict rows keeps working.
+    Keys that are not declared in `_fields` are kept in a dict created only
+    when such keys exist.
+    """
+
+    __slots__ = ("_extra",)
+    _fields = ()
+    _field_set = frozenset()
+
+    @classmethod
+    def from_row(cls, row):
+        record = cls.__new__(cls)
+        for name in cls._fields:
+            setattr(record, name, row.get(name))
+        extra = {key: value for key, value in row.items() if key not in cls._field_set}
+        record._extra = extra or None
+        return record
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self._field_set or (self._extra is not None and key in self._extra)
+
+    def to_dict(self):
+        row = {name: getattr(self, name) for name in self._fields}
+        if self._extra:
+            row.update(self._extra)
+        return row
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join("{}={!r}".format(name, getattr(self, name)) for name in self._fields),
+        )
+
+
+def _record_class(name, fields, doc):
+    return type(
+        name,
+        (Record,),
+        {
+            "__slots__": fields,
+            "__doc__": doc,
+            "_fields": fields,
+            "_field_set": frozenset(fields),
+        },
+    )
+
+
+Order = _record_class(
+    "Order",
+    (
+        "order_id",
+        "user_id",
+        "symbol",
+        "side",
+        "type",
+        "status",
+        "price",
+        "quantity",
+        "amount",
+        "visible",
+        "executed",
+        "total_fee",
+        "fee_asset",
+        "client_order_id",
+        "average_executed_price",
+        "realized_pnl",
+        "reduce_only",
+        "created_time",
+        "updated_time",
+    ),
+    "A row of `get_orders`",
+)
+Trade = _record_class(
+    "Trade",
+    (
+        "id",
+        "symbol",
+        "side",
+        "order_id",
+        "executed_price",
+        "executed_quantity",
+        "executed_timestamp",
+        "fee",
+        "fee_asset",
+        "is_maker",
+        "realized_pnl",
+    ),
+    "A row of `get_trades` and `get_all_trades_of_order`",
+)
+Position = _record_class(
+    "Position",
+    (
+        "symbol",
+        "position_qty",
+        "cost_position",
+        "last_sum_unitary_funding",
+        "pending_long_qty",
+        "pending_short_qty",
+        "settle_price",
+        "average_open_price",
+        "unsettled_pnl",
+        "mark_price",
+        "est_liq_price",
+        "mmr",
+        "imr",
+        "IMR_withdraw_orders",
+        "MMR_with_orders",
+        "pnl_24_h",
+        "fee_24_h",
+        "timestamp",
+    ),
+    "A row of `get_all_positions_info`",
+)
+FundingFee = _record_class(
+    "FundingFee",
+    (
+        "id",
+        "symbol",
+        "funding_rate",
+        "mark_price",
+        "funding_fee",
+        "payment_type",
+        "status",
+        "created_time",
+        "updated_time",
+    ),
+    "A row of `get_funding_fee_history`",
+)
+AssetHistory = _record_class(
+    "AssetHistory",
+    (
+        "id",
+        "tx_id",
+        "side",
+        "token",
+        "amount",
+        "fee",
+        "trans_status",
+        "chain_id",
+        "created_time",
+        "updated_time",
+    ),
+    "A row of `get_asset_history`",
+)
+MarketTrade = _record_class(
+    "MarketTrade",
+    ("symbol", "side", "executed_price", "executed_quantity", "executed_timestamp"),
+    "A row of `get_market_trades`",
+)
+
+# Endpoint (see `metrics.endpoint_name`) to the record of its `data.rows`.
+ROW_MODELS = {
+    "GET /v1/orders": Order,
+    "GET /v1/trades": Trade,
+    "GET /v1/order/:id/trades": Trade,
+    "GET /v1/positions": Position,
+    "GET /v1/funding_fee/history": FundingFee,
+    "GET /v1/asset/history": AssetHistory,
+    "GET /v1/public/market_trades": MarketTrade,
+}
+
+
+def _pack(values):
+    """An `array` of `values` when they are all ints or all floats, else the list"""
+    kind = type(values[0]) if values else None
+    if kind is float and all(type(value) is float for value in values):
+        return array("d", values)
+    if kind is int and all(
+        type(value) is int and _INT64_MIN <= value <= _INT64_MAX for value in values
+    ):
+        return array("q", values)
+    return values
+
+
+class TableRow(object):
+    """View of one row of a `RowTable`, values are read from its columns on access"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, key):
+        return self._table._columns[key][self._index]
+
+    def get(self, key, default=None):
+        column = self._table._columns.get(key)
+        return default if column is None else column[self._index]
+
+    def __contains__(self, key):
+        return key in self._table._columns
+
+    def to_dict(self):
+        return {name: column[self._index] for name, column in self._table._columns.items()}
+
+    def __eq__(self, other):
+        if isinstance(other, TableRow):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "TableRow({!r})".format(self.to_dict())
+
+
+class RowTable(object):
+    """Rows stored as columns (struct of arrays).
+
+    Each field is one list, or one `array` when its values are all ints or
+    all floats, instead of one dict per row. `table[i]` and iteration return
+    `TableRow` views created on access; `table.column(name)` returns a whole
+    column. A field missing from a row reads as None.
+    """
+
+    __slots__ = ("fields", "_columns", "_length")
+
+    def __init__(self, rows):
+        rows = list(rows)
+        fields = {}
+        for row in rows:
+            for key in row:
+                fields.setdefault(key)
+        self.fields = tuple(fields)
+        self._columns = {
+            name: _pack([row.get(name) for row in rows]) for name in self.fields
+        }
+        self._length = len(rows)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TableRow(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return TableRow(self, index)
+
+    def __iter__(self):
+        return (TableRow(self, i) for i in range(self._length))
+
+    def column(self, name):
+        return self._columns[name]
+
+    def to_dicts(self):
+        return [row.to_dict() for row in self]
+
+    def __repr__(self):
+        return "RowTable({} rows, fields={})".format(self._length, list(self.fields))
+
+
+def compact_rows(response, compact="records", endpoint=None):
+    """Replace the `data.rows` dicts of a decoded response in place.
+
+    With "records" the rows become the record class of `endpoint` in
+    `ROW_MODELS` (other endpoints are left as they are), with "table" a
+    `RowTable`. Returns the response.
+    """
+    if not isinstance(response, dict):
+        return response
+    data = response.get("data")
+    if not isinstance(data, dict) or not isinstance(data.get("rows"), list):
+        return response
+    if compact == "table":
+        data["rows"] = RowTable(data["rows"])
+    elif compact == "records":
+        model = ROW_MODELS.get(endpoint)
+        if model is not None:
+            data["rows"] = [model.from_row(row) for row in data["rows"]]
+    return response
@@ -0,0 +1,76 @@
+import json
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import parse_qsl, quote
+
+_QUERY_METHODS = frozenset(("GET", "DELETE"))
+# Commas separate the ids of list parameters such as order_ids
+_SAFE_QUERY_CHARS = ","
+_SAFE_PATH_CHARS = "/:@,"
+
+PreparedRequest = namedtuple(
+    "PreparedRequest", ["method", "path", "body", "signing_string"]
+)
+PreparedRequest.__doc__ = """A request ready to sign and send.
+
+`path` carries the canonical query string, `body` is the encoded payload
+(empty for GET and DELETE) and `signing_string` is the
+`{method}{path}{body}` message signed with the orderly secret.
+"""
+
+
+def _query_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple)):
+        return ",".join(_query_value(v) for v in value)
+    return str(value)
+
+
+def encode_query(params: dict) -> str:
+    """Canonical query string: None values dropped, keys sorted, values URL-encoded"""
+    return "&".join(
+        f"{quote(str(key), safe='')}={quote(_query_value(value), safe=_SAFE_QUERY_CHARS)}"
+        for key, value in sorted(params.items())
+        if value is not None
+    )
+
+
+@lru_cache(maxsize=1024)
+def _split_path(url_path):
+    """Quoted path and the parameters embedded in its query string"""
+    path, _, query = url_path.partition("?")
+    return quote(path, safe=_SAFE_PATH_CHARS), tuple(parse_qsl(query))
+
+
+def encode_body(payload, encoder=json.dumps):
+    """Encode `payload` to `(bytes, text)` with `encoder`, which may return str or bytes"""
+    if not payload:
+        return b"", ""
+    body = encoder(payload)
+    if isinstance(body, str):
+        return body.encode("utf-8"), body
+    return body, body.decode("utf-8")
+
+
+def build_request(http_method, url_path, payload=None, encoder=json.dumps):
+    """Build the canonical path, body and signing string of a request in one pass.
+
+    GET and DELETE parameters, including any query string embedded in
+    `url_path`, go to the query string; other methods send them as a JSON
+    body encoded once with `encoder`. None values are dropped.
+    """
+    path, embedded = _split_path(url_path)
+    params = dict(embedded)
+    if http_method in _QUERY_METHODS:
+        if payload:
+            params.update(payload)
+        body, text = b"", ""
+    else:
+        if payload:
+            payload = {k: v for k, v in payload.items() if v is not None}
+        body, text = encode_body(payload, encoder)
+    query = encode_query(params) if params else ""
+    if query:
+        path = f"{path}?{query}"
+    return PreparedRequest(http_method, path, body, f"{http_method}{path}{text}")
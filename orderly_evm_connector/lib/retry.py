@@ -0,0 +1,112 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from orderly_evm_connector.error import ClientError, ServerError
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+RETRYABLE_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+_TRANSIENT_ERRORS = (
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    TimeoutError,
+    ConnectionError,
+)
+if httpx is not None:
+    _TRANSIENT_ERRORS += (httpx.TimeoutException, httpx.NetworkError)
+
+# Order endpoints where a client_order_id makes a resent order a duplicate
+# the server rejects, instead of a second order.
+_CLIENT_ORDER_ID_PATHS = frozenset(("/v1/order", "/v1/algo/order"))
+
+
+def is_transient_error(error, statuses=RETRYABLE_STATUS_CODES):
+    """True for timeouts, connection errors and error responses with a status in `statuses`"""
+    if isinstance(error, (ClientError, ServerError)):
+        return error.status_code in statuses
+    return isinstance(error, _TRANSIENT_ERRORS)
+
+
+def retry_after(headers):
+    """Seconds requested by a Retry-After header, None when absent or invalid"""
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy(object):
+    """Decides whether and when a failed REST call is sent again.
+
+    Timeouts, connection errors and responses with a status in
+    `retry_statuses` (429 and 5xx by default) are retried up to
+    `max_retries` times, only for idempotent requests: GETs, and orders
+    carrying a `client_order_id`. The delay grows exponentially from
+    `backoff` up to `max_backoff` with full jitter. A Retry-After header is
+    honored as a lower bound; when it asks for more than `max_retry_after`
+    seconds the error is raised instead.
+
+    Override `is_idempotent` to change which requests are retried.
+    """
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff=0.1,
+        max_backoff=5.0,
+        max_retry_after=30.0,
+        retry_statuses=RETRYABLE_STATUS_CODES,
+        retry_orders=True,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_orders = retry_orders
+
+    def is_idempotent(self, http_method, url_path, payload=None):
+        if http_method == "GET":
+            return True
+        if not self.retry_orders or http_method != "POST" or not payload:
+            return False
+        if url_path in _CLIENT_ORDER_ID_PATHS:
+            return bool(payload.get("client_order_id"))
+        if url_path == "/v1/batch-order":
+            orders = payload.get("orders") or []
+            return bool(orders) and all(order.get("client_order_id") for order in orders)
+        return False
+
+    def is_retryable(self, error):
+        return is_transient_error(error, self.retry_statuses)
+
+    def backoff_delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def retry_delay(self, attempt, error, idempotent=True):
+        """Seconds to wait before retry number `attempt + 1`, None to give up"""
+        if not idempotent or attempt >= self.max_retries or not self.is_retryable(error):
+            return None
+        delay = self.backoff_delay(attempt)
+        requested = retry_after(getattr(error, "header", None))
+        if requested is not None:
+            if requested > self.max_retry_after:
+                return None
+            delay = max(delay, requested)
+        return delay
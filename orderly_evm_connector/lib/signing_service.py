@@ -0,0 +1,154 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from orderly_evm_connector.lib.utils import (
+    generate_signature,
+    generate_wallet_signature,
+    load_orderly_private_key,
+    load_wallet_account,
+)
+
+
+# Decoded keys of a worker process, they go away with the pool
+_worker_keys = {}
+
+
+def _private_key(orderly_secret):
+    private_key = _worker_keys.get(orderly_secret)
+    if private_key is None:
+        private_key = _worker_keys[orderly_secret] = load_orderly_private_key(
+            orderly_secret
+        )
+    return private_key
+
+
+def _wallet_account(wallet_secret):
+    # Keyed apart from the orderly secrets, which are never bare hex
+    key = ("wallet", wallet_secret)
+    account = _worker_keys.get(key)
+    if account is None:
+        account = _worker_keys[key] = load_wallet_account(wallet_secret)
+    return account
+
+
+def _load_keys(orderly_secrets, wallet_secrets):
+    # Runs once in every worker process
+    for orderly_secret in orderly_secrets:
+        _private_key(orderly_secret)
+    for wallet_secret in wallet_secrets:
+        _wallet_account(wallet_secret)
+
+
+def _sign(orderly_secret, message=None):
+    return generate_signature(orderly_secret, message, _private_key(orderly_secret))
+
+
+def _sign_wallet(wallet_secret, message):
+    return generate_wallet_signature(
+        wallet_secret, message, _wallet_account(wallet_secret)
+    )
+
+
+def _sign_batch(items):
+    return [_sign(orderly_secret, message) for orderly_secret, message in items]
+
+
+def _start_context():
+    # Clients start threads early (pingers, dispatchers, websocket readers),
+    # and forking a process with threads can deadlock the child
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _gather(futures):
+    """One future resolving to the concatenated results of `futures`, in order"""
+    gathered = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] or gathered.done():
+                return
+        try:
+            gathered.set_result([row for future in futures for row in future.result()])
+        except Exception as e:
+            gathered.set_exception(e)
+
+    if not futures:
+        gathered.set_result([])
+    for future in futures:
+        future.add_done_callback(done)
+    return gathered
+
+
+class SigningService(object):
+    """Signs requests in a pool of worker processes.
+
+    ed25519 and EIP-712 signing hold the GIL, so a process trading many
+    accounts from many threads signs on one core. Here signatures are made
+    in `max_workers` processes instead, while the calling threads wait with
+    the GIL released. Keys are decoded once per worker: `orderly_secrets`
+    and `wallet_secrets` when the worker starts, other secrets on first use.
+
+    `sign` and `sign_wallet` return a `concurrent.futures.Future`, the
+    `*_async` variants are awaitable. `sign_batch` spreads a list of
+    `(orderly_secret, message)` pairs over the workers with one round trip
+    per worker. A round trip costs tens of microseconds, so the pool pays
+    off for EIP-712 signatures, batches, and many threads signing at once,
+    not for a single thread sending one order at a time.
+
+    Pass the service as `signing_service` to `Rest` or `AccountPool` to sign
+    every request through it, and `close` it when done.
+    """
+
+    def __init__(self, max_workers=None, orderly_secrets=(), wallet_secrets=()):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=_start_context(),
+            initializer=_load_keys,
+            initargs=(tuple(orderly_secrets), tuple(wallet_secrets)),
+        )
+
+    def sign(self, orderly_secret, message=None):
+        """Future of `(timestamp, signature)`, as returned by `generate_signature`"""
+        return self._executor.submit(_sign, orderly_secret, message)
+
+    def sign_wallet(self, wallet_secret, message):
+        """Future of the EIP-712 signature returned by `generate_wallet_signature`"""
+        return self._executor.submit(_sign_wallet, wallet_secret, message)
+
+    def sign_batch(self, items):
+        """Future of the `(timestamp, signature)` list for `(orderly_secret, message)` pairs"""
+        items = list(items)
+        size = max(1, -(-len(items) // self.max_workers))
+        return _gather(
+            [
+                self._executor.submit(_sign_batch, items[i : i + size])
+                for i in range(0, len(items), size)
+            ]
+        )
+
+    async def sign_async(self, orderly_secret, message=None):
+        return await asyncio.wrap_future(self.sign(orderly_secret, message))
+
+    async def sign_wallet_async(self, wallet_secret, message):
+        return await asyncio.wrap_future(self.sign_wallet(wallet_secret, message))
+
+    async def sign_batch_async(self, items):
+        return await asyncio.wrap_future(self.sign_batch(items))
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,253 @@
+from decimal import Decimal
+
+from orderly_evm_connector.error import OrderFilterError
+
+FILTER_MODE_REJECT = "reject"
+FILTER_MODE_ROUND = "round"
+
+# Orders without a limit price are matched against the book, so only the size
+# filters can be checked locally for them.
+_PRICELESS_ORDER_TYPES = frozenset(("MARKET", "ASK", "BID"))
+
+
+def _decimals(tick):
+    exponent = Decimal(str(tick)).normalize().as_tuple().exponent
+    return -exponent if exponent < 0 else 0
+
+
+class SymbolFilter(object):
+    """Order rules of one symbol, as returned by `/v1/public/info`.
+
+    The tick sizes are converted into decimal places once, so applying the
+    filter to an order is a handful of float operations, plus a decimal
+    remainder for each tick alignment check.
+    """
+
+    __slots__ = (
+        "symbol",
+        "quote_min",
+        "quote_max",
+        "quote_tick",
+        "base_min",
+        "base_max",
+        "base_tick",
+        "min_notional",
+        "price_range",
+        "price_decimals",
+        "quantity_decimals",
+    )
+
+    def __init__(
+        self,
+        symbol,
+        quote_min=0,
+        quote_max=None,
+        quote_tick=None,
+        base_min=0,
+        base_max=None,
+        base_tick=None,
+        min_notional=None,
+        price_range=None,
+    ):
+        self.symbol = symbol
+        self.quote_min = float(quote_min or 0)
+        self.quote_max = float(quote_max) if quote_max else None
+        self.quote_tick = float(quote_tick) if quote_tick else None
+        self.base_min = float(base_min or 0)
+        self.base_max = float(base_max) if base_max else None
+        self.base_tick = float(base_tick) if base_tick else None
+        self.min_notional = float(min_notional) if min_notional else None
+        self.price_range = float(price_range) if price_range else None
+        self.price_decimals = _decimals(quote_tick) if quote_tick else None
+        self.quantity_decimals = _decimals(base_tick) if base_tick else None
+
+    @classmethod
+    def from_row(cls, row: dict):
+        return cls(
+            row["symbol"],
+            quote_min=row.get("quote_min"),
+            quote_max=row.get("quote_max"),
+            quote_tick=row.get("quote_tick"),
+            base_min=row.get("base_min"),
+            base_max=row.get("base_max"),
+            base_tick=row.get("base_tick"),
+            min_notional=row.get("min_notional"),
+            price_range=row.get("price_range"),
+        )
+
+    def _off_tick(self, value, start, tick):
+        # In decimal: float division drifts past any fixed tolerance once the
+        # value is a few million ticks from start
+        return (Decimal(str(value)) - Decimal(str(start))) % Decimal(str(tick)) != 0
+
+    def round_price(self, price):
+        if self.quote_tick is None:
+            return price
+        steps = round((price - self.quote_min) / self.quote_tick)
+        return round(self.quote_min + steps * self.quote_tick, self.price_decimals)
+
+    def round_quantity(self, quantity):
+        # Quantities are floored onto the base_min + n * base_tick grid the
+        # server accepts, so that rounding never increases the exposure the
+        # caller asked for; a quantity below base_min is left for
+        # check_quantity to reject rather than raised to it.
+        if self.base_tick is None or quantity < self.base_min:
+            return quantity
+        base_min = Decimal(str(self.base_min))
+        base_tick = Decimal(str(self.base_tick))
+        steps = (Decimal(str(quantity)) - base_min) // base_tick
+        return float(base_min + steps * base_tick)
+
+    def check_price(self, price, side=None, reference_price=None, round_values=False):
+        if round_values:
+            price = self.round_price(price)
+        elif self.quote_tick is not None and self._off_tick(
+            price, self.quote_min, self.quote_tick
+        ):
+            raise OrderFilterError(
+                self.symbol,
+                f"order_price {price} is not a multiple of quote_tick {self.quote_tick}",
+            )
+        if price < self.quote_min:
+            raise OrderFilterError(
+                self.symbol, f"order_price {price} is below quote_min {self.quote_min}"
+            )
+        if self.quote_max is not None and price > self.quote_max:
+            raise OrderFilterError(
+                self.symbol, f"order_price {price} is above quote_max {self.quote_max}"
+            )
+        if reference_price and self.price_range is not None:
+            if side == "BUY" and price > reference_price * (1 + self.price_range):
+                raise OrderFilterError(
+                    self.symbol,
+                    f"BUY order_price {price} is above the allowed range of {reference_price}",
+                )
+            if side == "SELL" and price < reference_price * (1 - self.price_range):
+                raise OrderFilterError(
+                    self.symbol,
+                    f"SELL order_price {price} is below the allowed range of {reference_price}",
+                )
+        return price
+
+    def check_quantity(self, quantity, round_values=False):
+        if round_values:
+            quantity = self.round_quantity(quantity)
+        elif self.base_tick is not None and self._off_tick(
+            quantity, self.base_min, self.base_tick
+        ):
+            raise OrderFilterError(
+                self.symbol,
+                f"order_quantity {quantity} is not a multiple of base_tick {self.base_tick}",
+            )
+        if quantity < self.base_min:
+            raise OrderFilterError(
+                self.symbol,
+                f"order_quantity {quantity} is below base_min {self.base_min}",
+            )
+        if self.base_max is not None and quantity > self.base_max:
+            raise OrderFilterError(
+                self.symbol,
+                f"order_quantity {quantity} is above base_max {self.base_max}",
+            )
+        return quantity
+
+    def check_notional(self, price, quantity):
+        if self.min_notional is not None and price * quantity < self.min_notional:
+            raise OrderFilterError(
+                self.symbol,
+                f"order notional {price * quantity} is below min_notional {self.min_notional}",
+            )
+
+
+class SymbolFilters(object):
+    """Precomputed table of order rules keyed by symbol.
+
+    Build it from the response of `get_available_symbols` (all symbols) or
+    `get_exchange_info` (one symbol). In `reject` mode an order that breaks a
+    rule raises `OrderFilterError`; in `round` mode price and quantity are
+    snapped to their ticks first and only range violations raise.
+
+    The price range rule is relative to the best opposite price, which the
+    REST client does not track. Feed it with `set_reference_price`, e.g. from
+    the `bbo` websocket stream, to enable that check.
+    """
+
+    def __init__(self, filters=None, mode=FILTER_MODE_REJECT):
+        if mode not in (FILTER_MODE_REJECT, FILTER_MODE_ROUND):
+            raise ValueError(f"unknown symbol filter mode: {mode}")
+        self.mode = mode
+        self._filters = {}
+        self._reference_prices = {}
+        for symbol_filter in filters or []:
+            self._filters[symbol_filter.symbol] = symbol_filter
+
+    @classmethod
+    def from_response(cls, response: dict, mode=FILTER_MODE_REJECT):
+        data = response.get("data", response)
+        rows = data["rows"] if "rows" in data else [data]
+        return cls([SymbolFilter.from_row(row) for row in rows], mode=mode)
+
+    def update(self, response: dict):
+        self._filters.update(SymbolFilters.from_response(response)._filters)
+
+    def set_reference_price(self, symbol, price):
+        self._reference_prices[symbol] = price
+
+    def get(self, symbol):
+        return self._filters.get(symbol)
+
+    def __contains__(self, symbol):
+        return symbol in self._filters
+
+    def __len__(self):
+        return len(self._filters)
+
+    def check_order(
+        self, symbol, order_type, side, order_price=None, order_quantity=None
+    ):
+        """Apply the rules of `symbol` to an order.
+
+        Returns the `(order_price, order_quantity)` to send. In `reject` mode
+        they are the input values, unchanged and of the same type; in `round`
+        mode they are the snapped floats. Symbols without loaded rules pass
+        through unchanged.
+        """
+        symbol_filter = self._filters.get(symbol)
+        if symbol_filter is None:
+            return order_price, order_quantity
+        round_values = self.mode == FILTER_MODE_ROUND
+        reference_price = self._reference_prices.get(symbol)
+        price, quantity = order_price, order_quantity
+        if order_price is not None and order_type not in _PRICELESS_ORDER_TYPES:
+            price = symbol_filter.check_price(
+                float(order_price), side, reference_price, round_values
+            )
+        if order_quantity is not None:
+            quantity = symbol_filter.check_quantity(float(order_quantity), round_values)
+        notional_price = (
+            reference_price if order_type in _PRICELESS_ORDER_TYPES else price
+        )
+        if notional_price and quantity is not None:
+            symbol_filter.check_notional(float(notional_price), quantity)
+        if round_values:
+            return price, quantity
+        return order_price, order_quantity
+
+    def check_order_dict(self, order: dict):
+        order_price, order_quantity = self.check_order(
+            order.get("symbol"),
+            order.get("order_type"),
+            order.get("side"),
+            order.get("order_price"),
+            order.get("order_quantity"),
+        )
+        checked = {
+            key: value
+            for key, value in (
+                ("order_price", order_price),
+                ("order_quantity", order_quantity),
+            )
+            # Keys the caller left out stay out, rather than being sent as null
+            if key in order and value != order[key]
+        }
+        return dict(order, **checked) if checked else order
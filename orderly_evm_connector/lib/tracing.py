@@ -0,0 +1,71 @@
+import logging
+import re
+
+DEFAULT_MAX_PAYLOAD = 1024
+REDACTED = "***"
+
+SECRET_FIELDS = frozenset(
+    ("orderly-signature", "sign", "signature", "orderly_secret", "wallet_secret")
+)
+
+_SECRET_JSON_FIELD = re.compile(
+    r'("(?:%s)"\s*:\s*")[^"]*(")' % "|".join(re.escape(f) for f in SECRET_FIELDS)
+)
+
+
+class Tracer(object):
+    """Level-gated debug tracing for the request and frame hot paths.
+
+    `trace(event, **fields)` returns immediately unless DEBUG is enabled on
+    the logger, and all formatting happens after that check. Callers pass raw
+    values (dicts, bytes, strings) and never build strings themselves.
+    Payloads longer than `max_payload` are cut to a head sample, and secret
+    fields such as signatures are redacted.
+    """
+
+    __slots__ = ("logger", "max_payload")
+
+    def __init__(self, logger, max_payload=DEFAULT_MAX_PAYLOAD):
+        self.logger = logger
+        self.max_payload = max_payload
+
+    @property
+    def enabled(self):
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def trace(self, event, **fields):
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug(
+            "%s %s",
+            event,
+            " ".join(f"{name}={self._format(value)}" for name, value in fields.items()),
+        )
+
+    def _format(self, value):
+        if isinstance(value, dict):
+            value = str(_redact(value))
+        elif isinstance(value, (bytes, bytearray)):
+            # Redacted before truncation, a secret cut in half would not match
+            size = len(value)
+            text = bytes(value).decode("utf-8", errors="replace")
+            text = _SECRET_JSON_FIELD.sub(rf"\1{REDACTED}\2", text)
+            return self._sample(text[: self.max_payload], size)
+        elif isinstance(value, str):
+            value = _SECRET_JSON_FIELD.sub(rf"\1{REDACTED}\2", value)
+        else:
+            return str(value)
+        return self._sample(value[: self.max_payload], len(value))
+
+    def _sample(self, text, size):
+        if size > self.max_payload:
+            return f"{text}...({size} bytes)"
+        return text
+
+
+def _redact(value):
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if k in SECRET_FIELDS else _redact(v) for k, v in value.items()
+        }
+    return value
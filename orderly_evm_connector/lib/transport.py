@@ -0,0 +1,332 @@
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from orderly_evm_connector.lib.utils import orderlyLog
+from orderly_evm_connector.lib.constants import (
+    REST_KEEPALIVE_INTERVAL_IN_SECONDS,
+    REST_KEEPALIVE_TIMEOUT_IN_SECONDS,
+    REST_PREWARM_TIMEOUT_IN_SECONDS,
+)
+
+DEFAULT_POOL_SIZE = 10
+
+
+class Transport(object):
+    """HTTP layer used by `API` to send requests.
+
+    A transport returns a response object exposing `status_code`, `headers`,
+    `text`, `content` and `json()`, which both `requests` and `httpx`
+    responses do. `headers` holds the default headers sent with every
+    request; per-request headers passed to `request` take precedence.
+    """
+
+    headers = None
+
+    def request(
+        self, method, url, headers=None, json=None, data=None, timeout=None, proxies=None
+    ):
+        raise NotImplementedError
+
+    def stream(
+        self, method, url, headers=None, json=None, data=None, timeout=None, proxies=None
+    ):
+        """Like `request`, but the body is read as `iter_chunks(response)` consumes it.
+
+        The caller closes the response. By default the body is read at once.
+        """
+        return self.request(
+            method,
+            url,
+            headers=headers,
+            json=json,
+            data=data,
+            timeout=timeout,
+            proxies=proxies,
+        )
+
+    def prewarm(
+        self, url, connections=1, timeout=REST_PREWARM_TIMEOUT_IN_SECONDS, proxies=None
+    ):
+        """Open `connections` pooled connections by sending concurrent GETs to `url`"""
+        logger = orderlyLog()
+
+        def _touch(_):
+            try:
+                self.request("GET", url, timeout=timeout, proxies=proxies)
+            except Exception as e:
+                logger.warning(f"Failed to prewarm connection to {url}: {e}")
+
+        if connections <= 1:
+            return _touch(None)
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(_touch, range(connections)))
+
+    def close(self):
+        pass
+
+
+class KeepAlivePinger(threading.Thread):
+    """Daemon thread that keeps pooled connections hot.
+
+    Every `interval` seconds it sends `connections` concurrent cheap GETs to
+    `url` through `transport`, so that idle connections are not dropped by
+    the server or by intermediate load balancers. Each ping gives up after
+    `timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        transport,
+        url,
+        connections=1,
+        interval=REST_KEEPALIVE_INTERVAL_IN_SECONDS,
+        timeout=REST_KEEPALIVE_TIMEOUT_IN_SECONDS,
+        proxies=None,
+    ):
+        threading.Thread.__init__(self, daemon=True)
+        self.transport = transport
+        self.url = url
+        self.connections = connections
+        self.interval = interval
+        self.timeout = timeout
+        self.proxies = proxies
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.transport.prewarm(
+                self.url, self.connections, timeout=self.timeout, proxies=self.proxies
+            )
+
+    def stop(self):
+        self._stopped.set()
+
+
+class _SocketOptionsAdapter(HTTPAdapter):
+    def __init__(self, socket_options=None, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _socket_options(tcp_nodelay, tcp_keepalive):
+    options = []
+    if tcp_nodelay:
+        options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+    if tcp_keepalive:
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30))
+    return options
+
+
+class RequestsTransport(Transport):
+    """Transport backed by a `requests.Session` (HTTP/1.1).
+
+    Args:
+        session: an existing session to tune, a new one is created by default
+        pool_connections: number of host pools to cache
+        pool_maxsize: connections kept alive per host, should be at least the number of threads sending requests
+        keep_alive: set False to close the connection after every request
+        tcp_nodelay: disable Nagle's algorithm on new sockets
+        tcp_keepalive: enable TCP keep-alive probes on idle sockets
+    """
+
+    def __init__(
+        self,
+        session=None,
+        pool_connections=DEFAULT_POOL_SIZE,
+        pool_maxsize=DEFAULT_POOL_SIZE,
+        keep_alive=True,
+        tcp_nodelay=True,
+        tcp_keepalive=False,
+    ):
+        self.session = session if session is not None else requests.Session()
+        adapter = _SocketOptionsAdapter(
+            socket_options=_socket_options(tcp_nodelay, tcp_keepalive),
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        self.headers = self.session.headers
+
+    def request(
+        self, method, url, headers=None, json=None, data=None, timeout=None, proxies=None
+    ):
+        return self.session.request(
+            method,
+            url,
+            headers=headers,
+            json=json,
+            data=data,
+            timeout=timeout,
+            proxies=proxies,
+        )
+
+    def stream(
+        self, method, url, headers=None, json=None, data=None, timeout=None, proxies=None
+    ):
+        return self.session.request(
+            method,
+            url,
+            headers=headers,
+            json=json,
+            data=data,
+            timeout=timeout,
+            proxies=proxies,
+            stream=True,
+        )
+
+    def close(self):
+        self.session.close()
+
+
+def _httpx_proxy_options(proxies, http2, limits):
+    """`httpx.Client` keyword arguments routing requests through `proxies`"""
+    if not proxies:
+        return {}
+    if isinstance(proxies, str):
+        return {"proxy": proxies}
+    return {
+        "mounts": {
+            (scheme if "://" in scheme else scheme + "://"): httpx.HTTPTransport(
+                proxy=proxy, http2=http2, limits=limits
+            )
+            for scheme, proxy in proxies.items()
+        }
+    }
+
+
+class HttpxTransport(Transport):
+    """Transport backed by an `httpx.Client`, with HTTP/2 enabled by default.
+
+    Over HTTP/2 concurrent requests from many threads are multiplexed on a
+    single TLS connection. Requires `pip install httpx[http2]`.
+
+    Args:
+        http2: negotiate HTTP/2 when the server supports it
+        max_connections: upper bound of open connections
+        max_keepalive_connections: idle connections kept in the pool
+        keepalive_expiry: seconds an idle connection is kept
+        proxies: proxy url, or a `requests` style mapping such as
+            {"https": url}, fixed for the lifetime of the client
+    """
+
+    def __init__(
+        self,
+        http2=True,
+        max_connections=DEFAULT_POOL_SIZE,
+        max_keepalive_connections=DEFAULT_POOL_SIZE,
+        keepalive_expiry=60.0,
+        proxies=None,
+    ):
+        if httpx is None:
+            raise ImportError("HttpxTransport requires httpx, run: pip install httpx[http2]")
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.session = httpx.Client(
+            http2=http2, limits=limits, **_httpx_proxy_options(proxies, http2, limits)
+        )
+        self.headers = self.session.headers
+
+    def request(
+        self, method, url, headers=None, json=None, data=None, timeout=None, proxies=None
+    ):
+        # httpx binds proxies to the client, they are set in the constructor.
+        kwargs = {"headers": headers, "json": json, "content": data}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return self.session.request(method, url, **kwargs)
+
+    def stream(
+        self, method, url, headers=None, json=None, data=None, timeout=None, proxies=None
+    ):
+        kwargs = {"headers": headers, "json": json, "content": data}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        request = self.session.build_request(method, url, **kwargs)
+        return self.session.send(request, stream=True)
+
+    def close(self):
+        self.session.close()
+
+
+class MockResponse(object):
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        if isinstance(body, (bytes, str)):
+            self.content = body if isinstance(body, bytes) else body.encode("utf-8")
+        else:
+            self.content = json.dumps(body).encode("utf-8")
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def close(self):
+        pass
+
+
+def iter_chunks(response, chunk_size=65536):
+    """Body of a `requests`, `httpx` or mock response, chunk by chunk"""
+    if hasattr(response, "iter_content"):
+        return response.iter_content(chunk_size)
+    if hasattr(response, "iter_bytes"):
+        return response.iter_bytes(chunk_size)
+    return iter((response.content,))
+
+
+class MockTransport(Transport):
+    """In-process transport for tests, no socket is opened.
+
+    `handler(method, url, headers, body)` returns either a response object or
+    a `(status_code, body, headers)` tuple. Every request is recorded in
+    `self.requests`.
+    """
+
+    def __init__(self, handler=None):
+        self.handler = handler
+        self.headers = {}
+        self.requests = []
+
+    def request(
+        self, method, url, headers=None, json=None, data=None, timeout=None, proxies=None
+    ):
+        _headers = dict(self.headers)
+        _headers.update(headers or {})
+        body = json if json is not None else data
+        self.requests.append((method, url, _headers, body))
+        if self.handler is None:
+            return MockResponse(200, {"success": True})
+        result = self.handler(method, url, _headers, body)
+        if isinstance(result, tuple):
+            return MockResponse(*result)
+        return result
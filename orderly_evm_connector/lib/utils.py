@@ -1,6 +1,7 @@
 import json
 import time
 import uuid
+from functools import lru_cache
 
 from urllib.parse import urlparse
 from collections import OrderedDict
@@ -14,6 +15,7 @@ from orderly_evm_connector.error import (
     ParameterRequiredError,
     ParameterValueError,
     ParameterTypeError,
+    ParameterValidationError,
 )
 
 
@@ -56,11 +58,71 @@ def check_required_parameters(params):
         check_required_parameter(p[0], p[1])
 
 
+@lru_cache(maxsize=None)
+def enum_values(enum_class) -> frozenset:
+    return frozenset(item.value for item in enum_class)
+
+
 def check_enum_parameter(value, enum_class):
-    if value not in set(item.value for item in enum_class):
+    if value not in enum_values(enum_class):
         raise ParameterValueError([value])
 
 
+class ParameterSchema(object):
+    """Required and enum parameters of an endpoint, compiled once at import.
+
+    schema = ParameterSchema(
+        required=("symbol", "order_type", "side"),
+        enums={"order_type": OrderType},
+    )
+    schema.validate({"symbol": "PERP_BTC_USDC", ...})
+
+    Enum parameters are only checked when a value is given, so optional
+    filters can be declared the same way as required ones.
+    """
+
+    __slots__ = ("required", "enums")
+
+    def __init__(self, required=(), enums=None):
+        self.required = tuple(required)
+        self.enums = tuple(
+            (name, enum_values(enum_class)) for name, enum_class in (enums or {}).items()
+        )
+
+    def _collect(self, params: dict, missing: list, invalid: list, prefix=""):
+        for name in self.required:
+            value = params.get(name)
+            if not value and value != 0:
+                missing.append(prefix + name)
+        for name, values in self.enums:
+            value = params.get(name)
+            if value and value not in values:
+                invalid.append(value)
+
+    @staticmethod
+    def _raise(missing: list, invalid: list):
+        if missing and invalid:
+            raise ParameterValidationError(
+                [ParameterRequiredError(missing), ParameterValueError(invalid)]
+            )
+        if missing:
+            raise ParameterRequiredError(missing)
+        if invalid:
+            raise ParameterValueError(invalid)
+
+    def validate(self, params: dict):
+        missing, invalid = [], []
+        self._collect(params, missing, invalid)
+        self._raise(missing, invalid)
+
+    def validate_batch(self, items: list, name="orders"):
+        """Validate every element in one pass and report all errors together"""
+        missing, invalid = [], []
+        for index, params in enumerate(items):
+            self._collect(params, missing, invalid, f"{name}[{index}].")
+        self._raise(missing, invalid)
+
+
 def check_type_parameter(value, name, data_type):
     if value is not None and not isinstance(value, data_type):
         raise ParameterTypeError([name, data_type])
@@ -102,13 +164,19 @@ def parse_proxies(proxies: dict):
     }
 
 
-def generate_signature(orderly_secret, message=None):
-    if not orderly_secret:
-        raise "Please configure orderly secret in the configuration file config.ini"
+def load_orderly_private_key(orderly_secret):
+    """Ed25519 key of an `ed25519:<base58>` secret"""
     _orderly_secret = orderly_secret.split(":")[1]
-    _orderly_private_key = Ed25519PrivateKey.from_private_bytes(
+    return Ed25519PrivateKey.from_private_bytes(
         base58.b58decode(_orderly_secret)[0:32]
     )
+
+
+def generate_signature(orderly_secret, message=None, private_key=None):
+    """Sign with `orderly_secret`, or with its already decoded `private_key`"""
+    if private_key is None and not orderly_secret:
+        raise "Please configure orderly secret in the configuration file config.ini"
+    _orderly_private_key = private_key or load_orderly_private_key(orderly_secret)
     _timestamp = get_timestamp()
     if message and isinstance(message, dict):
         message["timestamp"] = _timestamp
@@ -120,14 +188,17 @@ def generate_signature(orderly_secret, message=None):
     return str(_timestamp), _signature
 
 
-def generate_wallet_signature(wallet_secret, message=None):
-    private_key = f"0x{wallet_secret}"
+def load_wallet_account(wallet_secret):
+    """eth_account account of a hex wallet secret"""
+    return Web3().eth.account.from_key(f"0x{wallet_secret}")
+
+
+def generate_wallet_signature(wallet_secret, message=None, account=None):
+    """Sign with `wallet_secret`, or with its already decoded `account`"""
     _message = message
     encoded_message = encode_structured_data(_message)
-    w3 = Web3()
-    signed_message = w3.eth.account.sign_message(
-        encoded_message, private_key=private_key
-    )
+    _account = account or load_wallet_account(wallet_secret)
+    signed_message = _account.sign_message(encoded_message)
     return signed_message.signature.hex()
 
 
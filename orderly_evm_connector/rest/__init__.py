@@ -46,6 +46,7 @@ class Rest(API):
     from orderly_evm_connector.rest._general import get_exchange_info
     from orderly_evm_connector.rest._general import get_token_info
     from orderly_evm_connector.rest._general import get_available_symbols
+    from orderly_evm_connector.rest._general import load_symbol_filters
     from orderly_evm_connector.rest._general import get_fee_futures_information
     from orderly_evm_connector.rest._general import get_leverage_configuration
     from orderly_evm_connector.rest._general import get_user_statistics
@@ -115,6 +116,11 @@ class Rest(API):
     from orderly_evm_connector.rest._trade import cancel_orders
     from orderly_evm_connector.rest._trade import batch_cancel_orders
     from orderly_evm_connector.rest._trade import batch_cancel_orders_by_client_order_id
+    from orderly_evm_connector.rest._bulk_cancel import bulk_cancel_orders
+    from orderly_evm_connector.rest._bulk_cancel import (
+        bulk_cancel_orders_by_client_order_id,
+    )
+    from orderly_evm_connector.rest._bulk_cancel import cancel_all_for_symbols
     from orderly_evm_connector.rest._trade import get_algo_order
     from orderly_evm_connector.rest._trade import get_algo_orders
     from orderly_evm_connector.rest._trade import get_order
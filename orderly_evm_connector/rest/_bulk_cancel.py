@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from orderly_evm_connector.lib.constants import (
+    BATCH_CANCEL_MAX_IDS,
+    CANCEL_RATE_LIMIT_PER_SECOND,
+)
+from orderly_evm_connector.lib.rate_limit import TokenBucket
+from orderly_evm_connector.lib.utils import check_required_parameters
+
+
+def _endpoint_bucket(client, endpoint, rate_limit):
+    """The client's bucket of `endpoint`, shared by every helper call"""
+    with client._endpoint_rate_limits_lock:
+        bucket = client.endpoint_rate_limits.get(endpoint)
+        if bucket is None or bucket.rate != rate_limit:
+            bucket = client.endpoint_rate_limits[endpoint] = TokenBucket(rate_limit)
+        return bucket
+
+
+def _run_concurrently(client, calls, rate_limit=None, max_workers=None):
+    """Run `(endpoint, fn)` calls on a thread pool, returns their results in order.
+
+    A call that raises has its exception as result. With `rate_limit`, calls
+    to one endpoint start at most `rate_limit` per second, counting the
+    other helper calls of `client` in progress.
+    """
+    if not calls:
+        return []
+    buckets = {}
+    if rate_limit:
+        for endpoint, _ in calls:
+            if endpoint not in buckets:
+                buckets[endpoint] = _endpoint_bucket(client, endpoint, rate_limit)
+
+    def run(call):
+        endpoint, fn = call
+        bucket = buckets.get(endpoint)
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return fn()
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(calls), 16)) as executor:
+        return list(executor.map(run, calls))
+
+
+def _chunks(ids, size=BATCH_CANCEL_MAX_IDS):
+    ids = list(dict.fromkeys(str(i) for i in ids))
+    return [ids[i : i + size] for i in range(0, len(ids), size)]
+
+
+def _bulk_cancel(client, cancel, endpoint, ids, rate_limit, max_workers):
+    chunks = _chunks(ids)
+    results = _run_concurrently(
+        client,
+        [(endpoint, lambda chunk=chunk: cancel(",".join(chunk))) for chunk in chunks],
+        rate_limit,
+        max_workers,
+    )
+    return {i: result for chunk, result in zip(chunks, results) for i in chunk}
+
+
+def bulk_cancel_orders(
+    self, order_ids, rate_limit=CANCEL_RATE_LIMIT_PER_SECOND, max_workers=None
+):
+    """[Private] Cancel any number of orders by order_id
+
+    Splits `order_ids` into `batch_cancel_orders` requests of 10 ids, sent
+    concurrently at most `rate_limit` per second across all bulk cancels of
+    this client. The API answers per batch, not per id, so every id of a
+    batch maps to that batch's response.
+
+    Args:
+        order_ids(iterable): order ids
+    Optional Args:
+        rate_limit(number): batch cancel requests per second, None for no limit
+        max_workers(number): concurrent requests
+
+    Returns:
+        dict of order_id (as a string) to the response of its batch, or to the exception it raised
+    """
+    check_required_parameters([[order_ids, "order_ids"]])
+    return _bulk_cancel(
+        self,
+        self.batch_cancel_orders,
+        "DELETE /v1/batch-order",
+        order_ids,
+        rate_limit,
+        max_workers,
+    )
+
+
+def bulk_cancel_orders_by_client_order_id(
+    self, client_order_ids, rate_limit=CANCEL_RATE_LIMIT_PER_SECOND, max_workers=None
+):
+    """[Private] Cancel any number of orders by client_order_id
+
+    Splits `client_order_ids` into `batch_cancel_orders_by_client_order_id`
+    requests of 10 ids, sent concurrently at most `rate_limit` per second
+    across all bulk cancels of this client. The API answers per batch, not
+    per id, so every id of a batch maps to that batch's response.
+
+    Args:
+        client_order_ids(iterable): client order ids
+    Optional Args:
+        rate_limit(number): batch cancel requests per second, None for no limit
+        max_workers(number): concurrent requests
+
+    Returns:
+        dict of client_order_id to the response of its batch, or to the exception it raised
+    """
+    check_required_parameters([[client_order_ids, "client_order_ids"]])
+    return _bulk_cancel(
+        self,
+        self.batch_cancel_orders_by_client_order_id,
+        "DELETE /v1/client/batch-order",
+        client_order_ids,
+        rate_limit,
+        max_workers,
+    )
+
+
+def cancel_all_for_symbols(
+    self,
+    symbols,
+    algo_orders=True,
+    rate_limit=CANCEL_RATE_LIMIT_PER_SECOND,
+    max_workers=None,
+):
+    """[Private] Cancel every open order and pending algo order of `symbols`
+
+    Sends `cancel_orders(symbol)` and, with `algo_orders`,
+    `cancel_algo_all_pending_order(symbol)` for every algo type, for each
+    symbol, all concurrently.
+
+    Args:
+        symbols(iterable)
+    Optional Args:
+        algo_orders(bool): also cancel algo orders
+        rate_limit(number): requests per second per endpoint, None for no limit
+        max_workers(number): concurrent requests
+
+    Returns:
+        dict of symbol to {"orders": response, "algo_orders": response}, an exception replacing a failed response
+    """
+    check_required_parameters([[symbols, "symbols"]])
+    symbols = list(dict.fromkeys(symbols))
+    calls = [
+        ("DELETE /v1/orders", lambda symbol=symbol: self.cancel_orders(symbol=symbol))
+        for symbol in symbols
+    ]
+    if algo_orders:
+        calls += [
+            (
+                "DELETE /v1/algo/orders",
+                lambda symbol=symbol: self.cancel_algo_all_pending_order(symbol),
+            )
+            for symbol in symbols
+        ]
+    results = _run_concurrently(self, calls, rate_limit, max_workers)
+    merged = {symbol: {"orders": result} for symbol, result in zip(symbols, results)}
+    for symbol, result in zip(symbols, results[len(symbols) :]):
+        merged[symbol]["algo_orders"] = result
+    return merged
@@ -1,4 +1,5 @@
 from orderly_evm_connector.lib.utils import check_required_parameters
+from orderly_evm_connector.lib.symbol_filters import SymbolFilters, FILTER_MODE_REJECT
 
 
 def get_system_maintenance_status(self):
@@ -117,6 +118,27 @@ def get_available_symbols(self):
     return self._request("GET", "/v1/public/info")
 
 
+def load_symbol_filters(self, symbols: list = None, mode: str = FILTER_MODE_REJECT):
+    """Load order rules for client-side validation
+
+    Fetches the rules of every symbol via `get_available_symbols`, or of the given symbols via `get_exchange_info`, and keeps them in `self.symbol_filters`. Once loaded, `create_order`, `edit_order` and `batch_create_order` check price, quantity and notional locally and raise `OrderFilterError` instead of sending an order the server would reject.
+
+    Optional Args:
+        symbols(list): only load the rules of these symbols
+        mode(string): reject/round. In round mode price and quantity are snapped to quote_tick and base_tick before the range checks.
+    """
+    if symbols:
+        symbol_filters = SymbolFilters(mode=mode)
+        for symbol in symbols:
+            symbol_filters.update(self.get_exchange_info(symbol))
+    else:
+        symbol_filters = SymbolFilters.from_response(
+            self.get_available_symbols(), mode=mode
+        )
+    self.symbol_filters = symbol_filters
+    return symbol_filters
+
+
 def get_fee_futures_information(self):
     """[Public] Futures fee information
 
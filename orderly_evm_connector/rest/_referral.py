@@ -217,7 +217,8 @@ def check_ref_code(self, account_id:str = None ):
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/public/check-referral-code#openapi-evmopenapi-get-v1publicreferralcheck_ref_code
     """
     check_required_parameters([[account_id,'account_id']])
-    return self._request("GET", f"/v1/public/referral/check_ref_code?account_id={account_id}")
+    payload = {"account_id": account_id}
+    return self._request("GET", "/v1/public/referral/check_ref_code", payload=payload)
 
 def verify_ref_code(self, referral_code:str = None ):
     """
@@ -228,4 +229,5 @@ def verify_ref_code(self, referral_code:str = None ):
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/public/verify-referral-code#openapi-evmopenapi-get-v1publicreferralverify_ref_code
     """
     check_required_parameters([[referral_code,'referral_code']])
-    return self._request("GET", f"/v1/public/referral/verify_ref_code?referral_code={referral_code}")
+    payload = {"referral_code": referral_code}
+    return self._request("GET", "/v1/public/referral/verify_ref_code", payload=payload)
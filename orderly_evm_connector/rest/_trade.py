@@ -1,7 +1,23 @@
 from orderly_evm_connector.lib.utils import check_required_parameters
 from orderly_evm_connector.lib.utils import check_enum_parameter
+from orderly_evm_connector.lib.utils import ParameterSchema
 from orderly_evm_connector.lib.enums import OrderType, OrderStatus, OrderSide,AlgoType
 
+_order_schema = ParameterSchema(
+    required=("symbol", "order_type", "side"), enums={"order_type": OrderType}
+)
+_edit_order_schema = ParameterSchema(
+    required=("order_id", "symbol", "order_type", "side"),
+    enums={"order_type": OrderType},
+)
+_get_orders_schema = ParameterSchema(
+    enums={"order_type": OrderType, "side": OrderSide, "status": OrderStatus}
+)
+_get_algo_orders_schema = ParameterSchema(
+    required=("algo_type",),
+    enums={"order_type": OrderType, "side": OrderSide, "status": OrderStatus},
+)
+
 def create_order(
     self,
     symbol: str,
@@ -34,10 +50,13 @@ def create_order(
 
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/create-order
     """
-    check_required_parameters(
-        [[symbol, "symbol"], [order_type, "order_type"], [side, "side"]]
+    _order_schema.validate(
+        {"symbol": symbol, "order_type": order_type, "side": side}
     )
-    check_enum_parameter(order_type, OrderType)
+    if self.symbol_filters is not None:
+        order_price, order_quantity = self.symbol_filters.check_order(
+            symbol, order_type, side, order_price, order_quantity
+        )
     payload = {
         "symbol": symbol,
         "order_type": order_type,
@@ -137,16 +156,10 @@ def batch_create_order(self, orders: list):
 
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/batch-create-order
     """
-    for order in orders:
-        check_required_parameters(
-            [
-                [order["symbol"], "symbol"],
-                [order["order_type"], "order_type"],
-                [order["side"], "side"],
-            ]
-        )
-        check_enum_parameter(order["order_type"], OrderType)
+    _order_schema.validate_batch(orders)
 
+    if self.symbol_filters is not None:
+        orders = [self.symbol_filters.check_order_dict(order) for order in orders]
     payload = {"orders": orders}
     return self._sign_request("POST", "/v1/batch-order", payload=payload)
 
@@ -224,15 +237,18 @@ def edit_order(
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/edit-order
 
     """
-    check_required_parameters(
-        [
-            [order_id, "order_id"],
-            [symbol, "symbol"],
-            [order_type, "order_type"],
-            [side, "side"],
-        ]
+    _edit_order_schema.validate(
+        {
+            "order_id": order_id,
+            "symbol": symbol,
+            "order_type": order_type,
+            "side": side,
+        }
     )
-    check_enum_parameter(order_type, OrderType)
+    if self.symbol_filters is not None:
+        order_price, order_quantity = self.symbol_filters.check_order(
+            symbol, order_type, side, order_price, order_quantity
+        )
 
     payload = {
         "order_id": order_id,
@@ -263,15 +279,11 @@ def cancel_algo_order(self, order_id: int, symbol: str):
 
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/cancel-algo-order
     """
-    self.session.headers.update(
-            {
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-        )
     check_required_parameters([[order_id, "order_id"], [symbol, "symbol"]])
-    return self._sign_request("DELETE", f"/v1/algo/order?order_id={order_id}&symbol={symbol}")
+    payload = {"order_id": order_id, "symbol": symbol}
+    return self._sign_request("DELETE", "/v1/algo/order", payload=payload)
 
-def cancel_algo_all_pending_order(self, symbol: str, algo_type: str):
+def cancel_algo_all_pending_order(self, symbol: str, algo_type: str = None):
     """[Private] Cancel All Pending Algo Orders
 
     Limit: 10 requests per 1 second
@@ -282,18 +294,16 @@ def cancel_algo_all_pending_order(self, symbol: str, algo_type: str):
 
     Args:
         symbol(string)
-        algo_type(string): STOP, TAKE_PROFIT, STOP_LOSS, TP_SL, POSITIONAL_TP_SL, BRACKET
+    Optional Args:
+        algo_type(string): STOP, TAKE_PROFIT, STOP_LOSS, TP_SL, POSITIONAL_TP_SL, BRACKET; every type when omitted
 
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/cancel-all-pending-algo-orders
     """
-    self.session.headers.update(
-            {
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-        )
-    check_enum_parameter(algo_type, AlgoType)
+    if algo_type is not None:
+        check_enum_parameter(algo_type, AlgoType)
     check_required_parameters([[symbol, "symbol"]])
-    return self._sign_request("DELETE", f"/v1/algo/orders?symbol={symbol}")
+    payload = {"symbol": symbol, "algo_type": algo_type}
+    return self._sign_request("DELETE", "/v1/algo/orders", payload=payload)
 
 def cancel_order(self, order_id: int, symbol: str, **kwargs):
     """[Private] Cancel order
@@ -331,12 +341,8 @@ def cancel_algo_order_by_client_order_id(self, client_order_id: int, symbol: str
     check_required_parameters(
         [[client_order_id, "client_order_id"], [symbol, "symbol"]]
     )
-    self.session.headers.update(
-            {
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-        )
-    return self._sign_request("DELETE", f"/v1/algo/client/order?client_order_id={client_order_id}&symbol={symbol}")
+    payload = {"client_order_id": client_order_id, "symbol": symbol}
+    return self._sign_request("DELETE", "/v1/algo/client/order", payload=payload)
 
 
 def cancel_order_by_client_order_id(self, client_order_id: int, symbol: str):
@@ -529,14 +535,14 @@ def get_algo_orders(
 
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/get-algo-orders#openapi-evmopenapi-get-v1algoorders
     """
-    if order_type:
-        check_enum_parameter(order_type, OrderType)
-    if side:
-        check_enum_parameter(side, OrderSide)
-    if status:
-        check_enum_parameter(status, OrderStatus)
-
-    check_required_parameters([[algo_type, "algo_type"]])
+    _get_algo_orders_schema.validate(
+        {
+            "algo_type": algo_type,
+            "order_type": order_type,
+            "side": side,
+            "status": status,
+        }
+    )
 
     payload = {
         "symbol": symbol,
@@ -607,12 +613,9 @@ def get_orders(
     If sort_by == UPDATED_TIME_ASC, ascending order by updated_time. Ascending order by order_id if updated_time are same;
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/get-orders#openapi-evmopenapi-get-v1orders
     """
-    if order_type:
-        check_enum_parameter(order_type, OrderType)
-    if side:
-        check_enum_parameter(side, OrderSide)
-    if status:
-        check_enum_parameter(status, OrderStatus)
+    _get_orders_schema.validate(
+        {"order_type": order_type, "side": side, "status": status}
+    )
 
     payload = {
         "symbol": symbol,
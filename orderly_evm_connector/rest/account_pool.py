@@ -0,0 +1,145 @@
+import threading
+
+from orderly_evm_connector.error import ParameterArgumentError
+from orderly_evm_connector.lib.circuit_breaker import CircuitBreakers
+from orderly_evm_connector.lib.hedging import Hedger
+from orderly_evm_connector.lib.metrics import RestMetrics
+from orderly_evm_connector.lib.rate_limit import TokenBucket
+from orderly_evm_connector.lib.transport import RequestsTransport
+from orderly_evm_connector.rest import Rest
+
+# Orderly allows 10 requests per second per orderly key on most private endpoints.
+DEFAULT_KEY_RATE_LIMIT = 10
+
+
+class AccountPool(object):
+    """Many Orderly accounts trading through one transport.
+
+    Every account gets its own `Rest` client, created by `add_account`, that
+    signs with the account's orderly key. The clients share the pool's
+    transport, so the connections and TLS sessions to the API are reused
+    across accounts, as well as its metrics, retry policy, circuit breakers
+    and hedger. Each client keeps its decoded signing key, so a request
+    costs one signature and no key parsing, and the key is dropped with the
+    client by `remove_account`.
+
+    Calls are routed by `orderly_account_id`, with `pool[account_id]` or
+    `pool.client(account_id)`. Before each signed HTTP call a client waits
+    for a token from its key's bucket (`key_rate_limit` requests per second)
+    and, when `ip_rate_limit` is set, every call waits for a token from the
+    bucket shared by the whole pool, since all accounts leave from the same
+    IP. Public endpoints are not charged to the key.
+
+    Args:
+        orderly_testnet: use the testnet endpoints
+        transport: shared transport, a `RequestsTransport` sized for `pool_maxsize` by default
+        key_rate_limit: requests per second per orderly key, None to disable
+        key_rate_burst: burst size per key, defaults to `key_rate_limit`
+        ip_rate_limit: requests per second for the whole pool, None to disable
+        ip_rate_burst: burst size for the pool, defaults to `ip_rate_limit`
+        pool_maxsize: connections kept alive by the default transport
+        **kwargs: passed to every `Rest` client, e.g. `timeout` or `retry_policy`
+    """
+
+    def __init__(
+        self,
+        orderly_testnet=False,
+        transport=None,
+        key_rate_limit=DEFAULT_KEY_RATE_LIMIT,
+        key_rate_burst=None,
+        ip_rate_limit=None,
+        ip_rate_burst=None,
+        pool_maxsize=32,
+        **kwargs
+    ):
+        self.orderly_testnet = orderly_testnet
+        self.transport = (
+            transport
+            if transport is not None
+            else RequestsTransport(pool_maxsize=pool_maxsize)
+        )
+        self.key_rate_limit = key_rate_limit
+        self.key_rate_burst = key_rate_burst
+        self.ip_limit = (
+            TokenBucket(ip_rate_limit, ip_rate_burst) if ip_rate_limit else None
+        )
+        # True would give every client its own instance, one is created for all
+        if kwargs.get("metrics") is True:
+            kwargs["metrics"] = RestMetrics()
+        if kwargs.get("circuit_breaker") is True:
+            kwargs["circuit_breaker"] = CircuitBreakers()
+        if kwargs.get("hedging") is True:
+            kwargs["hedging"] = Hedger()
+        self.client_kwargs = kwargs
+        self._clients = {}
+        self._key_limits = {}
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self):
+        return self.client_kwargs.get("metrics")
+
+    def _key_limit(self, orderly_key):
+        if not self.key_rate_limit:
+            return None
+        limit = self._key_limits.get(orderly_key)
+        if limit is None:
+            limit = self._key_limits[orderly_key] = TokenBucket(
+                self.key_rate_limit, self.key_rate_burst
+            )
+        return limit
+
+    def add_account(
+        self, orderly_account_id, orderly_key, orderly_secret, wallet_secret=None
+    ):
+        """Register an account and return its client.
+
+        The secret is decoded here, so a malformed one fails at once rather
+        than on the first order. Accounts sharing an orderly key share its
+        rate limit.
+        """
+        if not orderly_account_id:
+            raise ParameterArgumentError("orderly_account_id is required")
+        with self._lock:
+            key_limit = self._key_limit(orderly_key)
+            client = Rest(
+                orderly_key=orderly_key,
+                orderly_secret=orderly_secret,
+                wallet_secret=wallet_secret,
+                orderly_testnet=self.orderly_testnet,
+                orderly_account_id=orderly_account_id,
+                transport=self.transport,
+                rate_limits=[self.ip_limit] if self.ip_limit else None,
+                signed_rate_limits=[key_limit] if key_limit else None,
+                **self.client_kwargs
+            )
+            # Decoded now, so a malformed secret fails here and not on the first order
+            client.orderly_private_key
+            self._clients[orderly_account_id] = client
+        return client
+
+    def remove_account(self, orderly_account_id):
+        with self._lock:
+            client = self._clients.pop(orderly_account_id, None)
+        if client is not None:
+            client.stop_keepalive()
+
+    def client(self, orderly_account_id):
+        """The client of a registered account"""
+        try:
+            return self._clients[orderly_account_id]
+        except KeyError:
+            raise ParameterArgumentError(
+                "Unknown orderly_account_id: {}".format(orderly_account_id)
+            ) from None
+
+    __getitem__ = client
+
+    def __contains__(self, orderly_account_id):
+        return orderly_account_id in self._clients
+
+    def __len__(self):
+        return len(self._clients)
+
+    def accounts(self):
+        return list(self._clients)
@@ -0,0 +1,248 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from decimal import Decimal
+from time import perf_counter
+
+from orderly_evm_connector.lib.constants import KILL_SWITCH_DEADLINE_IN_SECONDS
+
+
+def _closing_order(position_qty):
+    """Side and quantity of the reduce-only order closing `position_qty`.
+
+    The quantity is the server's value without its sign, never converted,
+    so the order closes exactly the position. (None, None) when flat.
+    """
+    position = Decimal(str(position_qty or 0))
+    if position == 0:
+        return None, None
+    if isinstance(position_qty, str):
+        quantity = position_qty.strip().lstrip("+-")
+    else:
+        quantity = abs(position_qty)
+    return ("SELL" if position > 0 else "BUY"), quantity
+
+
+class KillSwitchReport(object):
+    """What a `KillSwitch.trigger` did, and when.
+
+    `timeline` lists `(seconds since trigger, event, detail)` tuples in the
+    order they happened. `errors` lists `(step, exception)` pairs, `timeouts`
+    the steps still running at the deadline and `unconfirmed` the
+    client_order_ids of flatten orders whose fill was not seen on the
+    private stream. `completed` is true when every step succeeded, and was
+    confirmed when asked to, before the deadline.
+    """
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.timeline = []
+        self.errors = []
+        self.timeouts = []
+        self.unconfirmed = []
+        self.flatten_orders = {}
+        self.completed = False
+        self.elapsed = None
+        self.started = perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, event, detail=None):
+        with self._lock:
+            self.timeline.append((perf_counter() - self.started, event, detail))
+
+    def __repr__(self):
+        return "KillSwitchReport(completed={}, elapsed={:.3f}s, errors={}, timeouts={}, unconfirmed={})".format(
+            self.completed,
+            self.elapsed or 0.0,
+            len(self.errors),
+            len(self.timeouts),
+            len(self.unconfirmed),
+        )
+
+
+class KillSwitch(object):
+    """Cancels every order and flattens every position of an account, against a deadline.
+
+    `trigger` sends at once, in parallel, `cancel_orders()` for all regular
+    orders, a cancel of all pending algo orders for each of `symbols`, and
+    `get_all_positions_info`. As soon as positions arrive, a reduce-only
+    MARKET order closing each open position is fired, together with the
+    algo order cancels of position symbols not in `symbols`. Every request
+    runs on its own thread, so the whole sequence costs about two round
+    trips instead of one per order and position.
+
+    Signatures carry a timestamp and the flatten quantities are only known
+    once positions are read, so requests cannot be signed in advance.
+    Instead `arm` opens the connections and starts the threads beforehand;
+    keys are decoded once per process by the signing code. Combine with a
+    client built with `retry_policy` to resend failed flatten orders, which
+    carry a `client_order_id` and are therefore safe to retry.
+
+    With `confirm=True`, feed the private stream to `on_message` (it takes
+    the raw message or the decoded dict), subscribed to `executionreport`:
+    `trigger` then also waits until each flatten order is reported FILLED.
+
+    Args:
+        client: a `Rest` client of the account
+        deadline: seconds `trigger` may take
+        symbols: symbols whose algo orders are cancelled even without a position
+        confirm: wait for fills on the private stream
+        max_workers: threads sending requests
+    """
+
+    def __init__(
+        self,
+        client,
+        deadline=KILL_SWITCH_DEADLINE_IN_SECONDS,
+        symbols=(),
+        confirm=False,
+        max_workers=16,
+    ):
+        self.client = client
+        self.deadline = deadline
+        self.symbols = list(dict.fromkeys(symbols))
+        self.confirm = confirm
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="orderly-kill-switch"
+        )
+        self._pending_fills = set()
+        self._filled = threading.Condition()
+        self._report = None
+
+    def arm(self, connections=4):
+        """Open `connections` pooled connections and start the worker threads"""
+        self.client.warmup(connections)
+        wait([self._executor.submit(time.sleep, 0.01) for _ in range(self.max_workers)])
+
+    def on_message(self, message):
+        """Private stream handler, marks flatten orders as filled"""
+        if isinstance(message, (str, bytes)):
+            try:
+                message = json.loads(message)
+            except ValueError:
+                return
+        if not isinstance(message, dict) or message.get("topic") != "executionreport":
+            return
+        data = message.get("data") or {}
+        if data.get("status") != "FILLED":
+            return
+        with self._filled:
+            client_order_id = data.get("clientOrderId")
+            if client_order_id in self._pending_fills:
+                self._pending_fills.discard(client_order_id)
+                if self._report is not None:
+                    self._report.record("filled", client_order_id)
+                self._filled.notify_all()
+
+    def _cancel_algo_orders(self, symbol):
+        # Without algo_type every pending algo order of the symbol is cancelled
+        return self.client.cancel_algo_all_pending_order(symbol)
+
+    def _submit(self, report, steps, step, fn, *args, **kwargs):
+        def run():
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                report.record("failed", step)
+                raise
+            report.record("done", step)
+            return result
+
+        report.record("sent", step)
+        future = self._executor.submit(run)
+        steps[future] = step
+        return future
+
+    def trigger(self):
+        """Cancel all orders and flatten all positions, returns a `KillSwitchReport`"""
+        report = KillSwitchReport(self.deadline)
+        deadline_at = report.started + self.deadline
+        self._report = report
+        steps = {}
+        report.record("triggered")
+
+        self._submit(report, steps, "cancel_orders", self.client.cancel_orders)
+        for symbol in self.symbols:
+            self._submit(
+                report,
+                steps,
+                ("cancel_algo_orders", symbol),
+                self._cancel_algo_orders,
+                symbol,
+            )
+        positions = self._submit(
+            report, steps, "get_all_positions_info", self.client.get_all_positions_info
+        )
+
+        try:
+            rows = positions.result(timeout=max(deadline_at - perf_counter(), 0))
+            rows = (rows.get("data") or {}).get("rows") or []
+        except Exception:
+            # Recorded as an error or a timeout below
+            rows = []
+        prefix = "kill{}".format(int(time.time() * 1000))
+        for index, row in enumerate(rows):
+            symbol = row["symbol"]
+            side, quantity = _closing_order(row.get("position_qty"))
+            if symbol not in self.symbols:
+                self._submit(
+                    report,
+                    steps,
+                    ("cancel_algo_orders", symbol),
+                    self._cancel_algo_orders,
+                    symbol,
+                )
+            if side is None:
+                continue
+            client_order_id = "{}_{}".format(prefix, index)
+            report.flatten_orders[client_order_id] = symbol
+            if self.confirm:
+                with self._filled:
+                    self._pending_fills.add(client_order_id)
+            self._submit(
+                report,
+                steps,
+                ("flatten", symbol),
+                self.client.create_order,
+                symbol=symbol,
+                order_type="MARKET",
+                side=side,
+                order_quantity=quantity,
+                reduce_only=True,
+                client_order_id=client_order_id,
+            )
+
+        done, not_done = wait(list(steps), timeout=max(deadline_at - perf_counter(), 0))
+        report.timeouts = [steps[future] for future in not_done]
+        report.errors = [
+            (steps[future], future.exception())
+            for future in steps
+            if future in done and future.exception() is not None
+        ]
+
+        if self.confirm:
+            failed = {step for step, _ in report.errors}
+            failed = {
+                client_order_id
+                for client_order_id, symbol in report.flatten_orders.items()
+                if ("flatten", symbol) in failed
+            }
+            with self._filled:
+                self._pending_fills -= failed
+                self._filled.wait_for(
+                    lambda: not self._pending_fills,
+                    timeout=max(deadline_at - perf_counter(), 0),
+                )
+                report.unconfirmed = sorted(self._pending_fills)
+                self._pending_fills.clear()
+
+        report.elapsed = perf_counter() - report.started
+        report.completed = not (report.errors or report.timeouts or report.unconfirmed)
+        report.record("finished", "completed" if report.completed else "incomplete")
+        self._report = None
+        return report
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,260 @@
+import threading
+from collections import deque
+
+from orderly_evm_connector.lib.constants import WEBSOCKET_DISPATCH_QUEUE_SIZE
+from orderly_evm_connector.lib.utils import orderlyLog
+
+BACKPRESSURE_BLOCK = "block"
+BACKPRESSURE_DROP_OLDEST = "drop_oldest"
+BACKPRESSURE_CONFLATE = "conflate"
+
+# Queue entry placeholder of a conflated topic, its payload lives in `_latest`.
+_CONFLATED = object()
+
+# Snapshot streams where only the latest value matters. Entries starting with
+# "@" match the stream part of per-symbol topics such as PERP_ETH_USDC@bbo.
+SNAPSHOT_TOPICS = ("@bbo", "bbos", "tickers", "markprices", "@orderbook")
+
+_BACKPRESSURE_POLICIES = (
+    BACKPRESSURE_BLOCK,
+    BACKPRESSURE_DROP_OLDEST,
+    BACKPRESSURE_CONFLATE,
+)
+
+
+def topic_matcher(topics):
+    """Predicate telling whether a topic is in `topics`.
+
+    `topics` is a callable, or an iterable of exact topic names and
+    "@stream" entries matching any symbol.
+    """
+    if callable(topics):
+        return topics
+    names = frozenset(topic for topic in topics if not topic.startswith("@"))
+    streams = frozenset(topic for topic in topics if topic.startswith("@"))
+
+    def matches(topic):
+        if topic in names:
+            return True
+        index = topic.find("@") if topic else -1
+        return index >= 0 and topic[index:] in streams
+
+    return matches
+
+
+class InlineDispatcher(object):
+    """Runs the callback on the reader thread, the historical behaviour"""
+
+    dropped = 0
+
+    def __init__(self):
+        self.deliver = None
+        self.metrics = None
+
+    def bind(self, deliver, metrics=None):
+        self.deliver = deliver
+        self.metrics = metrics
+
+    def start(self):
+        pass
+
+    def submit(self, topic, data):
+        self.deliver(topic, data)
+
+    def stop(self, drain=True):
+        pass
+
+    @property
+    def depth(self):
+        return 0
+
+
+class QueueDispatcher(InlineDispatcher):
+    """Bounded queue between the websocket reader and the callbacks.
+
+    The reader thread only receives frames and answers pings, then pushes
+    messages here. `workers` daemon threads drain the queue and run
+    `on_message`, so a slow callback no longer stalls `recv_data_frame`.
+    When `loop` (an asyncio event loop) is given, the queue is drained on
+    that loop instead of on worker threads.
+
+    When the queue holds `maxsize` messages, `backpressure` decides:
+        block: the reader waits for room. Nothing is lost, but pings are delayed while it waits
+        drop_oldest: the oldest queued message is discarded
+        conflate: only the newest pending message of each topic is kept
+
+    With `conflate`, `conflate_topics` limits conflation to some topics (see
+    `topic_matcher`); other topics are queued in order and block when the
+    queue is full. Overwritten or discarded messages are counted in
+    `dropped`, per topic in `dropped_by_topic`, and in the stream metrics.
+
+    With more than one worker, messages of the same topic may be delivered
+    out of order.
+    """
+
+    def __init__(
+        self,
+        maxsize=WEBSOCKET_DISPATCH_QUEUE_SIZE,
+        workers=1,
+        backpressure=BACKPRESSURE_BLOCK,
+        loop=None,
+        conflate_topics=None,
+    ):
+        super().__init__()
+        if backpressure not in _BACKPRESSURE_POLICIES:
+            raise ValueError(f"unknown backpressure policy: {backpressure}")
+        self.maxsize = maxsize
+        self.workers = workers
+        self.backpressure = backpressure
+        self.loop = loop
+        self.dropped = 0
+        self.dropped_by_topic = {}
+        self.logger = orderlyLog()
+        self._queue = deque()
+        self._latest = {}
+        self._condition = threading.Condition()
+        self._running = False
+        self._drain_scheduled = False
+        self._threads = []
+        self._conflated_topics = {}
+        self._conflate_matcher = (
+            topic_matcher(conflate_topics) if conflate_topics is not None else None
+        )
+
+    @property
+    def depth(self):
+        return len(self._queue)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        if self.loop is not None:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"orderly-dispatch-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _conflates(self, topic):
+        if self.backpressure != BACKPRESSURE_CONFLATE:
+            return False
+        if self._conflate_matcher is None:
+            return True
+        conflates = self._conflated_topics.get(topic)
+        if conflates is None:
+            conflates = self._conflated_topics[topic] = bool(
+                self._conflate_matcher(topic)
+            )
+        return conflates
+
+    def submit(self, topic, data):
+        with self._condition:
+            if self._conflates(topic):
+                if topic in self._latest:
+                    self._latest[topic] = data
+                    self._record_drop(topic)
+                    return
+                self._latest[topic] = data
+                data = _CONFLATED
+            while len(self._queue) >= self.maxsize and self._running:
+                if self.backpressure == BACKPRESSURE_DROP_OLDEST:
+                    self._discard_oldest()
+                else:
+                    self._condition.wait()
+            self._queue.append((topic, data))
+            self._update_depth()
+            self._condition.notify()
+            if self.loop is not None and not self._drain_scheduled:
+                self._drain_scheduled = True
+                self.loop.call_soon_threadsafe(self._drain)
+
+    def _discard_oldest(self):
+        topic, data = self._queue.popleft()
+        if data is _CONFLATED:
+            self._latest.pop(topic, None)
+        self._record_drop(topic)
+
+    def _record_drop(self, topic):
+        self.dropped += 1
+        self.dropped_by_topic[topic] = self.dropped_by_topic.get(topic, 0) + 1
+        if self.metrics is not None:
+            self.metrics.record_drop(topic)
+
+    def _update_depth(self):
+        if self.metrics is not None:
+            self.metrics.set_queue_depth(len(self._queue))
+
+    def _pop(self):
+        topic, data = self._queue.popleft()
+        if data is _CONFLATED:
+            data = self._latest.pop(topic)
+        self._update_depth()
+        self._condition.notify()
+        return topic, data
+
+    def _deliver(self, topic, data):
+        try:
+            self.deliver(topic, data)
+        except Exception as e:
+            self.logger.error(f"Error while dispatching websocket message: {e}")
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._queue and self._running:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                topic, data = self._pop()
+            self._deliver(topic, data)
+
+    def _drain(self):
+        while True:
+            with self._condition:
+                if not self._queue:
+                    self._drain_scheduled = False
+                    return
+                topic, data = self._pop()
+            self._deliver(topic, data)
+
+    def stop(self, drain=True):
+        """Stop the workers; pending messages are delivered first unless `drain` is False"""
+        with self._condition:
+            if not drain:
+                self._queue.clear()
+                self._latest.clear()
+                self._update_depth()
+            self._running = False
+            self._condition.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+        self._threads = []
+
+
+class ConflatingDispatcher(QueueDispatcher):
+    """Queue dispatcher delivering only the newest update of snapshot topics.
+
+    When the consumer lags, a pending `@bbo`, `bbos`, `tickers`,
+    `markprices` or `@orderbook` message is overwritten in place by the next
+    one, so handlers always see current data instead of a backlog. Other
+    topics keep every message, in order.
+    """
+
+    def __init__(
+        self,
+        maxsize=WEBSOCKET_DISPATCH_QUEUE_SIZE,
+        workers=1,
+        loop=None,
+        conflate_topics=SNAPSHOT_TOPICS,
+    ):
+        super().__init__(
+            maxsize=maxsize,
+            workers=workers,
+            backpressure=BACKPRESSURE_CONFLATE,
+            loop=loop,
+            conflate_topics=conflate_topics,
+        )
@@ -1,6 +1,7 @@
 import threading
 import json
 import time
+from time import perf_counter
 from websocket import (
     create_connection,
     ABNF,
@@ -9,12 +10,19 @@ from websocket import (
     WebSocketTimeoutException,
 )
 from orderly_evm_connector.lib.utils import orderlyLog, parse_proxies, decode_ws_error_code
+from orderly_evm_connector.lib.tracing import Tracer
+from orderly_evm_connector.lib.metrics import StreamMetrics
+from orderly_evm_connector.websocket.dispatcher import InlineDispatcher
+from orderly_evm_connector.websocket.recorder import FrameRecorder
+from orderly_evm_connector.websocket.subscription_manager import SUBSCRIPTION_EVENTS
 from orderly_evm_connector.lib.constants import (
     WEBSOCKET_TIMEOUT_IN_SECONDS,
     WEBSOCKET_FAILED_MAX_RETRIES,
     WEBSOCKET_RETRY_SLEEP_TIME,
 )
 
+_PONG_FRAME = json.dumps({"event": "pong"})
+
 
 class OrderlySocketManager(threading.Thread):
     def __init__(
@@ -30,6 +38,10 @@ class OrderlySocketManager(threading.Thread):
         debug=False,
         proxies=None,
         max_retries=WEBSOCKET_FAILED_MAX_RETRIES,
+        metrics=None,
+        dispatcher=None,
+        record_path=None,
+        on_ack=None,
     ):
         threading.Thread.__init__(self)
         self.websocket_url = websocket_url
@@ -39,12 +51,30 @@ class OrderlySocketManager(threading.Thread):
         self.on_error = on_error
         self.on_ping = on_ping
         self.on_pong = on_pong
+        # Called on the reader thread with subscribe and unsubscribe replies
+        self.on_ack = on_ack
         self.timeout = timeout
         self.logger = orderlyLog(debug=debug)
+        self.tracer = Tracer(self.logger)
+        # metrics=True creates a private StreamMetrics, an instance can be shared
+        self.metrics = StreamMetrics() if metrics is True else metrics or None
+        # Inline by default; pass a QueueDispatcher to run callbacks off the reader thread
+        self.dispatcher = dispatcher if dispatcher is not None else InlineDispatcher()
+        self.dispatcher.bind(self._deliver, self.metrics)
+        self.dispatcher.start()
+        # Raw frames are appended to this log when set, see websocket.replay
+        self.recorder = FrameRecorder(record_path) if record_path else None
         self._proxy_params = parse_proxies(proxies) if proxies else {}
         self.subscriptions = []
         self._login = False
-        self.create_ws_connection()
+        try:
+            self.create_ws_connection()
+        except Exception:
+            # The reader never runs, release what it would have closed
+            self.dispatcher.stop(drain=False)
+            if self.recorder is not None:
+                self.recorder.close()
+            raise
 
     def create_ws_connection(self):
         retries = 0
@@ -91,7 +121,7 @@ class OrderlySocketManager(threading.Thread):
                     raise
 
     def send_message(self, message):
-        self.logger.debug("Sending message to Orderly WebSocket Server: %s", message)
+        self.tracer.trace("ws_send", frame=message)
         self.ws.send(message)
 
     def run(self):
@@ -99,25 +129,28 @@ class OrderlySocketManager(threading.Thread):
 
     def _handle_heartbeat(self):
         try:
-            _payload = {"event": "pong"}
-            self.ws.send(json.dumps(_payload))
-            self.logger.debug(f"Sent Ping frame:{_payload}")
+            self.ws.send(_PONG_FRAME)
+            self.tracer.trace("ws_pong", frame=_PONG_FRAME)
         except Exception as e:
             self.logger.error("Failed to send Ping: {}".format(e))
 
     def read_data(self):
+        try:
+            self._read_frames()
+        finally:
+            # Also when reconnect gives up and raises
+            if self.recorder is not None:
+                self.recorder.close()
+
+    def _read_frames(self):
         data = ""
         while True:
+            topic = None
             try:
                 op_code, frame = self.ws.recv_data_frame(True)
-                try:
-                    _message = json.loads(frame.data)
-                except:
-                    err_code = decode_ws_error_code(frame.data)
-                    self.logger.warning(f"Websocket error code received: {err_code}")
-                if "event" in _message:
-                    if _message["event"] == "ping":
-                        self._handle_heartbeat()
+                if self.recorder is not None:
+                    self.recorder.record(op_code, frame.data)
+                topic = self._inspect_frame(op_code, frame)
             except WebSocketConnectionClosedException:
                 self.logger.warning("WebSocket connection closed. Reconnecting...")
                 self.reconnect()
@@ -134,17 +167,50 @@ class OrderlySocketManager(threading.Thread):
                 self.logger.warning("Reconnecting...")
                 self.reconnect()
                 continue
-            self._handle_data(op_code, frame, data)
+            self._handle_data(op_code, frame, data, topic)
 
             if op_code == ABNF.OPCODE_CLOSE:
                 self.logger.warning("CLOSE frame received, closing websocket connection")
+                self.dispatcher.stop()
+                if self.recorder is not None:
+                    self.recorder.close()
                 self._callback(self.on_close)
                 break
 
-    def _handle_data(self, op_code, frame, data):
+    def _inspect_frame(self, op_code, frame, received=None):
+        """Answer pings and record metrics, returns the topic of the frame"""
+        try:
+            _message = json.loads(frame.data)
+        except:
+            err_code = decode_ws_error_code(frame.data)
+            self.logger.warning(f"Websocket error code received: {err_code}")
+            return None
+        if not isinstance(_message, dict):
+            return None
+        if "event" in _message:
+            if _message["event"] == "ping":
+                self._handle_heartbeat()
+            elif self.on_ack is not None and _message["event"] in SUBSCRIPTION_EVENTS:
+                self.on_ack(_message)
+        topic = _message.get("topic") or _message.get("event")
+        if self.metrics is not None and op_code == ABNF.OPCODE_TEXT:
+            self.metrics.record_message(
+                topic, len(frame.data), _message.get("ts"), received
+            )
+        return topic
+
+    def _handle_data(self, op_code, frame, data, topic=None):
         if op_code == ABNF.OPCODE_TEXT:
             data = frame.data.decode()
+            self.dispatcher.submit(topic, data)
+
+    def _deliver(self, topic, data):
+        if self.metrics is None:
+            self._callback(self.on_message, data)
+        else:
+            started = perf_counter()
             self._callback(self.on_message, data)
+            self.metrics.record_callback(topic, perf_counter() - started)
 
     def close(self):
         if not self.ws.connected:
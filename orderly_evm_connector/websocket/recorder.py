@@ -0,0 +1,53 @@
+import struct
+import time
+from collections import namedtuple
+
+# File layout: MAGIC, then one record per frame made of a _RECORD header
+# (receive time in epoch seconds, websocket opcode, payload length) followed
+# by the raw payload.
+MAGIC = b"OWSREC1\n"
+_RECORD = struct.Struct("<dBI")
+
+RecordedFrame = namedtuple("RecordedFrame", ["received", "op_code", "data"])
+
+
+class FrameRecorder(object):
+    """Append-only binary log of raw websocket frames.
+
+    Each frame is flushed as it is recorded, so the log is complete up to
+    the last frame when the connection gives up or the process dies.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def record(self, op_code, data, received=None):
+        if received is None:
+            received = time.time()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._file.write(_RECORD.pack(received, op_code, len(data)) + data)
+        self._file.flush()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_frames(path):
+    """Yield the `RecordedFrame`s of a log written by `FrameRecorder`"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an Orderly websocket recording")
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            received, op_code, length = _RECORD.unpack(header)
+            yield RecordedFrame(received, op_code, f.read(length))
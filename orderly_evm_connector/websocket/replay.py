@@ -0,0 +1,79 @@
+import time
+
+from websocket import ABNF
+
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from orderly_evm_connector.websocket.recorder import read_frames
+
+
+class _Frame(object):
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+
+class ReplaySocketManager(OrderlySocketManager):
+    """Feeds a recording through the regular frame handling, without a network.
+
+    Frames go through the same parsing, metrics and dispatcher as a live
+    connection, so book-building and strategy code can be benchmarked
+    deterministically or an incident reproduced offline. Latency metrics use
+    the recorded receive times.
+
+    Args:
+        path: recording written with `record_path=` on a live client
+        speed: 1.0 replays at the original pace, N at N times that pace, None as fast as possible
+    """
+
+    def __init__(
+        self,
+        path,
+        on_message=None,
+        on_close=None,
+        on_error=None,
+        speed=1.0,
+        debug=False,
+        metrics=None,
+        dispatcher=None,
+    ):
+        self.path = path
+        self.speed = speed
+        super().__init__(
+            path,
+            on_message=on_message,
+            on_open=lambda _: None,
+            on_close=on_close,
+            on_error=on_error,
+            debug=debug,
+            metrics=metrics,
+            dispatcher=dispatcher,
+        )
+
+    def create_ws_connection(self):
+        self.ws = None
+
+    def _handle_heartbeat(self):
+        pass
+
+    def read_data(self):
+        started = None
+        first_received = None
+        data = ""
+        for received, op_code, payload in read_frames(self.path):
+            if self.speed:
+                if started is None:
+                    started, first_received = time.monotonic(), received
+                delay = (received - first_received) / self.speed - (time.monotonic() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            frame = _Frame(payload)
+            topic = self._inspect_frame(op_code, frame, received * 1000)
+            self._handle_data(op_code, frame, data, topic)
+            if op_code == ABNF.OPCODE_CLOSE:
+                break
+        self.dispatcher.stop()
+        self._callback(self.on_close)
+
+    def close(self):
+        pass
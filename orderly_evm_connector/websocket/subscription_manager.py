@@ -0,0 +1,203 @@
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from orderly_evm_connector.error import SubscriptionError
+from orderly_evm_connector.lib.constants import (
+    WEBSOCKET_MAX_PENDING_SUBSCRIPTIONS,
+    WEBSOCKET_SUBSCRIBE_ACK_TIMEOUT,
+    WEBSOCKET_SUBSCRIBE_RATE_PER_SECOND,
+)
+from orderly_evm_connector.lib.rate_limit import TokenBucket
+from orderly_evm_connector.lib.utils import orderlyLog
+
+SUBSCRIPTION_EVENTS = ("subscribe", "unsubscribe")
+
+
+class SubscriptionManager(object):
+    """Sends subscribe and unsubscribe frames from a background thread.
+
+    Frames are queued by `submit` and sent back to back, up to
+    `max_in_flight` frames awaiting their acknowledgement and at most
+    `rate` frames per second, so that hundreds of topics are subscribed in a
+    few round trips without flooding the server. Acknowledgements, passed
+    to `ack` by the reader thread, are matched by `id`; a message whose id
+    is missing or already in use gets a unique one. `submit` returns a
+    future resolved with the acknowledgement, or failed with
+    `SubscriptionError` when the server rejects the frame or does not answer
+    within `ack_timeout` seconds.
+
+    `reset(messages)` is called after a reconnect: frames in flight on the
+    old connection are dropped and `messages` are sent again, keeping their
+    ids so that pending futures resolve; the futures of frames that are not
+    resent fail.
+    """
+
+    def __init__(
+        self,
+        send,
+        rate=WEBSOCKET_SUBSCRIBE_RATE_PER_SECOND,
+        max_in_flight=WEBSOCKET_MAX_PENDING_SUBSCRIPTIONS,
+        ack_timeout=WEBSOCKET_SUBSCRIBE_ACK_TIMEOUT,
+        debug=False,
+    ):
+        self.send = send
+        self.max_in_flight = max_in_flight
+        self.ack_timeout = ack_timeout
+        self.logger = orderlyLog(debug=debug)
+        self.acked = 0
+        self.failed = 0
+        self._bucket = TokenBucket(rate) if rate else None
+        self._ids = itertools.count(1)
+        self._queue = deque()
+        self._in_flight = {}
+        self._futures = {}
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="orderly-subscriptions", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pending(self):
+        """Frames queued or awaiting their acknowledgement"""
+        with self._condition:
+            return len(self._queue) + len(self._in_flight)
+
+    def _unique_id(self, message):
+        message_id = message.get("id")
+        if message_id is None or message_id in self._futures:
+            message = dict(message, id="{}-{}".format(message_id or "sub", next(self._ids)))
+        return message
+
+    def submit(self, message):
+        """Queue a subscribe or unsubscribe frame, returns a future of its acknowledgement"""
+        with self._condition:
+            message = self._unique_id(message)
+            future = Future()
+            future.message = message
+            self._futures[message["id"]] = future
+            self._queue.append(message)
+            self._condition.notify_all()
+        return future
+
+    def ack(self, reply):
+        """Match a subscribe or unsubscribe reply from the server to its frame"""
+        with self._condition:
+            entry = self._in_flight.pop(reply.get("id"), None)
+            if entry is None:
+                return
+            future = self._futures.pop(reply.get("id"), None)
+            self._condition.notify_all()
+        if future is None:
+            return
+        if reply.get("success", True):
+            self.acked += 1
+            future.set_result(reply)
+        else:
+            self.failed += 1
+            future.set_exception(
+                SubscriptionError(
+                    entry[0], reply.get("errorMsg") or "rejected", rejected=True
+                )
+            )
+
+    def reset(self, messages=()):
+        """Drop the frames of the previous connection and send `messages` again.
+
+        Returns the futures of `messages`, in order.
+        """
+        messages = list(messages)
+        futures = []
+        resent = {message.get("id") for message in messages}
+        with self._condition:
+            lost = [
+                (message_id, future)
+                for message_id, future in self._futures.items()
+                if message_id not in resent
+            ]
+            for message_id, _ in lost:
+                del self._futures[message_id]
+            self._queue.clear()
+            self._in_flight.clear()
+            for message in messages:
+                future = self._futures.get(message.get("id"))
+                if future is None:
+                    message = self._unique_id(message)
+                    future = Future()
+                    future.message = message
+                    self._futures[message["id"]] = future
+                futures.append(future)
+                self._queue.append(message)
+            self._condition.notify_all()
+        for _, future in lost:
+            self.failed += 1
+            future.set_exception(SubscriptionError(future.message, "connection reset"))
+        return futures
+
+    def future(self, message_id):
+        """Future of a queued or in-flight frame, None once it is answered"""
+        return self._futures.get(message_id)
+
+    def _expire(self, now):
+        # sent_at is None until the frame is on the wire, waiting for the rate limit
+        expired = [
+            (message_id, message)
+            for message_id, (message, sent_at) in self._in_flight.items()
+            if sent_at is not None and now - sent_at > self.ack_timeout
+        ]
+        for message_id, _ in expired:
+            del self._in_flight[message_id]
+        return [
+            (self._futures.pop(message_id, None), message)
+            for message_id, message in expired
+        ]
+
+    def _next_batch(self):
+        """Wait for frames that may be sent now, returns them and the expired futures"""
+        with self._condition:
+            while True:
+                if self._stopped:
+                    return None, []
+                expired = self._expire(time.monotonic())
+                room = self.max_in_flight - len(self._in_flight)
+                if expired or (self._queue and room > 0):
+                    break
+                self._condition.wait(self.ack_timeout / 4)
+            batch = []
+            while self._queue and len(batch) < room:
+                message = self._queue.popleft()
+                self._in_flight[message["id"]] = (message, None)
+                batch.append(message)
+            return batch, expired
+
+    def _run(self):
+        while True:
+            batch, expired = self._next_batch()
+            if batch is None:
+                return
+            for future, message in expired:
+                self.failed += 1
+                if future is not None:
+                    future.set_exception(SubscriptionError(message, "acknowledgement timeout"))
+            for message in batch:
+                if self._bucket is not None:
+                    self._bucket.acquire()
+                try:
+                    self.send(json.dumps(message))
+                except Exception as e:
+                    # The reconnect that follows calls reset, which resends it
+                    self.logger.warning("Failed to send {}: {}".format(message, e))
+                with self._condition:
+                    # Acked already, or dropped by a reset meanwhile
+                    if self._in_flight.get(message["id"], (None,))[0] is message:
+                        self._in_flight[message["id"]] = (message, time.monotonic())
+
+    def close(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
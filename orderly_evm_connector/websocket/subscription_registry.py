@@ -0,0 +1,154 @@
+import json
+import threading
+
+PENDING = "pending"
+ACKED = "acked"
+FAILED = "failed"
+
+
+def subscription_key(message):
+    """Registry key of a subscribe or unsubscribe message: its topic"""
+    topic = message.get("topic")
+    if topic is not None:
+        return topic
+    return json.dumps(
+        {key: value for key, value in message.items() if key not in ("id", "event")},
+        sort_keys=True,
+    )
+
+
+class Subscription(object):
+    __slots__ = ("topic", "message", "state", "future", "rejected")
+
+    def __init__(self, topic, message, future):
+        self.topic = topic
+        self.message = message
+        self.state = PENDING
+        self.future = future
+        # FAILED because the server refused it, not for want of an answer
+        self.rejected = False
+
+    def __repr__(self):
+        return "Subscription(topic={!r}, state={!r})".format(self.topic, self.state)
+
+
+class SubscriptionRegistry(object):
+    """Subscriptions of a websocket connection, keyed by topic.
+
+    Each topic is PENDING until the server acknowledges it, then ACKED, or
+    FAILED when it is rejected or not acknowledged. Subscribing to a topic
+    that is pending or acked sends nothing and returns the same future;
+    a failed topic is sent again. Unsubscribing removes the topic, so
+    `replay` after a reconnect resubscribes every topic but those the
+    server rejected: one that timed out may have been subscribed with a
+    slow acknowledgement. Frames go through a `SubscriptionManager`.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._entries = {}
+        # Reentrant: futures failed by `manager.reset` settle on the calling thread
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, topic):
+        return topic in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def get(self, topic):
+        return self._entries.get(topic)
+
+    def state(self, topic):
+        """State of `topic`, None when it is not subscribed"""
+        entry = self._entries.get(topic)
+        return None if entry is None else entry.state
+
+    def topics(self, state=None):
+        """Subscribed topics, only those in `state` when given"""
+        with self._lock:
+            return [
+                topic
+                for topic, entry in self._entries.items()
+                if state is None or entry.state == state
+            ]
+
+    def _track(self, entry, future):
+        entry.future = future
+        entry.state = PENDING
+        entry.rejected = False
+
+        def settle(future):
+            with self._lock:
+                if self._entries.get(entry.topic) is not entry or entry.future is not future:
+                    return
+                error = future.exception()
+                entry.state = FAILED if error is not None else ACKED
+                entry.rejected = getattr(error, "rejected", False)
+
+        future.add_done_callback(settle)
+
+    def subscribe(self, message):
+        """Subscribe once to the topic of `message`, returns a future of its acknowledgement"""
+        topic = subscription_key(message)
+        with self._lock:
+            entry = self._entries.get(topic)
+            if entry is not None and entry.state != FAILED:
+                return entry.future
+            future = self.manager.submit(message)
+            entry = Subscription(topic, future.message, future)
+            self._entries[topic] = entry
+        self._track(entry, future)
+        return future
+
+    def unsubscribe(self, message):
+        """Remove the topic of `message` and send the unsubscribe frame"""
+        with self._lock:
+            self._entries.pop(subscription_key(message), None)
+            return self.manager.submit(message)
+
+    def replay(self):
+        """Send the topics again after a reconnect, but those the server rejected"""
+        with self._lock:
+            entries = [entry for entry in self._entries.values() if not entry.rejected]
+            futures = self.manager.reset([entry.message for entry in entries])
+            for entry, future in zip(entries, futures):
+                entry.message = future.message
+                entry.future = future
+                entry.state = PENDING
+        for entry, future in zip(entries, futures):
+            self._track(entry, future)
+        return futures
+
+    def diff(self, topics):
+        """Topics to subscribe and to unsubscribe to match the set `topics`.
+
+        Failed topics count as missing and are subscribed again.
+        """
+        topics = set(topics)
+        with self._lock:
+            live = {
+                topic for topic, entry in self._entries.items() if entry.state != FAILED
+            }
+            current = set(self._entries)
+        return topics - live, current - topics
+
+    def sync(self, topics, message_id=None):
+        """Subscribe and unsubscribe so that exactly `topics` are subscribed.
+
+        Returns the futures of the frames sent, keyed by topic.
+        """
+        to_subscribe, to_unsubscribe = self.diff(topics)
+        futures = {}
+        for topic in sorted(to_unsubscribe):
+            futures[topic] = self.unsubscribe(
+                {"id": message_id, "event": "unsubscribe", "topic": topic}
+            )
+        for topic in sorted(to_subscribe):
+            futures[topic] = self.subscribe(
+                {"id": message_id, "event": "subscribe", "topic": topic}
+            )
+        return futures
@@ -1,6 +1,10 @@
 from typing import Optional
 from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
 from orderly_evm_connector.lib.utils import get_endpoints
+from orderly_evm_connector.lib.constants import (
+    WEBSOCKET_MAX_PENDING_SUBSCRIPTIONS,
+    WEBSOCKET_SUBSCRIBE_RATE_PER_SECOND,
+)
 
 class WebsocketPublicAPIClient(OrderlyWebsocketClient):
     def __init__(
@@ -18,6 +22,11 @@ class WebsocketPublicAPIClient(OrderlyWebsocketClient):
         on_open=None,
         on_close=None,
         on_error=None,
+        metrics=None,
+        dispatcher=None,
+        record_path=None,
+        subscribe_rate=WEBSOCKET_SUBSCRIBE_RATE_PER_SECOND,
+        max_pending_subscriptions=WEBSOCKET_MAX_PENDING_SUBSCRIPTIONS,
     ):
         _, self.orderly_websocket_public_endpoint, _ = get_endpoints(orderly_testnet)
         super().__init__(
@@ -32,6 +41,11 @@ class WebsocketPublicAPIClient(OrderlyWebsocketClient):
             timeout=timeout,
             debug=debug,
             proxies=proxies,
+            metrics=metrics,
+            dispatcher=dispatcher,
+            record_path=record_path,
+            subscribe_rate=subscribe_rate,
+            max_pending_subscriptions=max_pending_subscriptions,
         )
 
     # public websocket
@@ -75,6 +89,11 @@ class WebsocketPrivateAPIClient(OrderlyWebsocketClient):
         on_open=None,
         on_close=None,
         on_error=None,
+        metrics=None,
+        dispatcher=None,
+        record_path=None,
+        subscribe_rate=WEBSOCKET_SUBSCRIBE_RATE_PER_SECOND,
+        max_pending_subscriptions=WEBSOCKET_MAX_PENDING_SUBSCRIPTIONS,
     ):
         _, _, self.orderly_websocket_private_endpoint = get_endpoints(orderly_testnet)
         super().__init__(
@@ -91,6 +110,11 @@ class WebsocketPrivateAPIClient(OrderlyWebsocketClient):
             on_open=on_open,
             on_close=on_close,
             on_error=on_error,
+            metrics=metrics,
+            dispatcher=dispatcher,
+            record_path=record_path,
+            subscribe_rate=subscribe_rate,
+            max_pending_subscriptions=max_pending_subscriptions,
         )
 
     # private websocket
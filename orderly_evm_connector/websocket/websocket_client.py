@@ -10,6 +10,12 @@ from orderly_evm_connector.lib.utils import (
     generate_signature,
 )
 from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from orderly_evm_connector.websocket.subscription_manager import SubscriptionManager
+from orderly_evm_connector.websocket.subscription_registry import SubscriptionRegistry
+from orderly_evm_connector.lib.constants import (
+    WEBSOCKET_MAX_PENDING_SUBSCRIPTIONS,
+    WEBSOCKET_SUBSCRIBE_RATE_PER_SECOND,
+)
 
 
 
@@ -29,6 +35,11 @@ class OrderlyWebsocketClient:
         on_open=None,
         on_close=None,
         on_error=None,
+        metrics=None,
+        dispatcher=None,
+        record_path=None,
+        subscribe_rate=WEBSOCKET_SUBSCRIBE_RATE_PER_SECOND,
+        max_pending_subscriptions=WEBSOCKET_MAX_PENDING_SUBSCRIPTIONS,
     ):
         orderly_account_id = (
             orderly_account_id
@@ -43,9 +54,17 @@ class OrderlyWebsocketClient:
         self.private = private
         self.timeout = timeout
         self.logger = orderlyLog(debug=debug)
-        self.subscriptions = []
         self._proxy_params = parse_proxies(proxies) if proxies else {}
         self.auth_params = self._auth_params() if self.private else None
+        # Sends subscribe/unsubscribe frames paced and windowed, matches their acks
+        self.subscription_manager = SubscriptionManager(
+            self.send_frame,
+            rate=subscribe_rate,
+            max_in_flight=max_pending_subscriptions,
+            debug=debug,
+        )
+        # Topic -> subscription state, replayed on reconnect
+        self.subscriptions = SubscriptionRegistry(self.subscription_manager)
         self._initialize_socket(
             self.websocket_url,
             self.wss_id,
@@ -58,6 +77,9 @@ class OrderlyWebsocketClient:
             timeout,
             debug,
             proxies,
+            metrics,
+            dispatcher,
+            record_path,
         )
         self.logger.debug("Orderly WebSocket Client started.")
 
@@ -85,6 +107,9 @@ class OrderlyWebsocketClient:
         timeout,
         debug,
         proxies,
+        metrics=None,
+        dispatcher=None,
+        record_path=None,
     ):
         return OrderlySocketManager(
             websocket_url,
@@ -95,8 +120,16 @@ class OrderlyWebsocketClient:
             timeout=timeout,
             debug=debug,
             proxies=proxies,
+            metrics=metrics,
+            dispatcher=dispatcher,
+            record_path=record_path,
+            on_ack=self.subscription_manager.ack,
         )
 
+    @property
+    def metrics(self):
+        return self.socket_manager.metrics
+
     def on_socket_open(self, socket_manager):
         self.logger.debug("Orderly WebSocket Connection opened. Subscribing...")
         if not hasattr(self, "socket_manager"):
@@ -104,8 +137,8 @@ class OrderlyWebsocketClient:
             self.socket_manager.start()
         if self.private:
             self.auth_login()
-        for message in self.subscriptions:
-            self.socket_manager.send_message(json.dumps(message))
+        # Replayed from the subscription thread, the reader is free to receive data
+        self.subscriptions.replay()
 
     def auth_login(self):
         if not self.socket_manager._login:
@@ -116,6 +149,9 @@ class OrderlyWebsocketClient:
     def send(self, message: dict):
         self.socket_manager.send_message(json.dumps(message))
 
+    def send_frame(self, frame: str):
+        self.socket_manager.send_message(frame)
+
     def send_message_to_server(self, message: dict):
         if self.private:
             self.auth_login()
@@ -126,13 +162,21 @@ class OrderlyWebsocketClient:
             return self.unsubscribe(message)
 
     def subscribe(self, message):
-        if str(message) not in self.subscriptions:
-            self.subscriptions.append(message)
-        self.socket_manager.send_message(json.dumps(message))
+        """Subscribe to the topic of `message` unless it is already pending or acked,
+        returns a future of its acknowledgement"""
+        return self.subscriptions.subscribe(message)
 
     def unsubscribe(self, message):
-        self.socket_manager.send_message(json.dumps(message))
+        """Unsubscribe from the topic of `message`, it is no longer replayed on reconnect"""
+        return self.subscriptions.unsubscribe(message)
+
+    def sync_subscriptions(self, topics):
+        """Subscribe and unsubscribe so that exactly `topics` are subscribed"""
+        if self.private:
+            self.auth_login()
+        return self.subscriptions.sync(topics, message_id=self.wss_id)
 
     def stop(self, id=None):
+        self.subscription_manager.close()
         self.socket_manager.close()
         self.socket_manager.join()
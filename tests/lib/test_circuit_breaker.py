@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from orderly_evm_connector.error import CircuitOpenError, ServerError
+from orderly_evm_connector.lib.circuit_breaker import CLOSED, OPEN, CircuitBreakers
+from orderly_evm_connector.lib.rate_limit import TokenBucket
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+
+ok = {"success": True, "data": {}}
+
+
+def _client(statuses, breakers, delay=0, **kwargs):
+    statuses = list(statuses)
+
+    def handler(method, url, headers, body):
+        time.sleep(delay)
+        return (statuses.pop(0) if statuses else 200), ok
+
+    transport = MockTransport(handler)
+    client = Client(
+        orderly_secret="ed25519:x",
+        transport=transport,
+        circuit_breaker=breakers,
+        **kwargs
+    )
+    return client, transport
+
+
+def test_opens_after_consecutive_failures_then_recovers():
+    breakers = CircuitBreakers(failure_threshold=3, reset_timeout=0.05)
+    client, transport = _client([502, 503, 500], breakers)
+    for _ in range(3):
+        with pytest.raises(ServerError):
+            client.get_all_positions_info()
+    with pytest.raises(CircuitOpenError) as e:
+        client.get_all_positions_info()
+    assert e.value.endpoint == "GET /v1/positions"
+    assert len(transport.requests) == 3
+    # other endpoints are not affected
+    assert client.get_orders() == ok
+    assert breakers.states()["GET /v1/positions"] == OPEN
+
+    time.sleep(0.06)
+    assert client.get_all_positions_info() == ok
+    assert breakers.states()["GET /v1/positions"] == CLOSED
+
+
+def test_failed_trial_reopens():
+    breakers = CircuitBreakers(failure_threshold=1, reset_timeout=0.02)
+    client, _ = _client([502, 502], breakers)
+    with pytest.raises(ServerError):
+        client.get_all_positions_info()
+    time.sleep(0.03)
+    with pytest.raises(ServerError):
+        client.get_all_positions_info()
+    with pytest.raises(CircuitOpenError):
+        client.get_all_positions_info()
+    assert breakers.get("GET /v1/positions").opened == 2
+
+
+def test_latency_spikes_open_the_circuit():
+    breakers = CircuitBreakers(failure_threshold=2, latency_threshold=0.005)
+    client, _ = _client([], breakers, delay=0.01)
+    client.get_all_positions_info()
+    client.get_all_positions_info()
+    with pytest.raises(CircuitOpenError):
+        client.get_all_positions_info()
+
+
+def test_open_circuit_fails_fast_without_rate_limit_tokens():
+    breakers = CircuitBreakers(failure_threshold=1, reset_timeout=5)
+    bucket = TokenBucket(1)
+    client, _ = _client([502], breakers, rate_limits=[bucket])
+    with pytest.raises(ServerError):
+        client.get_all_positions_info()
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        client.get_all_positions_info()
+    assert time.monotonic() - started < 0.5
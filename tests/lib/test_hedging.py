@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from orderly_evm_connector.lib.hedging import Hedger
+from orderly_evm_connector.lib.rate_limit import TokenBucket
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+
+ok = {"success": True, "data": {}}
+
+
+def _client(delays, hedger, statuses=(), **kwargs):
+    delays = list(delays)
+    statuses = list(statuses)
+    lock = threading.Lock()
+
+    def handler(method, url, headers, body):
+        with lock:
+            delay = delays.pop(0) if delays else 0
+            status = statuses.pop(0) if statuses else 200
+        time.sleep(delay)
+        return status, ok
+
+    transport = MockTransport(handler)
+    client = Client(
+        orderly_secret="ed25519:x", transport=transport, hedging=hedger, **kwargs
+    )
+    return client, transport
+
+
+def test_slow_request_is_hedged():
+    hedger = Hedger(default_delay=0.01)
+    client, transport = _client([0.5, 0], hedger)
+    started = time.monotonic()
+    assert client.get_all_positions_info() == ok
+    assert time.monotonic() - started < 0.3
+    assert len(transport.requests) == 2
+    assert hedger.hedged == 1 and hedger.hedge_wins == 1
+
+
+def test_fast_request_and_unlisted_endpoint_are_not_hedged():
+    hedger = Hedger(default_delay=0.05)
+    client, transport = _client([0, 0.1], hedger)
+    client.get_all_positions_info()
+    # GET /v1/client/info is not in HEDGED_ENDPOINTS
+    client.get_account_information()
+    assert len(transport.requests) == 2
+    assert hedger.hedged == 0
+
+
+def test_fast_server_error_does_not_beat_slow_success():
+    hedger = Hedger(default_delay=0.01)
+    client, transport = _client([0.2, 0], hedger, statuses=[200, 503])
+    assert client.get_all_positions_info() == ok
+    assert len(transport.requests) == 2
+    assert hedger.hedged == 1 and hedger.hedge_wins == 0
+
+
+def test_primaries_do_not_wait_for_pool_slots():
+    hedger = Hedger(default_delay=0.05, max_workers=2)
+    client, transport = _client([0.02] * 32, hedger)
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        list(executor.map(lambda _: client.get_all_positions_info(), range(32)))
+    assert len(transport.requests) == 32
+    assert hedger.hedged == 0
+
+
+def test_hedge_takes_a_rate_limit_token():
+    bucket = TokenBucket(rate=1, capacity=10)
+    client, _ = _client([0.2, 0], Hedger(default_delay=0.01), rate_limits=[bucket])
+    client.get_all_positions_info()
+    assert bucket.wait_time(9) > 0 and bucket.wait_time(8) == 0
+
+
+def test_delay_follows_observed_quantile():
+    hedger = Hedger(min_samples=5, default_delay=1.0)
+    for _ in range(10):
+        hedger._observe("GET /v1/positions", 0.003)
+    assert hedger.delay("GET /v1/positions") == 0.005
+    assert hedger.delay("GET /v1/orders") == 1.0
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from orderly_evm_connector.error import ClientError
+from orderly_evm_connector.lib.json_stream import iter_json_array
+from orderly_evm_connector.lib.models import Order
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+
+rows = [
+    {"order_id": 1, "symbol": "PERP_ETH_USDC", "price": 1500.25, "rows": [9]},
+    {"order_id": 22, "symbol": "PERP_BTC_USDC", "price": 123456789, "note": "é ✓"},
+]
+page = {
+    "success": True,
+    "data": {"meta": {"total": 2, "rows": "not these"}, "rows": rows},
+    "timestamp": 1700000000000,
+}
+
+
+def _chunks(document, size):
+    body = json.dumps(document, ensure_ascii=False, indent=1).encode("utf-8")
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 100000])
+def test_rows_are_parsed_across_chunk_boundaries(size):
+    assert list(iter_json_array(_chunks(page, size))) == rows
+
+
+def test_missing_empty_and_truncated():
+    assert list(iter_json_array([b'{"success": true, "data": {"rows": []}}'])) == []
+    assert list(iter_json_array([b'{"success": true, "data": {}}'])) == []
+    assert list(iter_json_array([b'{"success": true, "data": null}'])) == []
+    stream = iter_json_array([b'{"data": {"rows": [{"a": 1}, {"a"'])
+    assert next(stream) == {"a": 1}
+    with pytest.raises(ValueError):
+        next(stream)
+
+
+def test_client_streams_rows():
+    transport = MockTransport(lambda *_: (200, page))
+    client = Client(orderly_secret="ed25519:x", transport=transport)
+    stream = client.stream_rows("get_orders", symbol="PERP_ETH_USDC")
+    assert len(transport.requests) == 1
+    assert "orderly-signature" in transport.requests[0][2]
+    assert list(stream) == rows
+
+    client.compact_rows = "records"
+    assert [type(row) for row in client.stream_rows(client.get_orders)] == [Order, Order]
+    client.compact_rows = None
+    assert client.get_orders() == page
+
+
+def test_stream_errors_are_raised_at_call():
+    transport = MockTransport(
+        lambda *_: (403, {"success": False, "code": -1001, "message": "denied"})
+    )
+    client = Client(orderly_secret="ed25519:x", transport=transport)
+    with pytest.raises(ClientError):
+        client.stream_rows("get_trades")
+
+
+def test_stream_from_mock_server():
+    from orderly_evm_connector.lib.mock_server import (
+        MockOrderlyServer,
+        generate_orderly_key_pair,
+    )
+
+    orderly_key, orderly_secret = generate_orderly_key_pair()
+    with MockOrderlyServer(websocket=False) as server:
+        client = Client(
+            orderly_key=orderly_key,
+            orderly_secret=orderly_secret,
+            orderly_account_id="0xaccount",
+        )
+        client.orderly_endpoint = server.rest_url
+        for i in range(3):
+            client.create_order(
+                symbol="PERP_ETH_USDC",
+                order_type="LIMIT",
+                side="BUY",
+                order_price=1000 + i,
+                order_quantity=0.1,
+            )
+        streamed = list(client.stream_rows("get_orders", symbol="PERP_ETH_USDC"))
+        assert streamed == client.get_orders(symbol="PERP_ETH_USDC")["data"]["rows"]
+        assert len(streamed) == 3
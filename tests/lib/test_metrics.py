@@ -0,0 +1,77 @@
+import pytest
+
+from orderly_evm_connector.error import ClientError
+from orderly_evm_connector.lib.metrics import LatencyHistogram, RestMetrics, endpoint_name
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import random_str
+
+orderly_key = random_str()
+orderly_secret = "ed25519:" + random_str()
+
+
+def test_endpoint_name_bounds_labels():
+    assert endpoint_name("GET", "/v1/order/12345") == "GET /v1/order/:id"
+    assert endpoint_name("GET", "/v1/position/PERP_NEAR_USDC") == "GET /v1/position/:symbol"
+    assert endpoint_name("DELETE", "/v1/orders?symbol=PERP_NEAR_USDC") == "DELETE /v1/orders"
+    assert (
+        endpoint_name("GET", "/v1/client/order/my-order-x")
+        == "GET /v1/client/order/:client_order_id"
+    )
+    assert (
+        endpoint_name("GET", "/v1/algo/client/order/tp-sl")
+        == "GET /v1/algo/client/order/:client_order_id"
+    )
+    assert endpoint_name("GET", "/v1/order/42/trades") == "GET /v1/order/:id/trades"
+    assert endpoint_name("GET", "/v1/client/holding") == "GET /v1/client/holding"
+
+
+def test_latency_histogram_quantiles():
+    histogram = LatencyHistogram()
+    for _ in range(99):
+        histogram.observe(0.0008)
+    histogram.observe(0.3)
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == 0.001
+    assert histogram.quantile(1.0) == 0.5
+
+
+def test_rest_calls_are_instrumented():
+    responses = iter(
+        [
+            (200, {"success": True}),
+            (429, {"code": -1003, "message": "rate limit"}),
+            (200, {"success": True}),
+        ]
+    )
+    transport = MockTransport(lambda method, url, headers, body: next(responses))
+    metrics = RestMetrics()
+    client = Client(
+        orderly_key=orderly_key,
+        orderly_secret=orderly_secret,
+        transport=transport,
+        metrics=metrics,
+    )
+    client.get_all_positions_info()
+    with pytest.raises(ClientError):
+        client.get_all_positions_info()
+
+    snapshot = metrics.snapshot()["GET /v1/positions"]
+    assert set(snapshot["latency"]) == {"serialize", "sign", "network", "decode", "total"}
+    assert snapshot["latency"]["network"]["count"] == 2
+    assert snapshot["status"] == {200: 1, 429: 1}
+    assert snapshot["rate_limited"] == 1
+
+    client.get_registration_nonce()
+    public = metrics.snapshot()["GET /v1/registration_nonce"]["latency"]
+    assert set(public) == {"serialize", "network", "decode", "total"}
+
+    exported = metrics.to_prometheus()
+    assert 'orderly_rest_rate_limited_total{endpoint="GET /v1/positions"} 1' in exported
+    assert 'stage="network",le="+Inf"} 2' in exported
+
+
+def test_metrics_disabled_by_default():
+    client = Client(transport=MockTransport())
+    client.get_system_maintenance_status()
+    assert client.metrics is None
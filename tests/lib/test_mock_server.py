@@ -0,0 +1,117 @@
+import json
+import threading
+
+import pytest
+
+from orderly_evm_connector.error import ClientError
+from orderly_evm_connector.lib.mock_server import (
+    MockOrderlyServer,
+    generate_orderly_key_pair,
+)
+from orderly_evm_connector.rest import Rest
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+
+
+@pytest.fixture
+def server():
+    with MockOrderlyServer(ping_interval=None) as server:
+        yield server
+
+
+def _client(server, orderly_secret=None):
+    orderly_key, secret = generate_orderly_key_pair()
+    client = Rest(
+        orderly_key=orderly_key,
+        orderly_secret=orderly_secret or secret,
+        orderly_account_id="0xaccount",
+    )
+    client.orderly_endpoint = server.rest_url
+    return client
+
+
+def test_signed_order_round_trip(server):
+    client = _client(server)
+    response = client.create_order(
+        symbol="PERP_ETH_USDC",
+        order_type="LIMIT",
+        side="BUY",
+        order_price=1500,
+        order_quantity=0.1,
+        client_order_id="mock_1",
+    )
+    order_id = response["data"]["order_id"]
+    rows = client.get_orders(symbol="PERP_ETH_USDC")["data"]["rows"]
+    assert [row["order_id"] for row in rows] == [order_id]
+
+    client.cancel_order(order_id=order_id, symbol="PERP_ETH_USDC")
+    assert server.orders[order_id]["status"] == "CANCELLED"
+
+
+def test_market_order_moves_position(server):
+    client = _client(server)
+    client.create_order(
+        symbol="PERP_ETH_USDC", order_type="MARKET", side="SELL", order_quantity=0.5
+    )
+    rows = client.get_all_positions_info()["data"]["rows"]
+    assert rows == [{"symbol": "PERP_ETH_USDC", "position_qty": -0.5}]
+
+
+def test_wrong_signature_is_rejected(server):
+    _, other_secret = generate_orderly_key_pair()
+    client = _client(server, orderly_secret=other_secret)
+    with pytest.raises(ClientError) as e:
+        client.get_orders()
+    assert e.value.status_code == 401
+
+
+def test_rate_limit():
+    with MockOrderlyServer(rate_limit=2, websocket=False) as server:
+        client = _client(server)
+        client.get_orders()
+        client.get_orders()
+        with pytest.raises(ClientError) as e:
+            client.get_orders()
+    assert e.value.status_code == 429
+    assert server.rate_limited == 1
+
+
+def test_websocket_auth_subscribe_and_publish(server):
+    orderly_key, orderly_secret = generate_orderly_key_pair()
+    received = []
+    reported = threading.Event()
+
+    def on_message(_, message):
+        received.append(json.loads(message))
+        if received[-1].get("topic") == "executionreport":
+            reported.set()
+
+    ws = OrderlyWebsocketClient(
+        server.ws_private_url,
+        orderly_key=orderly_key,
+        orderly_secret=orderly_secret,
+        private=True,
+        on_message=on_message,
+    )
+    ws.subscribe({"id": "1", "event": "subscribe", "topic": "executionreport"})
+
+    client = Rest(
+        orderly_key=orderly_key,
+        orderly_secret=orderly_secret,
+        orderly_account_id="0xaccount",
+    )
+    client.orderly_endpoint = server.rest_url
+    client.create_order(
+        symbol="PERP_ETH_USDC", order_type="LIMIT", side="BUY", order_price=1500, order_quantity=0.1
+    )
+    assert reported.wait(5)
+    ws.stop()
+
+    assert received[0]["event"] == "auth" and received[0]["success"]
+    assert received[1] == {
+        "id": "1",
+        "event": "subscribe",
+        "ts": received[1]["ts"],
+        "success": True,
+        "data": "executionreport",
+    }
+    assert received[2]["data"]["status"] == "NEW"
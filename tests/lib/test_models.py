@@ -0,0 +1,68 @@
+import sys
+from array import array
+
+from orderly_evm_connector.lib.models import AssetHistory, Order, RowTable, compact_rows
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+
+
+def _row(index):
+    return {
+        "order_id": 100 + index,
+        "symbol": "PERP_ETH_USDC",
+        "side": "BUY",
+        "price": 1500.5,
+        "quantity": 0.1,
+        "amount": None,
+        "created_time": 1700000000000 + index,
+    }
+
+
+def _page(rows):
+    return {"success": True, "data": {"meta": {"total": len(rows)}, "rows": rows}}
+
+
+def test_records_read_like_rows():
+    row = dict(_row(0), order_tag="mm")
+    order = Order.from_row(row)
+    assert order.order_id == 100 and order["symbol"] == "PERP_ETH_USDC"
+    assert order.status is None
+    assert order["order_tag"] == "mm" and "order_tag" in order
+    assert order.get("missing", 1) == 1
+    assert order == dict.fromkeys(Order._fields) | row
+    assert not hasattr(order, "__dict__")
+    assert sys.getsizeof(Order.from_row(_row(0))) < sys.getsizeof(_row(0))
+
+
+def test_row_table_is_columnar():
+    table = RowTable([_row(0), _row(1), {"order_id": 102, "symbol": "PERP_BTC_USDC"}])
+    assert len(table) == 3
+    assert table.column("order_id") == array("q", [100, 101, 102])
+    assert table.column("price") == [1500.5, 1500.5, None]
+    assert table[1].created_time == 1700000000001
+    assert table[-1].symbol == "PERP_BTC_USDC" and table[-1].price is None
+    assert [row["order_id"] for row in table] == [100, 101, 102]
+    assert table[0] == _row(0)
+    assert table.to_dicts()[2]["quantity"] is None
+
+
+def test_client_compacts_mapped_endpoints():
+    page = _page([_row(0), _row(1)])
+    transport = MockTransport(lambda *_: (200, page))
+    client = Client(orderly_secret="ed25519:x", transport=transport, compact_rows="records")
+    rows = client.get_orders(symbol="PERP_ETH_USDC")["data"]["rows"]
+    assert [type(row) for row in rows] == [Order, Order]
+    assert isinstance(client.get_asset_history(token="USDC")["data"]["rows"][0], AssetHistory)
+    assert isinstance(client.get_user_fee_tier()["data"]["rows"][0], dict)
+
+    client.compact_rows = "table"
+    rows = client.get_user_fee_tier()["data"]["rows"]
+    assert isinstance(rows, RowTable) and rows[0].order_id == 100
+
+
+def test_compact_rows_leaves_other_responses():
+    assert compact_rows({"success": True, "data": {"status": "ok"}}) == {
+        "success": True,
+        "data": {"status": "ok"},
+    }
+    assert compact_rows("text", "table") == "text"
@@ -0,0 +1,24 @@
+import time
+
+from orderly_evm_connector.lib.rate_limit import TokenBucket
+
+
+def test_burst_then_refill():
+    bucket = TokenBucket(rate=100, capacity=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert 0 < bucket.wait_time() <= 0.01
+    time.sleep(0.02)
+    assert bucket.try_acquire()
+
+
+def test_acquire_waits_and_times_out():
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.acquire()
+    started = time.monotonic()
+    assert bucket.acquire()
+    assert time.monotonic() - started >= 0.015
+    empty = TokenBucket(rate=1, capacity=1)
+    empty.acquire()
+    assert not empty.acquire(timeout=0.01)
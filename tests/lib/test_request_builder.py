@@ -0,0 +1,50 @@
+from orderly_evm_connector.lib.mock_server import generate_orderly_key_pair, verify_signature
+from orderly_evm_connector.lib.request_builder import build_request, encode_query
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+
+
+def test_encode_query_is_canonical():
+    query = encode_query(
+        {"symbol": "PERP_ETH_USDC", "status": None, "end_t": 2, "address": "a b&c", "reduce_only": True}
+    )
+    assert query == "address=a%20b%26c&end_t=2&reduce_only=true&symbol=PERP_ETH_USDC"
+    assert encode_query({"order_ids": [1, 2, 3]}) == "order_ids=1,2,3"
+
+
+def test_get_request_signs_the_sent_path():
+    request = build_request("GET", "/v1/orders", {"size": 10, "symbol": "PERP_ETH_USDC", "page": None})
+    assert request.path == "/v1/orders?size=10&symbol=PERP_ETH_USDC"
+    assert request.body == b""
+    assert request.signing_string == "GET/v1/orders?size=10&symbol=PERP_ETH_USDC"
+
+
+def test_embedded_query_is_merged():
+    request = build_request("DELETE", "/v1/algo/order?symbol=PERP_ETH_USDC&order_id=1")
+    assert request.path == "/v1/algo/order?order_id=1&symbol=PERP_ETH_USDC"
+
+
+def test_post_request_body():
+    request = build_request("POST", "/v1/order", {"symbol": "PERP_ETH_USDC", "order_tag": None})
+    assert request.body == b'{"symbol": "PERP_ETH_USDC"}'
+    assert request.signing_string == 'POST/v1/order{"symbol": "PERP_ETH_USDC"}'
+
+
+def test_cancel_algo_order_is_signed_with_encoded_query():
+    orderly_key, orderly_secret = generate_orderly_key_pair()
+    transport = MockTransport()
+    client = Client(orderly_key=orderly_key, orderly_secret=orderly_secret, transport=transport)
+    client.cancel_algo_order(order_id=7, symbol="PERP_ETH_USDC")
+    _, url, headers, _ = transport.requests[0]
+    path = "/v1/algo/order?order_id=7&symbol=PERP_ETH_USDC"
+    assert url.endswith(path)
+    message = f"{headers['orderly-timestamp']}DELETE{path}"
+    assert verify_signature(orderly_key, message, headers["orderly-signature"])
+
+
+def test_public_request_query():
+    transport = MockTransport()
+    Client(transport=transport).check_ref_code(account_id="0x1 2")
+    assert transport.requests[0][1].endswith(
+        "/v1/public/referral/check_ref_code?account_id=0x1%202"
+    )
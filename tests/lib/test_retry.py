@@ -0,0 +1,94 @@
+import pytest
+import requests
+
+from orderly_evm_connector.error import ClientError, ServerError
+from orderly_evm_connector.lib.retry import RetryPolicy, retry_after
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+
+ok = {"success": True, "data": {}}
+policy = RetryPolicy(max_retries=2, backoff=0.001)
+
+
+def _failing_transport(*failures):
+    """Answer each failure in turn (a status code or an exception), then 200"""
+    failures = list(failures)
+
+    def handler(method, url, headers, body):
+        if failures:
+            failure = failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure, {"success": False, "code": -1, "message": "failed"}
+        return 200, ok
+
+    return MockTransport(handler)
+
+
+def _client(transport):
+    return Client(
+        orderly_secret="ed25519:x", transport=transport, retry_policy=policy, metrics=True
+    )
+
+
+def test_get_is_retried_and_counted():
+    transport = _failing_transport(502, requests.exceptions.Timeout())
+    client = _client(transport)
+    assert client.get_all_positions_info() == ok
+    assert len(transport.requests) == 3
+    assert client.metrics.snapshot()["GET /v1/positions"]["retries"] == 2
+
+
+def test_stage_latency_excludes_earlier_attempts():
+    slow_policy = RetryPolicy(max_retries=1)
+    slow_policy.backoff_delay = lambda attempt: 0.2
+    client = Client(
+        orderly_secret="ed25519:x",
+        transport=_failing_transport(502),
+        retry_policy=slow_policy,
+        metrics=True,
+    )
+    client.get_all_positions_info()
+    serialize = client.metrics.latency("GET /v1/positions", "serialize")
+    total = client.metrics.latency("GET /v1/positions", "total")
+    assert serialize.count == 1 and serialize.sum < 0.1
+    assert total.count == 1 and total.sum < 0.1
+
+
+def test_retries_are_bounded():
+    transport = _failing_transport(503, 503, 503, 503)
+    with pytest.raises(ServerError):
+        _client(transport).get_all_positions_info()
+    assert len(transport.requests) == 3
+
+
+def test_client_errors_are_not_retried():
+    transport = _failing_transport(403)
+    with pytest.raises(ClientError):
+        _client(transport).get_all_positions_info()
+    assert len(transport.requests) == 1
+
+
+def test_orders_are_retried_only_with_client_order_id():
+    order = {"symbol": "PERP_NEAR_USDC", "order_type": "MARKET", "side": "BUY", "order_quantity": 1}
+    transport = _failing_transport(502)
+    with pytest.raises(ServerError):
+        _client(transport).create_order(**order)
+    assert len(transport.requests) == 1
+
+    transport = _failing_transport(502)
+    assert _client(transport).create_order(client_order_id="retry_1", **order) == ok
+    assert len(transport.requests) == 2
+    assert transport.requests[0][3] == transport.requests[1][3]
+
+
+def test_retry_after_header():
+    assert retry_after({"Retry-After": "2"}) == 2.0
+    assert retry_after({}) is None
+    assert retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+
+    error = ClientError(429, -1003, "Rate limit exceed.", {"Retry-After": "0.5"})
+    assert 0.5 <= policy.retry_delay(0, error) <= 0.5 + policy.backoff
+    error = ClientError(429, -1003, "Rate limit exceed.", {"Retry-After": "120"})
+    assert policy.retry_delay(0, error) is None
+    assert policy.retry_delay(0, error, idempotent=False) is None
@@ -0,0 +1,113 @@
+import asyncio
+import os
+
+import pytest
+
+from orderly_evm_connector.lib.mock_server import (
+    generate_orderly_key_pair,
+    verify_signature,
+)
+from orderly_evm_connector.lib.signing_service import SigningService
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.lib.utils import (
+    generate_wallet_signature,
+    load_wallet_account,
+)
+from orderly_evm_connector.rest import Rest as Client
+
+orderly_key, orderly_secret = generate_orderly_key_pair()
+wallet_secret = os.urandom(32).hex()
+registration = {
+    "domain": {
+        "name": "Orderly",
+        "version": "1",
+        "chainId": 421614,
+        "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
+    },
+    "message": {"brokerId": "woofi_pro", "chainId": 421614, "timestamp": 1700000000000},
+    "primaryType": "Registration",
+    "types": {
+        "EIP712Domain": [
+            {"name": "name", "type": "string"},
+            {"name": "version", "type": "string"},
+            {"name": "chainId", "type": "uint256"},
+            {"name": "verifyingContract", "type": "address"},
+        ],
+        "Registration": [
+            {"name": "brokerId", "type": "string"},
+            {"name": "chainId", "type": "uint256"},
+            {"name": "timestamp", "type": "uint64"},
+        ],
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def service():
+    with SigningService(
+        max_workers=2, orderly_secrets=[orderly_secret], wallet_secrets=[wallet_secret]
+    ) as service:
+        yield service
+
+
+def test_sign_and_batch(service):
+    timestamp, signature = service.sign(orderly_secret, "GET/v1/positions").result()
+    assert verify_signature(orderly_key, timestamp + "GET/v1/positions", signature)
+
+    messages = ["GET/v1/order/{}".format(i) for i in range(5)]
+    results = service.sign_batch((orderly_secret, m) for m in messages).result()
+    assert len(results) == 5
+    for message, (timestamp, signature) in zip(messages, results):
+        assert verify_signature(orderly_key, timestamp + message, signature)
+    assert service.sign_batch([]).result() == []
+
+
+def test_workers_are_not_forked(service):
+    assert service._executor._mp_context.get_start_method() != "fork"
+
+
+def test_wallet_and_async(service):
+    expected = generate_wallet_signature(wallet_secret, registration)
+    assert service.sign_wallet(wallet_secret, registration).result() == expected
+
+    async def sign_both():
+        return await asyncio.gather(
+            service.sign_wallet_async(wallet_secret, registration),
+            service.sign_async(orderly_secret, "x"),
+        )
+
+    wallet_signature, (timestamp, signature) = asyncio.run(sign_both())
+    assert wallet_signature == expected
+    assert verify_signature(orderly_key, timestamp + "x", signature)
+
+
+def test_client_signs_through_service(service):
+    transport = MockTransport(lambda *_: (200, {"success": True, "data": {}}))
+    client = Client(
+        orderly_key=orderly_key,
+        orderly_secret=orderly_secret,
+        orderly_account_id="0xaaa",
+        transport=transport,
+        signing_service=service,
+    )
+    client.get_all_positions_info()
+    headers = transport.requests[0][2]
+    assert verify_signature(
+        orderly_key,
+        headers["orderly-timestamp"] + "GET/v1/positions",
+        headers["orderly-signature"],
+    )
+
+    client = Client(orderly_secret="ed25519:x", transport=transport, signing_service=service)
+    client.get_all_positions_info()
+    assert transport.requests[1][2]["orderly-signature"] == "mock_signature"
+
+
+def test_wallet_account_is_kept_by_the_client():
+    client = Client(wallet_secret=wallet_secret, transport=MockTransport(None))
+    account = client.wallet_account
+    expected = generate_wallet_signature(wallet_secret, registration)
+    assert client.get_wallet_signature(registration) == expected
+    assert client.wallet_account is account
+    # No process-wide cache outliving the client
+    assert not hasattr(load_wallet_account, "cache_info")
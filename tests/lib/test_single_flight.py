@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from orderly_evm_connector.error import ServerError
+from orderly_evm_connector.lib.single_flight import SingleFlight
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+
+positions = {"success": True, "data": {"rows": []}}
+
+
+def _blocking_transport(release, status_code=200):
+    def handler(method, url, headers, body):
+        release.wait(5)
+        return status_code, positions
+
+    return MockTransport(handler)
+
+
+def _wait_for_waiters(single_flight, count):
+    while single_flight.shared < count:
+        time.sleep(0.001)
+
+
+def test_identical_gets_share_one_call():
+    release = threading.Event()
+    transport = _blocking_transport(release)
+    client = Client(orderly_secret="ed25519:x", transport=transport, coalesce_requests=True)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(client.get_all_positions_info) for _ in range(8)]
+        _wait_for_waiters(client.single_flight, 7)
+        release.set()
+        results = [future.result() for future in futures]
+    assert len(transport.requests) == 1
+    assert all(result is results[0] for result in results)
+    assert client.single_flight.in_flight == 0
+
+
+def test_different_params_and_writes_are_not_coalesced():
+    transport = MockTransport(lambda *_: (200, positions))
+    client = Client(orderly_secret="ed25519:x", transport=transport, coalesce_requests=True)
+    client.get_orders(symbol="PERP_ETH_USDC")
+    client.get_orders(symbol="PERP_BTC_USDC")
+    client.cancel_orders(symbol="PERP_ETH_USDC")
+    assert len(transport.requests) == 3
+    assert client.single_flight.shared == 0
+
+
+def test_errors_are_shared():
+    release = threading.Event()
+    transport = _blocking_transport(release, status_code=502)
+    client = Client(transport=transport, coalesce_requests=True)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(client.get_system_maintenance_status) for _ in range(3)]
+        _wait_for_waiters(client.single_flight, 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(ServerError):
+                future.result()
+    assert len(transport.requests) == 1
+
+
+def test_single_flight_forgets_completed_calls():
+    single_flight = SingleFlight()
+    assert single_flight.do("key", lambda: 1) == 1
+    assert single_flight.do("key", lambda: 2) == 2
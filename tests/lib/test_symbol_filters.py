@@ -0,0 +1,125 @@
+from decimal import Decimal
+
+import pytest
+import responses
+
+from orderly_evm_connector.error import OrderFilterError
+from orderly_evm_connector.lib.symbol_filters import SymbolFilters
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import mock_http_response, random_str
+
+orderly_key = random_str()
+orderly_secret = "ed25519:" + random_str()
+
+available_symbols = {
+    "success": True,
+    "data": {
+        "rows": [
+            {
+                "symbol": "PERP_NEAR_USDC",
+                "quote_min": 0,
+                "quote_max": 100,
+                "quote_tick": 0.001,
+                "base_min": 1,
+                "base_max": 10000,
+                "base_tick": 1,
+                "min_notional": 10,
+                "price_range": 0.03,
+            }
+        ]
+    },
+}
+
+
+def test_reject_off_tick_price():
+    filters = SymbolFilters.from_response(available_symbols)
+    with pytest.raises(OrderFilterError):
+        filters.check_order("PERP_NEAR_USDC", "LIMIT", "BUY", 1.2345, 10)
+
+
+def test_reject_mode_accepts_large_values_on_tick():
+    filters = SymbolFilters.from_response(
+        {"symbol": "S", "quote_tick": 0.01, "base_tick": 0.001}
+    )
+    assert filters.check_order("S", "LIMIT", "BUY", 1234567.89, 98765.432) == (
+        1234567.89,
+        98765.432,
+    )
+    with pytest.raises(OrderFilterError):
+        filters.check_order("S", "LIMIT", "BUY", 1234567.891, 1)
+
+
+def test_reject_below_min_notional():
+    filters = SymbolFilters.from_response(available_symbols)
+    with pytest.raises(OrderFilterError):
+        filters.check_order("PERP_NEAR_USDC", "LIMIT", "BUY", 1.5, 5)
+
+
+def test_reject_outside_price_range():
+    filters = SymbolFilters.from_response(available_symbols)
+    filters.set_reference_price("PERP_NEAR_USDC", 2.0)
+    with pytest.raises(OrderFilterError):
+        filters.check_order("PERP_NEAR_USDC", "LIMIT", "BUY", 2.5, 10)
+    filters.check_order("PERP_NEAR_USDC", "LIMIT", "SELL", 2.5, 10)
+
+
+def test_round_mode():
+    filters = SymbolFilters.from_response(available_symbols, mode="round")
+    price, quantity = filters.check_order(
+        "PERP_NEAR_USDC", "LIMIT", "BUY", 1.2346, 10.7
+    )
+    assert price == 1.235
+    assert quantity == 10
+
+
+def test_round_mode_rejects_quantity_below_base_min():
+    filters = SymbolFilters.from_response(available_symbols, mode="round")
+    with pytest.raises(OrderFilterError):
+        filters.check_order("PERP_NEAR_USDC", "LIMIT", "BUY", 20, 0.5)
+
+
+def test_round_mode_floors_from_base_min():
+    response = {"symbol": "S", "base_min": 0.15, "base_tick": 0.1}
+    rounding = SymbolFilters.from_response(response, mode="round")
+    assert rounding.check_order("S", "MARKET", "BUY", None, 0.37) == (None, 0.35)
+    assert SymbolFilters.from_response(response).check_order(
+        "S", "MARKET", "BUY", None, 0.35
+    ) == (None, 0.35)
+
+
+def test_round_mode_adds_no_keys():
+    filters = SymbolFilters.from_response(available_symbols, mode="round")
+    order = {"symbol": "PERP_NEAR_USDC", "order_type": "MARKET", "side": "BUY"}
+    assert filters.check_order_dict(dict(order, order_quantity=10.7)) == dict(
+        order, order_quantity=10
+    )
+
+
+def test_reject_mode_keeps_value_types():
+    filters = SymbolFilters.from_response(available_symbols)
+    assert filters.check_order("PERP_NEAR_USDC", "LIMIT", "BUY", "1.5", Decimal("10")) == (
+        "1.5",
+        Decimal("10"),
+    )
+
+
+def test_unknown_symbol_passes_through():
+    filters = SymbolFilters.from_response(available_symbols)
+    assert filters.check_order("PERP_ETH_USDC", "LIMIT", "BUY", 1.2345, 0.1) == (
+        1.2345,
+        0.1,
+    )
+
+
+@mock_http_response(responses.GET, "/v1/public/info", available_symbols, 200)
+def test_create_order_rejected_locally():
+    client = Client(orderly_key=orderly_key, orderly_secret=orderly_secret)
+    client.load_symbol_filters()
+    with pytest.raises(OrderFilterError):
+        client.create_order(
+            symbol="PERP_NEAR_USDC",
+            order_type="LIMIT",
+            side="BUY",
+            order_price=1.2345,
+            order_quantity=10,
+        )
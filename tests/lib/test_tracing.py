@@ -0,0 +1,39 @@
+import logging
+
+from orderly_evm_connector.lib.tracing import Tracer
+
+
+class _Unformattable(object):
+    def __str__(self):
+        raise AssertionError("formatted while tracing is disabled")
+
+
+def test_trace_does_no_work_when_disabled():
+    logger = logging.getLogger("orderly_test_tracing_disabled")
+    logger.setLevel(logging.INFO)
+    tracer = Tracer(logger)
+    assert not tracer.enabled
+    tracer.trace("response", body=_Unformattable())
+
+
+def test_trace_redacts_and_samples(caplog):
+    logger = logging.getLogger("orderly_test_tracing_enabled")
+    logger.setLevel(logging.DEBUG)
+    tracer = Tracer(logger, max_payload=32)
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        tracer.trace("signed", headers={"orderly-key": "k", "orderly-signature": "secret"})
+        tracer.trace("ws_send", frame='{"event": "auth", "params": {"sign": "secret"}}')
+        tracer.trace("response", body=b"x" * 100)
+    signed, sent, response = [record.getMessage() for record in caplog.records]
+    assert "secret" not in signed and "'orderly-key': 'k'" in signed
+    assert "secret" not in sent
+    assert response.endswith("x" * 32 + "...(100 bytes)")
+
+
+def test_secret_cut_by_sampling_is_redacted(caplog):
+    logger = logging.getLogger("orderly_test_tracing_cut")
+    logger.setLevel(logging.DEBUG)
+    tracer = Tracer(logger, max_payload=24)
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        tracer.trace("request", body=b'{"signature": "abcdefghijklmnopqrstuvwxyz"}')
+    assert "abcdef" not in caplog.records[0].getMessage()
@@ -0,0 +1,161 @@
+import json
+import time
+
+import pytest
+import requests
+import responses
+
+from orderly_evm_connector.api import API
+from orderly_evm_connector.lib.mock_server import (
+    MockOrderlyServer,
+    generate_orderly_key_pair,
+    verify_signature,
+)
+from orderly_evm_connector.lib.transport import (
+    HttpxTransport,
+    KeepAlivePinger,
+    MockTransport,
+    RequestsTransport,
+)
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import mock_http_response, random_str
+
+orderly_key = random_str()
+orderly_secret = "ed25519:" + random_str()
+mock_item = {"key_1": "value_1", "key_2": "value_2"}
+
+
+def test_default_transport_is_requests_session():
+    client = API()
+    assert isinstance(client.transport, RequestsTransport)
+    assert isinstance(client.session, requests.Session)
+    assert client.session.headers["Content-Type"] == "application/json;charset=utf-8"
+
+
+def test_requests_transport_pool_size():
+    transport = RequestsTransport(pool_maxsize=32, keep_alive=False)
+    adapter = transport.session.get_adapter("https://api-evm.orderly.org")
+    assert adapter._pool_maxsize == 32
+    assert transport.headers["Connection"] == "close"
+
+
+@mock_http_response(responses.GET, "/v1/positions", mock_item, 200)
+def test_signed_headers_are_not_stored_on_session():
+    client = Client(orderly_key=orderly_key, orderly_secret=orderly_secret)
+    assert client.get_all_positions_info() == mock_item
+    assert "orderly-signature" not in client.session.headers
+    request = responses.calls[0].request
+    assert "orderly-signature" in request.headers
+    assert request.headers["Content-Type"].startswith("application/x-www-form-urlencoded")
+
+
+def test_mock_transport_records_requests():
+    transport = MockTransport(lambda method, url, headers, body: (200, mock_item))
+    client = Client(
+        orderly_key=orderly_key, orderly_secret=orderly_secret, transport=transport
+    )
+    response = client.create_order(
+        symbol="PERP_NEAR_USDC", order_type="MARKET", side="BUY", order_quantity=1
+    )
+    assert response == mock_item
+    method, url, headers, _ = transport.requests[0]
+    assert method == "POST"
+    assert url.endswith("/v1/order")
+    assert headers["Content-Type"] == "application/json;charset=utf-8"
+    assert headers["orderly-key"] == orderly_key
+
+
+def test_prewarm_connections_at_construction():
+    transport = MockTransport()
+    API(transport=transport, prewarm_connections=3)
+    assert len(transport.requests) == 3
+    assert all(url.endswith("/v1/public/system_info") for _, url, _, _ in transport.requests)
+
+
+def test_warmup_uses_client_timeout_and_proxies():
+    sent = []
+
+    class Recording(MockTransport):
+        def request(self, method, url, timeout=None, proxies=None, **kwargs):
+            sent.append((timeout, proxies))
+            return super().request(method, url, **kwargs)
+
+    proxies = {"https": "http://proxy:3128"}
+    API(transport=Recording(), proxies=proxies, timeout=3, prewarm_connections=1)
+    API(transport=Recording(), prewarm_connections=1)
+    assert sent == [(3, proxies), (5, None)]
+
+
+def test_keepalive_pings_time_out():
+    sent = []
+
+    class Recording(MockTransport):
+        def request(self, method, url, timeout=None, proxies=None, **kwargs):
+            sent.append(timeout)
+            return super().request(method, url, **kwargs)
+
+    pinger = KeepAlivePinger(Recording(), "http://orderly", interval=0.01)
+    pinger.start()
+    time.sleep(0.05)
+    pinger.stop()
+    assert sent and set(sent) == {2}
+
+
+def test_httpx_transport():
+    httpx = pytest.importorskip("httpx")
+    transport = HttpxTransport(proxies={"https": "http://proxy:3128"})
+    assert isinstance(transport.session, httpx.Client)
+    transport.close()
+    with MockOrderlyServer(websocket=False) as server:
+        client = Client(transport=HttpxTransport(proxies="http://proxy:3128"))
+        client.transport.close()
+        client = Client(transport=HttpxTransport())
+        client.orderly_endpoint = server.rest_url
+        assert client.get_system_maintenance_status()["success"]
+        client.transport.close()
+
+
+def test_warmup_and_keepalive():
+    transport = MockTransport()
+    client = API(transport=transport)
+    client.warmup(2)
+    assert len(transport.requests) == 2
+    client.start_keepalive(connections=1, interval=0.01)
+    time.sleep(0.1)
+    client.stop_keepalive()
+    assert len(transport.requests) > 2
+    assert client._keepalive is None
+
+
+def test_signed_body_is_sent_verbatim():
+    orderly_key, orderly_secret = generate_orderly_key_pair()
+    encoded = []
+
+    def encoder(payload):
+        encoded.append(payload)
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    transport = MockTransport(lambda method, url, headers, body: (200, mock_item))
+    client = Client(
+        orderly_key=orderly_key,
+        orderly_secret=orderly_secret,
+        transport=transport,
+        json_encoder=encoder,
+    )
+    client.batch_create_order(
+        [
+            {"symbol": "PERP_NEAR_USDC", "order_type": "MARKET", "side": "BUY", "order_quantity": 1},
+            {"symbol": "PERP_NEAR_USDC", "order_type": "MARKET", "side": "SELL", "order_quantity": 1},
+        ]
+    )
+    _, _, headers, body = transport.requests[0]
+    assert len(encoded) == 1
+    assert isinstance(body, bytes) and body.startswith(b'{"orders":[{')
+    message = f"{headers['orderly-timestamp']}POST/v1/batch-order{body.decode()}"
+    assert verify_signature(orderly_key, message, headers["orderly-signature"])
+
+
+def test_empty_post_sends_no_body():
+    transport = MockTransport()
+    API(transport=transport).send_request("POST", "/v1/faucet/usdc", b"")
+    assert transport.requests[0][3] is None
@@ -0,0 +1,56 @@
+import pytest
+
+from orderly_evm_connector.error import (
+    ParameterRequiredError,
+    ParameterValueError,
+    ParameterValidationError,
+)
+from orderly_evm_connector.lib.enums import OrderSide, OrderType
+from orderly_evm_connector.lib.utils import (
+    ParameterSchema,
+    check_enum_parameter,
+    enum_values,
+)
+
+schema = ParameterSchema(
+    required=("symbol", "order_type", "side"), enums={"order_type": OrderType}
+)
+
+order = {"symbol": "PERP_NEAR_USDC", "order_type": "LIMIT", "side": "BUY"}
+
+
+def test_enum_values_are_cached():
+    assert enum_values(OrderSide) is enum_values(OrderSide)
+    assert enum_values(OrderSide) == frozenset(("BUY", "SELL"))
+
+
+def test_check_enum_parameter():
+    check_enum_parameter("LIMIT", OrderType)
+    with pytest.raises(ParameterValueError):
+        check_enum_parameter("STOP", OrderType)
+
+
+def test_validate_accepts_valid_params():
+    schema.validate(order)
+
+
+def test_validate_optional_enum_is_skipped_when_empty():
+    ParameterSchema(enums={"side": OrderSide}).validate({"side": None})
+
+
+def test_validate_batch_reports_all_missing_parameters():
+    with pytest.raises(ParameterRequiredError) as error:
+        schema.validate_batch([order, {"order_type": "LIMIT"}, {**order, "side": ""}])
+    assert error.value.params == ["orders[1].symbol", "orders[1].side", "orders[2].side"]
+
+
+def test_validate_batch_reports_mixed_errors_together():
+    with pytest.raises(ParameterValidationError) as error:
+        schema.validate_batch([{**order, "order_type": "STOP"}, {"order_type": "LIMIT"}])
+    assert [type(e) for e in error.value.errors] == [
+        ParameterRequiredError,
+        ParameterValueError,
+    ]
+    assert isinstance(error.value, ParameterRequiredError)
+    assert isinstance(error.value, ParameterValueError)
+    assert error.value.params == ["orders[1].symbol", "orders[1].side"]
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from orderly_evm_connector.error import ParameterArgumentError
+from orderly_evm_connector.lib.mock_server import (
+    generate_orderly_key_pair,
+    verify_signature,
+)
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest.account_pool import AccountPool
+
+ok = {"success": True, "data": {}}
+order = {"symbol": "PERP_NEAR_USDC", "order_type": "MARKET", "side": "BUY", "order_quantity": 1}
+
+
+def _pool(**kwargs):
+    transport = MockTransport(lambda *_: (200, ok))
+    return AccountPool(transport=transport, **kwargs), transport
+
+
+def test_calls_are_routed_and_signed_per_account():
+    pool, transport = _pool(metrics=True)
+    keys = {}
+    for account_id in ("0xaaa", "0xbbb"):
+        keys[account_id] = generate_orderly_key_pair()
+        pool.add_account(account_id, *keys[account_id])
+
+    pool["0xbbb"].create_order(**order)
+    pool["0xaaa"].get_all_positions_info()
+
+    assert len(pool) == 2 and "0xaaa" in pool
+    assert pool["0xaaa"].transport is pool["0xbbb"].transport is transport
+    assert pool["0xaaa"].metrics is pool.metrics
+    for (method, url, headers, body), account_id in zip(
+        transport.requests, ("0xbbb", "0xaaa")
+    ):
+        assert headers["orderly-account-id"] == account_id
+        assert headers["orderly-key"] == keys[account_id][0]
+        path = url[url.index("/v1/"):]
+        message = "{}{}{}{}".format(
+            headers["orderly-timestamp"], method, path, (body or b"").decode()
+        )
+        assert verify_signature(headers["orderly-key"], message, headers["orderly-signature"])
+
+
+def test_unknown_account_and_bad_secret():
+    pool, _ = _pool()
+    with pytest.raises(ParameterArgumentError):
+        pool.client("0xmissing")
+    with pytest.raises(ValueError):
+        pool.add_account("0xaaa", "ed25519:key", "ed25519:0OIl")
+    assert "0xaaa" not in pool
+
+
+def test_signing_keys_are_kept_by_the_client():
+    pool, _ = _pool()
+    client = pool.add_account("0xaaa", *generate_orderly_key_pair())
+    key = client.orderly_private_key
+    client.get_all_positions_info()
+    assert client.orderly_private_key is key
+    pool.remove_account("0xaaa")
+    assert "0xaaa" not in pool
+
+
+def test_rate_limits_per_key_and_per_ip():
+    pool, transport = _pool(key_rate_limit=20, key_rate_burst=2)
+    pool.add_account("0xaaa", *generate_orderly_key_pair())
+    pool.add_account("0xbbb", *generate_orderly_key_pair())
+    started = time.monotonic()
+    for _ in range(3):
+        pool["0xaaa"].get_all_positions_info()
+    assert time.monotonic() - started >= 0.04
+    started = time.monotonic()
+    for _ in range(2):
+        pool["0xbbb"].get_all_positions_info()
+    assert time.monotonic() - started < 0.04
+
+    pool, transport = _pool(key_rate_limit=None, ip_rate_limit=20, ip_rate_burst=2)
+    pool.add_account("0xaaa", *generate_orderly_key_pair())
+    pool.add_account("0xbbb", *generate_orderly_key_pair())
+    started = time.monotonic()
+    pool["0xaaa"].get_all_positions_info()
+    pool["0xbbb"].get_all_positions_info()
+    pool["0xaaa"].get_all_positions_info()
+    assert time.monotonic() - started >= 0.04
+    assert len(transport.requests) == 3
+
+
+def test_public_endpoints_are_not_charged_to_the_key():
+    pool, transport = _pool(key_rate_limit=1, key_rate_burst=1)
+    client = pool.add_account("0xaaa", *generate_orderly_key_pair())
+    started = time.monotonic()
+    for _ in range(5):
+        client.get_system_maintenance_status()
+    client.get_all_positions_info()
+    assert time.monotonic() - started < 0.5
+    assert len(transport.requests) == 6
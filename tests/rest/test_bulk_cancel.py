@@ -0,0 +1,80 @@
+import time
+from urllib.parse import parse_qs, urlparse
+
+from orderly_evm_connector.error import ClientError
+from orderly_evm_connector.lib.mock_server import (
+    MockOrderlyServer,
+    generate_orderly_key_pair,
+)
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+
+ok = {"success": True, "data": {"status": "CANCEL_ALL_SENT"}}
+
+
+def test_ids_are_chunked_and_merged():
+    def handler(method, url, headers, body):
+        if "13" in parse_qs(urlparse(url).query)["order_ids"][0].split(","):
+            return 403, {"success": False, "code": -1006, "message": "Order not found."}
+        return 200, ok
+
+    transport = MockTransport(handler)
+    client = Client(orderly_secret="ed25519:x", transport=transport)
+    results = client.bulk_cancel_orders(list(range(25)) + [3], rate_limit=None)
+
+    batches = sorted(
+        parse_qs(urlparse(url).query)["order_ids"][0] for _, url, _, _ in transport.requests
+    )
+    assert [len(batch.split(",")) for batch in batches] == [10, 10, 5]
+    assert len(results) == 25
+    assert results["0"] == ok
+    assert isinstance(results["13"], ClientError)
+    assert isinstance(results["19"], ClientError)
+    assert results["20"] == ok
+
+
+def test_rate_limit_is_shared_across_calls():
+    client = Client(orderly_secret="ed25519:x", transport=MockTransport(lambda *_: (200, ok)))
+    client.bulk_cancel_orders(range(50), rate_limit=5)
+    started = time.monotonic()
+    client.bulk_cancel_orders(range(50, 70), rate_limit=5)
+    assert time.monotonic() - started >= 0.3
+
+
+def test_cancel_all_for_symbols():
+    transport = MockTransport(lambda *_: (200, ok))
+    client = Client(orderly_secret="ed25519:x", transport=transport)
+    results = client.cancel_all_for_symbols(["PERP_ETH_USDC", "PERP_BTC_USDC"])
+    assert results["PERP_BTC_USDC"] == {"orders": ok, "algo_orders": ok}
+    urls = sorted(url for _, url, _, _ in transport.requests)
+    assert [urlparse(url).path for url in urls] == [
+        "/v1/algo/orders",
+        "/v1/algo/orders",
+        "/v1/orders",
+        "/v1/orders",
+    ]
+
+
+def test_bulk_cancel_against_mock_server():
+    orderly_key, orderly_secret = generate_orderly_key_pair()
+    with MockOrderlyServer(websocket=False) as server:
+        client = Client(
+            orderly_key=orderly_key,
+            orderly_secret=orderly_secret,
+            orderly_account_id="0xaccount",
+        )
+        client.orderly_endpoint = server.rest_url
+        client_order_ids = []
+        for i in range(12):
+            client_order_ids.append("bulk_{}".format(i))
+            client.create_order(
+                symbol="PERP_ETH_USDC",
+                order_type="LIMIT",
+                side="BUY",
+                order_price=1000,
+                order_quantity=0.1,
+                client_order_id=client_order_ids[-1],
+            )
+        results = client.bulk_cancel_orders_by_client_order_id(client_order_ids)
+        assert set(results) == set(client_order_ids)
+        assert {row["status"] for row in server.orders.values()} == {"CANCELLED"}
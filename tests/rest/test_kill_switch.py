@@ -0,0 +1,151 @@
+import json
+import threading
+from urllib.parse import urlparse
+
+from orderly_evm_connector.lib.mock_server import (
+    MockOrderlyServer,
+    generate_orderly_key_pair,
+)
+from orderly_evm_connector.lib.transport import MockTransport
+from orderly_evm_connector.rest import Rest as Client
+from orderly_evm_connector.rest.kill_switch import KillSwitch
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+
+ok = {"success": True, "data": {}}
+positions = {
+    "success": True,
+    "data": {
+        "rows": [
+            {"symbol": "PERP_ETH_USDC", "position_qty": 0.5},
+            {"symbol": "PERP_BTC_USDC", "position_qty": -0.1},
+            {"symbol": "PERP_NEAR_USDC", "position_qty": 0},
+        ]
+    },
+}
+
+
+def test_cancels_and_flattens_in_parallel():
+    def handler(method, url, headers, body):
+        if urlparse(url).path == "/v1/positions":
+            return 200, positions
+        if urlparse(url).path == "/v1/order" and b"PERP_BTC_USDC" in body:
+            return 403, {"success": False, "code": -1103, "message": "rejected"}
+        return 200, ok
+
+    transport = MockTransport(handler)
+    switch = KillSwitch(
+        Client(orderly_secret="ed25519:x", transport=transport), symbols=["PERP_SOL_USDC"]
+    )
+    report = switch.trigger()
+    switch.close()
+
+    requests = [(method, urlparse(url).path, body) for method, url, _, body in transport.requests]
+    orders = [json.loads(body) for method, path, body in requests if path == "/v1/order"]
+    assert sorted((o["symbol"], o["side"], o["order_quantity"]) for o in orders) == [
+        ("PERP_BTC_USDC", "BUY", 0.1),
+        ("PERP_ETH_USDC", "SELL", 0.5),
+    ]
+    assert all(o["reduce_only"] and o["order_type"] == "MARKET" for o in orders)
+    assert sum(path == "/v1/algo/orders" for _, path, _ in requests) == 4
+    assert ("DELETE", "/v1/orders", None) in requests
+
+    assert not report.completed
+    assert [step for step, _ in report.errors] == [("flatten", "PERP_BTC_USDC")]
+    events = [event for _, event, _ in report.timeline]
+    assert events[0] == "triggered" and events[-1] == "finished"
+    assert events.count("sent") == 8 and events.count("done") == 7
+
+
+def test_flatten_quantity_is_sent_as_received():
+    rows = [
+        {"symbol": "PERP_ETH_USDC", "position_qty": "-0.30000000000000004"},
+        {"symbol": "PERP_BTC_USDC", "position_qty": 0.1},
+        {"symbol": "PERP_NEAR_USDC", "position_qty": "0"},
+    ]
+
+    def handler(method, url, headers, body):
+        if urlparse(url).path == "/v1/positions":
+            return 200, {"success": True, "data": {"rows": rows}}
+        return 200, ok
+
+    transport = MockTransport(handler)
+    switch = KillSwitch(Client(orderly_secret="ed25519:x", transport=transport))
+    switch.trigger()
+    switch.close()
+    orders = [
+        json.loads(body)
+        for _, url, _, body in transport.requests
+        if urlparse(url).path == "/v1/order"
+    ]
+    assert sorted((o["symbol"], o["side"], o["order_quantity"]) for o in orders) == [
+        ("PERP_BTC_USDC", "SELL", 0.1),
+        ("PERP_ETH_USDC", "BUY", "0.30000000000000004"),
+    ]
+
+
+def test_deadline_is_reported():
+    release = threading.Event()
+
+    def handler(method, url, headers, body):
+        if urlparse(url).path == "/v1/orders":
+            release.wait(5)
+        return 200, ok
+
+    switch = KillSwitch(
+        Client(orderly_secret="ed25519:x", transport=MockTransport(handler)), deadline=0.05
+    )
+    report = switch.trigger()
+    release.set()
+    switch.close()
+    assert report.timeouts == ["cancel_orders"]
+    assert not report.completed and report.elapsed < 1
+
+
+def test_fills_are_confirmed_on_the_private_stream():
+    orderly_key, orderly_secret = generate_orderly_key_pair()
+    with MockOrderlyServer() as server:
+        client = Client(
+            orderly_key=orderly_key,
+            orderly_secret=orderly_secret,
+            orderly_account_id="0xaccount",
+        )
+        client.orderly_endpoint = server.rest_url
+        client.create_order(
+            symbol="PERP_ETH_USDC", order_type="MARKET", side="BUY", order_quantity=0.3
+        )
+        client.create_order(
+            symbol="PERP_ETH_USDC",
+            order_type="LIMIT",
+            side="BUY",
+            order_price=1000,
+            order_quantity=0.1,
+        )
+
+        switch = KillSwitch(client, deadline=5, confirm=True)
+        subscribed = threading.Event()
+
+        def on_message(_, message):
+            if json.loads(message).get("event") == "subscribe":
+                subscribed.set()
+            switch.on_message(message)
+
+        ws = OrderlyWebsocketClient(
+            server.ws_private_url,
+            orderly_key=orderly_key,
+            orderly_secret=orderly_secret,
+            private=True,
+            on_message=on_message,
+        )
+        ws.subscribe({"id": "1", "event": "subscribe", "topic": "executionreport"})
+        assert subscribed.wait(5)
+
+        report = switch.trigger()
+        ws.stop()
+        switch.close()
+
+    assert report.completed, report.errors
+    assert server.positions["PERP_ETH_USDC"] == 0
+    assert {row["status"] for row in server.orders.values()} == {"FILLED", "CANCELLED"}
+    assert [detail for _, event, detail in report.timeline if event == "filled"] == list(
+        report.flatten_orders
+    )
@@ -1,4 +1,5 @@
 import os
+import json
 import re
 import uuid
 import time
@@ -47,4 +48,41 @@ def current_timestamp() -> int:
 
 
 def timestamp(in_future: int = 0) -> int:
-    return current_timestamp() + in_future
\ No newline at end of file
+    return current_timestamp() + in_future
+
+class FakeWebSocket(object):
+    """Stand-in for `websocket.WebSocket` replaying queued frames.
+
+    `frames` are JSON-serializable messages delivered as text frames; a
+    CLOSE frame is returned once they are exhausted.
+    """
+
+    def __init__(self, frames=None):
+        from websocket import ABNF
+
+        self._abnf = ABNF
+        self.frames = list(frames or [])
+        self.sent = []
+        self.connected = True
+
+    def recv_data_frame(self, control_frame=True):
+        if self.frames:
+            message = self.frames.pop(0)
+            data = message if isinstance(message, str) else json.dumps(message)
+            return self._abnf.OPCODE_TEXT, self._abnf.create_frame(data, self._abnf.OPCODE_TEXT)
+        return self._abnf.OPCODE_CLOSE, self._abnf.create_frame(b"\x03\xe8", self._abnf.OPCODE_CLOSE)
+
+    def send(self, message):
+        self.sent.append(message)
+
+    def send_close(self):
+        self.connected = False
+
+
+def mock_websocket(monkeypatch, frames=None):
+    """Make `OrderlySocketManager` connect to a `FakeWebSocket`"""
+    from orderly_evm_connector.websocket import orderly_socket_manager
+
+    ws = FakeWebSocket(frames)
+    monkeypatch.setattr(orderly_socket_manager, "create_connection", lambda *args, **kwargs: ws)
+    return ws
@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from orderly_evm_connector.lib.metrics import StreamMetrics
+from orderly_evm_connector.websocket.dispatcher import (
+    SNAPSHOT_TOPICS,
+    ConflatingDispatcher,
+    QueueDispatcher,
+    topic_matcher,
+)
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from tests.utils import mock_websocket
+
+
+def _paused_dispatcher(**kwargs):
+    """Dispatcher whose single worker is held until `release` is set"""
+    release = threading.Event()
+    delivered = []
+
+    def deliver(topic, data):
+        release.wait()
+        delivered.append((topic, data))
+
+    dispatcher = QueueDispatcher(**kwargs)
+    dispatcher.bind(deliver)
+    dispatcher.start()
+    return dispatcher, release, delivered
+
+
+def _wait_until_taken(dispatcher):
+    while dispatcher.depth:
+        time.sleep(0.001)
+
+
+def test_drop_oldest():
+    dispatcher, release, delivered = _paused_dispatcher(
+        maxsize=2, backpressure="drop_oldest"
+    )
+    dispatcher.submit("trades", 0)
+    _wait_until_taken(dispatcher)
+    for index in range(1, 5):
+        dispatcher.submit("trades", index)
+    release.set()
+    dispatcher.stop()
+    # the worker holds message 0, 1 and 2 are dropped to make room
+    assert [data for _, data in delivered] == [0, 3, 4]
+    assert dispatcher.dropped == 2
+
+
+def test_conflate_keeps_newest_per_topic():
+    dispatcher, release, delivered = _paused_dispatcher(backpressure="conflate")
+    dispatcher.submit("bbos", 0)
+    _wait_until_taken(dispatcher)
+    for index in range(1, 5):
+        dispatcher.submit("tickers", index)
+        dispatcher.submit("bbos", index)
+    release.set()
+    dispatcher.stop()
+    assert delivered == [("bbos", 0), ("tickers", 4), ("bbos", 4)]
+    assert dispatcher.dropped == 6
+
+
+def test_block_waits_for_room():
+    dispatcher, release, delivered = _paused_dispatcher(maxsize=1)
+    dispatcher.submit("trades", 0)
+    _wait_until_taken(dispatcher)
+    dispatcher.submit("trades", 1)
+    producer = threading.Thread(target=dispatcher.submit, args=("trades", 2))
+    producer.start()
+    producer.join(0.05)
+    assert producer.is_alive()
+    release.set()
+    producer.join()
+    dispatcher.stop()
+    assert [data for _, data in delivered] == [0, 1, 2]
+    assert dispatcher.dropped == 0
+
+
+def test_event_loop_drain():
+    loop = asyncio.new_event_loop()
+    delivered = []
+    dispatcher = QueueDispatcher(loop=loop)
+    dispatcher.bind(lambda topic, data: delivered.append(data))
+    dispatcher.start()
+
+    def produce():
+        for index in range(3):
+            dispatcher.submit("trades", index)
+
+    threading.Thread(target=produce).start()
+    loop.run_until_complete(asyncio.sleep(0.05))
+    loop.close()
+    assert delivered == [0, 1, 2]
+
+
+def test_socket_manager_runs_callbacks_on_workers(monkeypatch):
+    mock_websocket(monkeypatch, [{"topic": "tickers", "data": index} for index in range(3)])
+    threads = []
+    manager = OrderlySocketManager(
+        "wss://example",
+        on_open=lambda _: None,
+        on_message=lambda _, message: threads.append(threading.current_thread().name),
+        dispatcher=QueueDispatcher(workers=1),
+        metrics=True,
+    )
+    manager.read_data()
+    assert threads == ["orderly-dispatch-0"] * 3
+    assert manager.metrics.queue_depth == 0
+
+
+def test_dispatcher_stops_when_connection_fails(monkeypatch):
+    from orderly_evm_connector.websocket import orderly_socket_manager
+
+    def refuse(*args, **kwargs):
+        raise ConnectionRefusedError("refused")
+
+    monkeypatch.setattr(orderly_socket_manager, "create_connection", refuse)
+    monkeypatch.setattr(orderly_socket_manager, "WEBSOCKET_RETRY_SLEEP_TIME", 0)
+    running = set(threading.enumerate())
+    with pytest.raises(ConnectionRefusedError):
+        OrderlySocketManager("wss://example", dispatcher=QueueDispatcher(workers=2))
+    assert not [
+        thread
+        for thread in threading.enumerate()
+        if thread not in running and thread.name.startswith("orderly-dispatch")
+    ]
+
+
+def test_topic_matcher():
+    matches = topic_matcher(SNAPSHOT_TOPICS)
+    assert matches("PERP_ETH_USDC@bbo")
+    assert matches("PERP_ETH_USDC@orderbook")
+    assert matches("tickers")
+    assert not matches("PERP_ETH_USDC@orderbookupdate")
+    assert not matches("PERP_ETH_USDC@trade")
+    assert not matches(None)
+
+
+def test_conflating_dispatcher_only_conflates_snapshot_topics():
+    release = threading.Event()
+    delivered = []
+    metrics = StreamMetrics()
+    dispatcher = ConflatingDispatcher()
+    dispatcher.bind(lambda topic, data: (release.wait(), delivered.append((topic, data))), metrics)
+    dispatcher.start()
+    dispatcher.submit("PERP_ETH_USDC@trade", -1)
+    _wait_until_taken(dispatcher)
+    for index in range(3):
+        dispatcher.submit("PERP_ETH_USDC@bbo", index)
+        dispatcher.submit("PERP_ETH_USDC@trade", index)
+    release.set()
+    dispatcher.stop()
+    assert delivered == [
+        ("PERP_ETH_USDC@trade", -1),
+        ("PERP_ETH_USDC@bbo", 2),
+        ("PERP_ETH_USDC@trade", 0),
+        ("PERP_ETH_USDC@trade", 1),
+        ("PERP_ETH_USDC@trade", 2),
+    ]
+    assert dispatcher.dropped_by_topic == {"PERP_ETH_USDC@bbo": 2}
+    assert metrics.topic("PERP_ETH_USDC@bbo")["dropped"] == 2
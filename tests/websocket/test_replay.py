@@ -0,0 +1,100 @@
+import time
+
+import pytest
+from websocket import WebSocketConnectionClosedException
+
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from orderly_evm_connector.websocket.recorder import FrameRecorder, read_frames
+from orderly_evm_connector.websocket.replay import ReplaySocketManager
+from tests.utils import mock_websocket
+
+frames = [
+    {"topic": "PERP_NEAR_USDC@trade", "ts": 1700000000000, "data": {"price": 1.0}},
+    {"topic": "PERP_NEAR_USDC@trade", "ts": 1700000000010, "data": {"price": 1.1}},
+]
+
+
+def test_record_live_session(monkeypatch, tmp_path):
+    path = str(tmp_path / "session.bin")
+    mock_websocket(monkeypatch, frames)
+    manager = OrderlySocketManager(
+        "wss://example",
+        on_open=lambda _: None,
+        on_message=lambda _, message: None,
+        record_path=path,
+    )
+    manager.read_data()
+    recorded = list(read_frames(path))
+    # two text frames followed by the close frame
+    assert [frame.op_code for frame in recorded] == [1, 1, 8]
+    assert b'"price": 1.1' in recorded[1].data
+
+
+def test_recording_survives_a_failed_reconnect(monkeypatch, tmp_path):
+    path = str(tmp_path / "session.bin")
+    ws = mock_websocket(monkeypatch, frames[:1])
+    manager = OrderlySocketManager(
+        "wss://example",
+        on_open=lambda _: None,
+        on_message=lambda _, message: None,
+        record_path=path,
+    )
+
+    receive = ws.recv_data_frame
+
+    def recv_data_frame(*args):
+        if ws.frames:
+            return receive(*args)
+        # Frames are on disk before the reader gives up
+        assert len(list(read_frames(path))) == 1
+        raise WebSocketConnectionClosedException()
+
+    ws.recv_data_frame = recv_data_frame
+
+    def give_up():
+        raise ConnectionError("gave up")
+
+    manager.reconnect = give_up
+    with pytest.raises(ConnectionError):
+        manager.read_data()
+    assert manager.recorder._file.closed
+    assert [frame.op_code for frame in read_frames(path)] == [1]
+
+
+def _write_recording(path, interval):
+    recorder = FrameRecorder(path)
+    received = 1700000000.0
+    for index in range(5):
+        recorder.record(1, f'{{"topic": "tickers", "ts": 1700000000000, "data": {index}}}', received)
+        received += interval
+    recorder.close()
+
+
+def test_replay_as_fast_as_possible(tmp_path):
+    path = str(tmp_path / "session.bin")
+    _write_recording(path, interval=10)
+    received = []
+    closed = []
+    manager = ReplaySocketManager(
+        path,
+        on_message=lambda _, message: received.append(message),
+        on_close=lambda _: closed.append(True),
+        speed=None,
+        metrics=True,
+    )
+    started = time.monotonic()
+    manager.read_data()
+    assert time.monotonic() - started < 1
+    assert len(received) == 5
+    assert closed == [True]
+    # latency is computed from the recorded receive time
+    assert manager.metrics.topic("tickers")["latency"]["sum"] == 0 + 10 + 20 + 30 + 40
+
+
+def test_replay_speed_factor(tmp_path):
+    path = str(tmp_path / "session.bin")
+    _write_recording(path, interval=0.05)
+    manager = ReplaySocketManager(path, on_message=lambda _, message: None, speed=2)
+    started = time.monotonic()
+    manager.read_data()
+    assert 0.09 <= time.monotonic() - started < 0.5
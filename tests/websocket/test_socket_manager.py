@@ -0,0 +1,47 @@
+import time
+
+from orderly_evm_connector.lib.metrics import StreamMetrics
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from tests.utils import mock_websocket
+
+
+def _frames():
+    now = int(time.time() * 1000)
+    return [
+        {"topic": "PERP_NEAR_USDC@bbo", "ts": now - 5, "data": {"bid": 1.0}},
+        {"topic": "PERP_NEAR_USDC@bbo", "ts": now - 5, "data": {"bid": 1.1}},
+        {"topic": "tickers", "ts": now, "data": []},
+    ]
+
+
+def test_read_data_delivers_messages(monkeypatch):
+    mock_websocket(monkeypatch, _frames())
+    received = []
+    closed = []
+    manager = OrderlySocketManager(
+        "wss://example",
+        on_open=lambda _: None,
+        on_message=lambda _, message: received.append(message),
+        on_close=lambda _: closed.append(True),
+    )
+    manager.read_data()
+    assert len(received) == 3
+    assert closed == [True]
+
+
+def test_stream_metrics(monkeypatch):
+    mock_websocket(monkeypatch, _frames())
+    manager = OrderlySocketManager(
+        "wss://example",
+        on_open=lambda _: None,
+        on_message=lambda _, message: None,
+        metrics=True,
+    )
+    manager.read_data()
+    assert isinstance(manager.metrics, StreamMetrics)
+    bbo = manager.metrics.topic("PERP_NEAR_USDC@bbo")
+    assert bbo["messages"] == 2
+    assert bbo["bytes"] > 0
+    assert bbo["latency"]["count"] == 2
+    assert bbo["callback"]["count"] == 2
+    assert 'orderly_ws_messages_total{topic="tickers"} 1' in manager.metrics.to_prometheus()
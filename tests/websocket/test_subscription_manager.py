@@ -0,0 +1,107 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from orderly_evm_connector.error import SubscriptionError
+from orderly_evm_connector.lib.mock_server import MockOrderlyServer
+from orderly_evm_connector.websocket.subscription_manager import SubscriptionManager
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+
+
+class _Sent(object):
+    def __init__(self):
+        self.frames = []
+        self.changed = threading.Condition()
+
+    def __call__(self, frame):
+        with self.changed:
+            self.frames.append(json.loads(frame))
+            self.changed.notify_all()
+
+    def wait_for(self, count):
+        with self.changed:
+            assert self.changed.wait_for(lambda: len(self.frames) >= count, 2)
+        time.sleep(0.01)
+        return self.frames
+
+
+def _subscribe(topic, id="1"):
+    return {"id": id, "event": "subscribe", "topic": topic}
+
+
+def test_frames_are_windowed_and_acked_by_id():
+    sent = _Sent()
+    manager = SubscriptionManager(sent, rate=None, max_in_flight=3)
+    futures = [manager.submit(_subscribe("T{}".format(i))) for i in range(5)]
+    assert len({future.message["id"] for future in futures}) == 5
+
+    frames = sent.wait_for(3)
+    assert len(frames) == 3 and manager.pending == 5
+    manager.ack({"id": frames[0]["id"], "event": "subscribe", "success": True})
+    manager.ack(
+        {"id": frames[1]["id"], "event": "subscribe", "success": False, "errorMsg": "no"}
+    )
+    frames = sent.wait_for(5)
+    assert [frame["topic"] for frame in frames] == ["T0", "T1", "T2", "T3", "T4"]
+    assert futures[0].result(1)["success"]
+    with pytest.raises(SubscriptionError):
+        futures[1].result(1)
+
+    manager.reset([futures[2].message, _subscribe("T9", id=None)])
+    with pytest.raises(SubscriptionError):
+        futures[3].result(1)
+    frames = sent.wait_for(7)
+    assert [frame["topic"] for frame in frames[5:]] == ["T2", "T9"]
+    manager.ack({"id": frames[5]["id"], "event": "subscribe", "success": True})
+    assert futures[2].result(1)["success"]
+    manager.close()
+
+
+def test_unanswered_frames_time_out():
+    manager = SubscriptionManager(lambda frame: None, rate=None, ack_timeout=0.05)
+    with pytest.raises(SubscriptionError) as e:
+        manager.submit(_subscribe("T0")).result(2)
+    assert e.value.reason == "acknowledgement timeout"
+    assert manager.pending == 0
+    manager.close()
+
+
+def test_ack_timeout_starts_when_the_frame_is_sent():
+    # The window outlasts ack_timeout at this rate, acks arrive soon after each send
+    def send(frame):
+        reply = {"id": json.loads(frame)["id"], "event": "subscribe", "success": True}
+        threading.Timer(0.1, manager.ack, (reply,)).start()
+
+    manager = SubscriptionManager(send, rate=5, max_in_flight=10, ack_timeout=0.5)
+    futures = [manager.submit(_subscribe("T{}".format(i))) for i in range(10)]
+    for future in futures:
+        assert future.result(3)["success"]
+    assert manager.failed == 0
+    manager.close()
+
+
+def test_mass_subscribe_and_resubscribe_after_reconnect():
+    topics = [
+        "PERP_{}_USDC@{}".format(i, stream)
+        for i in range(100)
+        for stream in ("trade", "bbo", "orderbook")
+    ]
+    with MockOrderlyServer(ping_interval=None) as server:
+        client = OrderlyWebsocketClient(server.ws_url, on_message=lambda *_: None)
+        futures = [client.subscribe(_subscribe(topic)) for topic in topics]
+        for future in futures:
+            assert future.result(5)["success"]
+        assert all(server.publish(topic, {}) == 1 for topic in topics[:5])
+
+        manager = client.subscription_manager
+        client.socket_manager.ws.sock.shutdown(socket.SHUT_RDWR)
+        deadline = time.monotonic() + 5
+        while manager.acked < 2 * len(topics) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert manager.acked == 2 * len(topics)
+        assert all(server.publish(topic, {}) == 1 for topic in topics)
+        assert client.subscription_manager.failed == 0
+        client.stop()
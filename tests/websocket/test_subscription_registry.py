@@ -0,0 +1,106 @@
+import json
+import socket
+import threading
+import time
+
+from orderly_evm_connector.lib.mock_server import MockOrderlyServer
+from orderly_evm_connector.websocket.subscription_manager import SubscriptionManager
+from orderly_evm_connector.websocket.subscription_registry import (
+    ACKED,
+    FAILED,
+    PENDING,
+    SubscriptionRegistry,
+)
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+
+
+class _Sent(object):
+    def __init__(self):
+        self.frames = []
+        self.changed = threading.Condition()
+
+    def __call__(self, frame):
+        with self.changed:
+            self.frames.append(json.loads(frame))
+            self.changed.notify_all()
+
+    def wait_for(self, count):
+        with self.changed:
+            assert self.changed.wait_for(lambda: len(self.frames) >= count, 2)
+        time.sleep(0.01)
+        return self.frames
+
+
+def _message(topic, event="subscribe"):
+    return {"id": "1", "event": event, "topic": topic}
+
+
+def test_states_dedupe_and_replay():
+    sent = _Sent()
+    manager = SubscriptionManager(sent, rate=None)
+    registry = SubscriptionRegistry(manager)
+    futures = [registry.subscribe(_message(topic)) for topic in ("A", "B", "C")]
+    assert registry.subscribe(_message("A")) is futures[0]
+    frames = sent.wait_for(3)
+    assert [frame["topic"] for frame in frames] == ["A", "B", "C"]
+    assert registry.state("A") == PENDING
+
+    manager.ack({"id": frames[0]["id"], "event": "subscribe", "success": True})
+    manager.ack({"id": frames[1]["id"], "event": "subscribe", "success": False})
+    futures[0].result(1)
+    assert registry.state("A") == ACKED and registry.state("B") == FAILED
+    assert registry.topics(PENDING) == ["C"]
+    assert registry.diff(["A", "B", "D"]) == ({"B", "D"}, {"C"})
+
+    registry.unsubscribe(_message("C", "unsubscribe"))
+    assert "C" not in registry and len(registry) == 2
+    registry.subscribe(_message("A"))
+    assert len(sent.wait_for(4)) == 4
+
+    registry.replay()
+    frames = sent.wait_for(5)
+    assert frames[3] == _message("C", "unsubscribe")
+    assert [frame["topic"] for frame in frames[4:]] == ["A"]
+    assert registry.state("A") == PENDING and registry.state("B") == FAILED
+    manager.close()
+
+
+def test_replay_keeps_timed_out_topics_and_drops_rejected_ones():
+    sent = _Sent()
+    manager = SubscriptionManager(sent, rate=None, ack_timeout=0.1)
+    registry = SubscriptionRegistry(manager)
+    futures = [registry.subscribe(_message(topic)) for topic in ("A", "B")]
+    frames = sent.wait_for(2)
+    manager.ack({"id": frames[1]["id"], "event": "subscribe", "success": False})
+    for future in futures:
+        future.exception(1)
+    assert registry.state("A") == FAILED and registry.state("B") == FAILED
+
+    registry.replay()
+    frames = sent.wait_for(3)
+    assert [frame["topic"] for frame in frames[2:]] == ["A"]
+    assert registry.state("A") == PENDING and registry.state("B") == FAILED
+    manager.close()
+
+
+def test_sync_and_reconnect_replays_only_live_topics():
+    with MockOrderlyServer(ping_interval=None) as server:
+        client = OrderlyWebsocketClient(server.ws_url, on_message=lambda *_: None)
+        for topic in ("A", "B", "A", "C"):
+            client.subscribe(_message(topic))
+        futures = client.sync_subscriptions(["B", "C", "D"])
+        assert sorted(futures) == ["A", "D"]
+        for future in futures.values():
+            assert future.result(5)["success"]
+        assert sorted(client.subscriptions.topics(ACKED)) == ["B", "C", "D"]
+
+        manager = client.subscription_manager
+        acked = manager.acked
+        client.socket_manager.ws.sock.shutdown(socket.SHUT_RDWR)
+        deadline = time.monotonic() + 5
+        while manager.acked < acked + 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert manager.acked == acked + 3
+        assert [server.publish(topic, {}) for topic in "ABCD"] == [0, 1, 1, 1]
+        assert sorted(client.subscriptions.topics(ACKED)) == ["B", "C", "D"]
+        client.stop()